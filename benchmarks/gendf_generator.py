@@ -0,0 +1,208 @@
+"""Write synthetic GENDF files, laid out the way GROUPR writes them, for
+benchmarking the parser at sizes the test files don't reach.
+
+    python benchmarks/gendf_generator.py <gendf-file> [--groups N]
+        [--legendre-order L] [--mts N] [--matrices N] [--band-width N]
+
+The values are random but physical enough to parse: positive cross
+sections and fluxes, a normalised fission spectrum, and scattering
+matrices with a band of columns around the diagonal.
+"""
+
+import argparse
+import numpy as np
+
+MAT = 9237
+ZA = 92238.0
+AWR = 236.0058
+
+# the MT numbers of the MF3 sections, before any made up ones
+POINTWISE_MTS = [1, 2, 4, 16, 17, 18, 51, 52, 53, 102, 452]
+
+# the MT numbers of the MF6 sections, before any made up ones
+MATRIX_MTS = [2, 16, 17, 51, 52, 53, 54, 55]
+
+
+def endf_float(value):
+    """Function to write a float in the 11 characters of an ENDF field"""
+
+    # drop a digit of the mantissa when a sign or exponent digit needs room
+    for digits in [6, 5, 4]:
+        mantissa, exponent = f"{value:.{digits}e}".split("e")
+        field = f"{mantissa}{int(exponent):+d}"
+        if len(field) <= 11:
+            return field.rjust(11)
+    raise ValueError(f"{value} can't be written in an ENDF field")
+
+
+class TapeWriter:
+    """Class to collect the lines of a GENDF tape, with the MAT/MF/MT and
+    line numbers in columns 67-80"""
+
+    def __init__(self, title):
+        self.lines = [title.ljust(66) + "   1 0  0    0"]
+        self.sequence = 0
+
+    def line(self, fields, mf, mt):
+        self.sequence = self.sequence + 1 if mt else 0
+        number = 99999 if mt == 0 and mf else self.sequence
+        self.lines.append(
+            "".join(fields).ljust(66) + f"{MAT:4d}{mf:2d}{mt:3d}{number:5d}"
+        )
+
+    def control(self, c1, c2, l1, l2, n1, n2, mf, mt):
+        fields = [endf_float(c1), endf_float(c2)]
+        self.line(fields + [f"{n:11d}" for n in (l1, l2, n1, n2)], mf, mt)
+
+    def values(self, values, mf, mt):
+        fields = [endf_float(value) for value in np.asarray(values).tolist()]
+        for start in range(0, len(fields), 6):
+            self.line(fields[start : start + 6], mf, mt)
+
+    def section_end(self, mf):
+        self.line([], mf, 0)
+
+    def text(self):
+        ends = [" " * 66 + "   0 0  0    0", " " * 66 + "  -1 0  0    0"]
+        return "\n".join(self.lines + ends) + "\n"
+
+
+def synthetic_gendf(
+    number_groups=30,
+    legendre_order=4,
+    number_mts=len(POINTWISE_MTS),
+    number_matrices=4,
+    band_width=10,
+    temperature=293.6,
+    seed=0,
+):
+    """Function to make the text of a synthetic GENDF file
+
+    Parameters
+    ----------
+    number_groups : int, optional, default is 30
+        the number of neutron groups
+
+    legendre_order : int, optional, default is 4
+        the Legendre order of the scattering matrices
+
+    number_mts : int, optional, default is 11
+        the number of MF3 sections. The first 11 are the usual reactions,
+        and the rest are numbered from MT600.
+
+    number_matrices : int, optional, default is 4
+        the number of MF6 sections. The first 8 are the usual reactions,
+        and the rest are numbered from MT600.
+
+    band_width : int, optional, default is 10
+        the number of outgoing groups in each row of the scattering
+        matrices, around the diagonal
+
+    temperature : float, optional, default is 293.6
+        the temperature in K
+
+    seed : int, optional, default is 0
+        the seed of the random values
+
+    Returns
+    -------
+    str
+        the GENDF file
+    """
+
+    generator = np.random.default_rng(seed)
+    ng = number_groups
+    nl = legendre_order + 1
+    band_width = min(band_width, ng)
+
+    energy_boundaries = np.geomspace(1e-5, 2e7, ng + 1)
+    flux = generator.uniform(0.1, 10, ng)
+    pointwise_mts = _numbers(POINTWISE_MTS, number_mts)
+    matrix_mts = _numbers(MATRIX_MTS, number_matrices)
+
+    tape = TapeWriter(f"synthetic GENDF, {ng} groups")
+
+    # MF1 has the title word, sigma0 and the neutron and gamma boundaries
+    tape.control(ZA, AWR, 0, 1, -1, 1, 1, 451)
+    tape.control(temperature, 0, ng, 0, ng + 4, 0, 1, 451)
+    tape.values(np.concatenate([[0, 1e10], energy_boundaries, [0]]), 1, 451)
+    tape.line([], 0, 0)
+
+    # MF3 has a (flux, value) record for each group
+    for mt in pointwise_mts:
+        values = generator.uniform(0.5, 50, ng)
+        if mt == 452:
+            values = generator.uniform(2.4, 2.6, ng)
+        tape.control(ZA, 0, 1, 1, 0, ng, 3, mt)
+        for group in range(ng):
+            tape.control(temperature, 0, 2, 1, 2, group + 1, 3, mt)
+            tape.values([flux[group], values[group]], 3, mt)
+        tape.section_end(3)
+
+    # MF5 has the fission spectrum in one record
+    if 18 in pointwise_mts:
+        spectrum = generator.uniform(0, 1, ng)
+        tape.control(ZA, 0, 1, 1, 0, ng, 5, 18)
+        tape.control(temperature, 0, ng, 1, ng, ng, 5, 18)
+        tape.values(spectrum / spectrum.sum(), 5, 18)
+        tape.section_end(5)
+
+    # MF6 has a record for each row, with the flux moments followed by the
+    # Legendre moments of each outgoing group in the band
+    for mt in matrix_mts:
+        tape.control(ZA, 0, nl, 1, 0, ng, 6, mt)
+        for group in range(ng):
+            first = min(max(group - band_width // 2, 0), ng - band_width)
+            values = np.empty((band_width + 1, nl))
+            values[0] = flux[group] * 0.5 ** np.arange(nl)
+            values[1:] = generator.uniform(0, 1, (band_width, nl)) * (
+                0.5 ** np.arange(nl)
+            )
+            tape.control(
+                temperature, 0, band_width + 1, first + 1, values.size, group + 1, 6, mt
+            )
+            tape.values(values.ravel(), 6, mt)
+        tape.section_end(6)
+
+    return tape.text()
+
+
+def write_gendf(filename, **kwargs):
+    """Function to write a synthetic GENDF file, with the keyword arguments
+    of synthetic_gendf"""
+
+    with open(filename, "w") as f:
+        f.write(synthetic_gendf(**kwargs))
+
+
+def _numbers(usual, number):
+    """Function to take the first of the usual MT numbers, and make up
+    the rest from MT600"""
+
+    return list(usual[:number]) + list(range(600, 600 + number - len(usual)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("gendf_file")
+    parser.add_argument("--groups", type=int, default=30)
+    parser.add_argument("--legendre-order", type=int, default=4)
+    parser.add_argument("--mts", type=int, default=len(POINTWISE_MTS))
+    parser.add_argument("--matrices", type=int, default=4)
+    parser.add_argument("--band-width", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_gendf(
+        args.gendf_file,
+        number_groups=args.groups,
+        legendre_order=args.legendre_order,
+        number_mts=args.mts,
+        number_matrices=args.matrices,
+        band_width=args.band_width,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
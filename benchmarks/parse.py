@@ -0,0 +1,178 @@
+"""Measure the time and peak memory of parsing synthetic GENDF files with
+GrouprOutput, for each MF type and a range of group counts.
+
+    python benchmarks/parse.py [--groups 30 300 3000 10000] [--sparse]
+        [--output results.json] [--compare baseline.json]
+
+Opening the file (indexing it and parsing MF1) and parsing all of the MF3,
+MF5 and MF6 sections are measured separately. The times are the best of
+--repeat runs, and the peak memory of each step is measured with
+tracemalloc (which traces the numpy arrays too) in one more run. The results
+are written as JSON, and --compare prints the change from an earlier
+results file, to compare commits.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import numpy as np
+import groupy
+from groupy import GrouprOutput
+from gendf_generator import write_gendf
+
+# the GrouprOutput attribute that each MF is parsed into
+SECTIONS = {
+    "MF3": "pointwise",
+    "MF5": "outgoing_distributions",
+    "MF6": "scattering_matrices",
+}
+STEPS = ["open"] + list(SECTIONS)
+
+# the fields that identify a result, for comparing results files
+CASE_KEYS = ["groups", "legendre_order", "mts", "matrices", "band_width", "sparse"]
+CASE_KEYS += ["step"]
+
+
+def parse_step(obj, step):
+    """Function to parse every section of one MF, which is what
+    GrouprOutput(eager=True) does for each MF"""
+
+    return dict(getattr(obj, SECTIONS[step], {}))
+
+
+def best_times(filename, sparse, repeat):
+    """Function to get the best time of each step over several runs"""
+
+    best = {step: np.inf for step in STEPS}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        obj = GrouprOutput(filename, sparse=sparse)
+        best["open"] = min(best["open"], time.perf_counter() - start)
+        for step in SECTIONS:
+            start = time.perf_counter()
+            parse_step(obj, step)
+            best[step] = min(best[step], time.perf_counter() - start)
+    return best
+
+
+def peak_memory(filename, sparse):
+    """Function to get the peak memory that each step allocates, on top of
+    what is allocated when it starts"""
+
+    peaks = {}
+    tracemalloc.start()
+    try:
+        obj = GrouprOutput(filename, sparse=sparse)
+        peaks["open"] = tracemalloc.get_traced_memory()[1]
+        for step in SECTIONS:
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            parse_step(obj, step)
+            peaks[step] = tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Function to print the change of each time and peak from a baseline"""
+
+    def key(result):
+        return tuple(result[name] for name in CASE_KEYS)
+
+    previous = {key(result): result for result in baseline["results"]}
+    print(f"\nchange from {baseline.get('commit')} (new / old):")
+    for result in results:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        case = ", ".join(f"{name}={result[name]}" for name in CASE_KEYS)
+        print(
+            f"  {case}: time {result['time'] / old['time']:.2f}x, "
+            f"peak memory {result['peak_memory'] / max(old['peak_memory'], 1):.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", type=int, nargs="+", default=[30, 300, 3000])
+    parser.add_argument("--legendre-order", type=int, default=4)
+    parser.add_argument("--mts", type=int, default=11)
+    parser.add_argument("--matrices", type=int, default=4)
+    parser.add_argument("--band-width", type=int, default=10)
+    parser.add_argument("--sparse", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for groups in args.groups:
+            filename = Path(directory) / f"synthetic_{groups}"
+            write_gendf(
+                filename,
+                number_groups=groups,
+                legendre_order=args.legendre_order,
+                number_mts=args.mts,
+                number_matrices=args.matrices,
+                band_width=args.band_width,
+            )
+            size = filename.stat().st_size
+
+            times = best_times(filename, args.sparse, args.repeat)
+            peaks = peak_memory(filename, args.sparse)
+            for step in STEPS:
+                results.append(
+                    {
+                        "groups": groups,
+                        "legendre_order": args.legendre_order,
+                        "mts": args.mts,
+                        "matrices": args.matrices,
+                        "band_width": args.band_width,
+                        "sparse": args.sparse,
+                        "step": step,
+                        "file_size": size,
+                        "time": times[step],
+                        "peak_memory": peaks[step],
+                    }
+                )
+                print(
+                    f"{groups:6d} groups {step:5s} {times[step]:9.4f} s "
+                    f"{peaks[step] / 2**20:9.2f} MiB"
+                )
+
+    output = {
+        "commit": commit(),
+        "groupy_version": groupy.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(output, indent=2))
+    if args.compare is not None:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
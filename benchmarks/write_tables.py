@@ -0,0 +1,114 @@
+"""Compare the bulk table writer of GrouprOutput.write_to_csv with the
+np.hstack / np.savetxt writer it replaced.
+
+    python benchmarks/write_tables.py [gendf-file] [--repeat N]
+
+The files written by both writers are checked to be identical.
+"""
+
+import argparse
+import filecmp
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from groupy import GrouprOutput
+
+POINTWISE_MTS = [1, 18, 452]
+DISTRIBUTION_MTS = [18]
+SCATTERING_MTS = [2, 4, 11, 16, 17, 22, 23, 24, 25, 28, 29, 30, 32, 33, 34, 35]
+SCATTERING_MTS += [36, 37, 41, 42, 44, 45]
+
+
+def savetxt_writer(obj, stem):
+    """the writer from before the bulk writer, which grows the tables with
+    np.hstack and writes every file with np.savetxt"""
+
+    size = len(obj.energy_boundaries)
+
+    header = "Energy"
+    array = np.array(obj.energy_boundaries).reshape((size, 1))
+    for mt in POINTWISE_MTS:
+        header += f",MT{mt}"
+        if mt in obj.pointwise.keys():
+            column = np.append(obj.pointwise[mt].values, 0).reshape((size, 1))
+            array = np.hstack([array, column])
+        else:
+            array = np.hstack([array, np.zeros((size, 1))])
+    np.savetxt(f"{stem}pointwise.csv", array, delimiter=",", header=header)
+
+    header = "Energy"
+    array = np.array(obj.energy_boundaries).reshape((size, 1))
+    for mt in DISTRIBUTION_MTS:
+        header += f",MT{mt}"
+        if mt in obj.outgoing_distributions.keys():
+            values = obj.outgoing_distributions[mt].values
+            array = np.hstack([array, np.append(values, 0).reshape((size, 1))])
+        else:
+            array = np.hstack([array, np.zeros((size, 1))])
+    np.savetxt(f"{stem}outgoing.csv", array, delimiter=",", header=header)
+
+    for mt in SCATTERING_MTS:
+        array = np.zeros((size + 1, size + 1))
+        array[1:, 0] = obj.energy_boundaries
+        array[0, 1:] = obj.energy_boundaries
+        if mt in obj.scattering_matrices.keys():
+            array[1:-1, 1:-1] = obj.scattering_matrices[mt].values[:, :, 0]
+        elif mt == 4:
+            for partial_mt in range(51, 92):
+                if partial_mt in obj.scattering_matrices.keys():
+                    array[1:-1, 1:-1] += obj.scattering_matrices[partial_mt].values[
+                        :, :, 0
+                    ]
+        np.savetxt(f"{stem}scattering_matrix_{mt}.csv", array, delimiter=",")
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "gendf_file",
+        nargs="?",
+        default=Path(__file__).parent.parent / "tests" / "files" / "U238_356",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    obj = GrouprOutput(args.gendf_file, eager=True)
+    print(f"{args.gendf_file}: {len(obj.energy_boundaries) - 1} groups")
+
+    with tempfile.TemporaryDirectory() as directory:
+        old = Path(directory) / "old"
+        new = Path(directory) / "new"
+        old.mkdir()
+        new.mkdir()
+
+        old_time = best_time(lambda: savetxt_writer(obj, f"{old}/bench_"), args.repeat)
+        new_time = best_time(
+            lambda: obj.write_to_csv(title="bench", directory=new), args.repeat
+        )
+        npy_time = best_time(
+            lambda: obj.write_tables(title="bench", directory=new, format="npy"),
+            args.repeat,
+        )
+
+        names = sorted(path.name for path in old.iterdir())
+        _, mismatch, errors = filecmp.cmpfiles(old, new, names, shallow=False)
+        if mismatch or errors:
+            raise RuntimeError(f"The writers disagree on {mismatch + errors}")
+
+    print(f"np.savetxt writer  {old_time:8.4f} s")
+    print(f"bulk CSV writer    {new_time:8.4f} s  ({old_time / new_time:.1f}x)")
+    print(f"bulk .npy writer   {npy_time:8.4f} s  ({old_time / npy_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
-__version__ = "0.5.1"
+__version__ = "0.27.0"
 
 from groupy.parse import GrouprOutput
-from groupy.njoy import run_njoy
+from groupy.library import GrouprLibrary
+from groupy.parse_metrics import ParseMetrics
+from groupy.stream import iter_sections
+from groupy.store import LibraryStore
+from groupy.njoy import run_njoy, run_njoy_async, NjoyRunError
+from groupy.cache import ParseCache, NjoyCache
+from groupy.scratch import ScratchSpace
 
 from groupy.grouped import get_grouped_data
+from groupy.batch import run_batch
+from groupy.self_shielding import SelfShieldingTable
+from groupy.temperature import TemperatureInterpolator
+from groupy.pipeline import NjoyPipeline
+from groupy.sweep import run_sweep
@@ -0,0 +1,190 @@
+import json
+import numpy as np
+from pathlib import Path
+from groupy.base._energy_class import EnergyBoundaryValues
+from groupy.base._pointwise_class import PointwiseValues
+from groupy.base._outgoing_class import OutgoingDistribution
+from groupy.base._scattering_mat_class import ScatteringMatrix
+from groupy.base._banded_matrix import BandedMatrix
+
+MANIFEST = "manifest.json"
+ARRAYS = "arrays.bin"
+
+# arrays are aligned in the binary file so that they can be viewed in place
+ALIGNMENT = 64
+
+ARCHIVE_CLASSES = {
+    cls.__name__: cls
+    for cls in [
+        EnergyBoundaryValues,
+        PointwiseValues,
+        OutgoingDistribution,
+        ScatteringMatrix,
+        BandedMatrix,
+    ]
+}
+
+
+def save_value(value, arrays):
+    """Function to describe one attribute value for an archive
+
+    Arrays are added to ``arrays`` to be written to the binary file,
+    objects of the classes in ``ARCHIVE_CLASSES`` are described attribute
+    by attribute, lists are described item by item, and everything else
+    must be JSON-serializable.
+
+    Parameters
+    ----------
+    value : object
+        the value to describe
+
+    arrays : list of np.arrays
+        the arrays that will be written to the binary file
+
+    Returns
+    -------
+    dict
+        the JSON entry that describes the value
+    """
+
+    if isinstance(value, np.ndarray):
+        arrays.append(np.ascontiguousarray(value))
+        return {"array": len(arrays) - 1}
+
+    if type(value).__name__ in ARCHIVE_CLASSES:
+        return {
+            "class": type(value).__name__,
+            "attributes": {
+                key: save_value(attribute, arrays)
+                for key, attribute in vars(value).items()
+            },
+        }
+
+    if isinstance(value, list):
+        return {"list": [save_value(item, arrays) for item in value]}
+
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, Path):
+        value = str(value)
+
+    return {"value": value}
+
+
+def load_value(entry, arrays):
+    """Function to rebuild one attribute value from its archive entry
+
+    Parameters
+    ----------
+    entry : dict
+        the JSON entry that describes the value
+
+    arrays : list of np.arrays
+        the arrays read from the binary file
+
+    Returns
+    -------
+    object
+        the value
+    """
+
+    if "array" in entry:
+        return arrays[entry["array"]]
+
+    if "list" in entry:
+        return [load_value(item, arrays) for item in entry["list"]]
+
+    if "class" in entry:
+        cls = ARCHIVE_CLASSES[entry["class"]]
+        value = cls.__new__(cls)
+        for key, attribute in entry["attributes"].items():
+            setattr(value, key, load_value(attribute, arrays))
+        return value
+
+    return entry["value"]
+
+
+def write_archive(manifest, arrays, directory):
+    """Function to write an archive directory, with all of the arrays in
+    one binary file and everything else in a JSON manifest
+
+    Parameters
+    ----------
+    manifest : dict
+        the JSON-serializable description of the values
+
+    arrays : list of np.arrays
+        the arrays referenced by the manifest
+
+    directory : str or pathlib.Path object
+        the archive directory, which is created if needed
+
+    Returns
+    -------
+    None
+    """
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    layout = []
+    offset = 0
+    with open(directory / ARRAYS, "wb") as f:
+        for array in arrays:
+            padding = -offset % ALIGNMENT
+            f.write(b"\0" * padding)
+            offset += padding
+
+            layout.append(
+                {"offset": offset, "dtype": array.dtype.str, "shape": array.shape}
+            )
+            f.write(array.tobytes())
+            offset += array.nbytes
+
+    with open(directory / MANIFEST, "w") as f:
+        json.dump(dict(manifest, arrays=layout), f, indent=1)
+
+
+def read_archive(directory, mmap=True):
+    """Function to read an archive directory
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path object
+        the archive directory
+
+    mmap : bool, optional, default is True
+        If true, the arrays are read-only views of the memory-mapped
+        binary file. Otherwise the binary file is read into memory.
+
+    Returns
+    -------
+    dict
+        the manifest
+
+    list of np.arrays
+        the arrays referenced by the manifest
+    """
+
+    directory = Path(directory)
+    if not (directory / MANIFEST).exists():
+        raise FileNotFoundError(f"{directory} is not a groupy archive")
+
+    with open(directory / MANIFEST, "r") as f:
+        manifest = json.load(f)
+
+    if (directory / ARRAYS).stat().st_size == 0:
+        blob = np.zeros(0, dtype=np.uint8)
+    elif mmap:
+        blob = np.memmap(directory / ARRAYS, dtype=np.uint8, mode="r")
+    else:
+        blob = np.fromfile(directory / ARRAYS, dtype=np.uint8)
+
+    arrays = []
+    for layout in manifest["arrays"]:
+        dtype = np.dtype(layout["dtype"])
+        size = int(np.prod(layout["shape"])) * dtype.itemsize
+        array = blob[layout["offset"] : layout["offset"] + size]
+        arrays.append(array.view(dtype).reshape(layout["shape"]))
+
+    return manifest, arrays
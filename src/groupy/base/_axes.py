@@ -0,0 +1,132 @@
+import copy
+import numpy as np
+from groupy.base._banded_matrix import BandedMatrix
+
+# the section attributes that get a leading temperature axis
+TEMPERATURE_ATTRIBUTES = ["values", "flux_values", "temperature"]
+
+# the section attributes that have a sigma0 axis
+SIGMA0_ATTRIBUTES = ["values", "flux_values"]
+
+
+def _zeros_like(value):
+    """Function to create zero values like the given values, which can be
+    an array, a BandedMatrix or a list of them"""
+
+    if isinstance(value, list):
+        return [_zeros_like(item) for item in value]
+    if isinstance(value, BandedMatrix):
+        empty = np.zeros((0, value.shape[2]))
+        return BandedMatrix(value.shape[0], [], [], [], empty)
+    return np.zeros_like(value)
+
+
+def stack_temperatures(sections, temperatures):
+    """Function to combine the same section at several temperatures into
+    one section with a leading temperature axis
+
+    The values, flux values and temperatures of the sections are stacked,
+    so that ``values[T, ...]`` is the values at temperature ``T``. Sparse
+    values (BandedMatrix objects, or lists of them) can not be stacked, so
+    they are kept as a list with one item per temperature.
+
+    Parameters
+    ----------
+    sections : list of section objects
+        the section at each temperature, with None for temperatures where
+        the section is not in the file (which are filled with zeros)
+
+    temperatures : np.array of floats
+        the temperatures in K
+
+    Returns
+    -------
+    section object
+        the section with a temperature axis
+    """
+
+    present = next(section for section in sections if section is not None)
+    stacked = copy.copy(present)
+
+    stacked.temperature = np.asarray(temperatures, dtype=np.float64)
+
+    for name in TEMPERATURE_ATTRIBUTES:
+        if name == "temperature" or not hasattr(present, name):
+            continue
+
+        values = [
+            getattr(section, name)
+            if section is not None
+            else _zeros_like(getattr(present, name))
+            for section in sections
+        ]
+
+        if isinstance(values[0], (BandedMatrix, list)):
+            setattr(stacked, name, values)
+        else:
+            setattr(stacked, name, np.stack(values))
+
+    return stacked
+
+
+def select_temperature(section, index):
+    """Function to get a section at one temperature from a section with a
+    leading temperature axis
+
+    Parameters
+    ----------
+    section : section object
+        the section, with a temperature axis
+
+    index : int
+        the index of the temperature
+
+    Returns
+    -------
+    section object
+        the section at that temperature, with views of the values
+    """
+
+    selected = copy.copy(section)
+    for name in TEMPERATURE_ATTRIBUTES:
+        if hasattr(section, name):
+            setattr(selected, name, getattr(section, name)[index])
+    return selected
+
+
+def select_sigma0(section, index, temperature_axis=False):
+    """Function to get a section at one sigma0 value from a section with
+    a sigma0 axis
+
+    Parameters
+    ----------
+    section : section object
+        the section, with a sigma0 axis
+
+    index : int
+        the index of the sigma0 value
+
+    temperature_axis : bool, optional, default is False
+        whether the section also has a leading temperature axis, in which
+        case the sigma0 axis is the second one
+
+    Returns
+    -------
+    section object
+        the section at that sigma0 value, with views of the values
+    """
+
+    selected = copy.copy(section)
+    for name in SIGMA0_ATTRIBUTES:
+        if not hasattr(section, name):
+            continue
+
+        value = getattr(section, name)
+        if not temperature_axis:
+            value = value[index]
+        elif isinstance(value, list):
+            value = [item[index] for item in value]
+        else:
+            value = value[:, index]
+        setattr(selected, name, value)
+    return selected
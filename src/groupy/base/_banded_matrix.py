@@ -0,0 +1,283 @@
+import numpy as np
+from groupy.base._decoder import segment_indices
+
+
+class BandedMatrix:
+    """Class to hold a group-to-group matrix as one band of columns per row
+
+    GENDF gives each row of a scattering matrix as a band of NG2-1
+    columns starting at IG2LO, so only the values inside each band are
+    stored. Indexing with ``[row, column, ell]`` returns the same values
+    as the dense array would.
+
+    Parameters
+    ----------
+    number_groups : int
+        the number of groups
+
+    rows : np.array of ints
+        the (zero-based) row of each band
+
+    first_columns : np.array of ints
+        the (zero-based) column of the first value in each band
+
+    lengths : np.array of ints
+        the number of columns in each band
+
+    values : np.array of floats
+        the values of all of the bands, one band after the other, with
+        shape (total number of band values, number of Legendre orders)
+
+    Attributes
+    ----------
+    shape : tuple of ints
+        the shape of the equivalent dense array
+
+    row_pointers : np.array of ints
+        the offset of each row's band into ``data``
+
+    first_columns : np.array of ints
+        the column of the first value of each row's band
+
+    data : np.array of floats
+        the band values, with one row per stored value
+
+    Methods
+    -------
+    from_dense
+        Function to create a BandedMatrix from a dense array
+
+    toarray
+        Function to create the dense array
+
+    row
+        Function to get one row of the matrix
+
+    column
+        Function to get one column of the matrix
+
+    matvec
+        Function to multiply the matrix by a vector
+
+    rmatvec
+        Function to multiply the transposed matrix by a vector
+
+    """
+
+    def __init__(self, number_groups, rows, first_columns, lengths, values):
+
+        rows = np.asarray(rows, dtype=np.int64)
+        first_columns = np.asarray(first_columns, dtype=np.int64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+
+        if len(np.unique(rows)) != len(rows):
+            raise ValueError(f"Each row of a BandedMatrix can only have one band.")
+
+        self.shape = (number_groups, number_groups, values.shape[1])
+
+        # sort the bands by row, and give empty bands to missing rows
+        offsets = np.cumsum(lengths) - lengths
+        order = np.argsort(rows, kind="stable")
+        self.data = values[segment_indices(offsets[order], lengths[order])]
+
+        row_lengths = np.zeros(number_groups, dtype=np.int64)
+        row_lengths[rows] = lengths
+        self.row_pointers = np.concatenate([[0], np.cumsum(row_lengths)])
+        self.first_columns = np.zeros(number_groups, dtype=np.int64)
+        self.first_columns[rows] = first_columns
+
+    @classmethod
+    def from_dense(cls, array):
+        """Function to create a BandedMatrix from a dense array, with the
+        band of each row running from its first to its last non-zero column
+
+        Parameters
+        ----------
+        array : np.array of floats
+            the matrix, with shape (number of groups, number of groups,
+            number of Legendre orders)
+
+        Returns
+        -------
+        BandedMatrix object
+            the matrix
+        """
+
+        array = np.asarray(array, dtype=np.float64)
+        number_groups = array.shape[0]
+
+        nonzero = np.any(array != 0, axis=2)
+        rows = np.flatnonzero(nonzero.any(axis=1))
+        first_columns = np.argmax(nonzero[rows], axis=1)
+        lengths = number_groups - np.argmax(nonzero[rows, ::-1], axis=1) - first_columns
+
+        values = array[
+            np.repeat(rows, lengths), segment_indices(first_columns, lengths)
+        ]
+        return cls(number_groups, rows, first_columns, lengths, values)
+
+    @property
+    def ndim(self):
+        return 3
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.row_pointers.nbytes + self.first_columns.nbytes
+
+    @property
+    def _lengths(self):
+        return np.diff(self.row_pointers)
+
+    def _entries(self, rows=None):
+        """Function to get the row, column and data index of every stored
+        value in the given rows"""
+
+        if rows is None:
+            rows = np.arange(self.shape[0])
+        lengths = self._lengths[rows]
+        positions = segment_indices(self.row_pointers[rows], lengths)
+        columns = segment_indices(self.first_columns[rows], lengths)
+        return np.repeat(np.arange(len(rows)), lengths), columns, positions
+
+    def toarray(self):
+        """Function to create the dense array
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        np.array of floats
+            the matrix, with shape (number of groups, number of groups,
+            number of Legendre orders)
+        """
+
+        array = np.zeros(self.shape)
+        rows, columns, positions = self._entries()
+        array[rows, columns] = self.data[positions]
+        return array
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.toarray()
+        return array if dtype is None else array.astype(dtype)
+
+    def row(self, index):
+        """Function to get one row of the matrix
+
+        Parameters
+        ----------
+        index : int
+            the (zero-based) row
+
+        Returns
+        -------
+        np.array of floats
+            the row, with shape (number of groups, number of Legendre orders)
+        """
+
+        array = np.zeros(self.shape[1:])
+        start, stop = self.row_pointers[index], self.row_pointers[index + 1]
+        first = self.first_columns[index]
+        array[first : first + stop - start] = self.data[start:stop]
+        return array
+
+    def column(self, index):
+        """Function to get one column of the matrix
+
+        Parameters
+        ----------
+        index : int
+            the (zero-based) column
+
+        Returns
+        -------
+        np.array of floats
+            the column, with shape (number of groups, number of Legendre
+            orders)
+        """
+
+        index = np.arange(self.shape[1])[index]
+        array = np.zeros((self.shape[0], self.shape[2]))
+        offset = index - self.first_columns
+        inside = (offset >= 0) & (offset < self._lengths)
+        array[inside] = self.data[self.row_pointers[:-1][inside] + offset[inside]]
+        return array
+
+    def __getitem__(self, key):
+
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > 3:
+            raise IndexError(f"A BandedMatrix only has 3 dimensions.")
+        key = key + (slice(None),) * (3 - len(key))
+
+        row_key, column_key, ell_key = key
+
+        # a single column can be read without building the rows
+        if isinstance(column_key, (int, np.integer)):
+            return self.column(column_key)[row_key, ell_key]
+
+        rows = np.arange(self.shape[0])[row_key]
+        single_row = np.ndim(rows) == 0
+        rows = np.atleast_1d(rows)
+
+        array = np.zeros((len(rows),) + self.shape[1:])
+        row_indices, columns, positions = self._entries(rows)
+        array[row_indices, columns] = self.data[positions]
+        array = array[:, column_key, ell_key]
+        return array[0] if single_row else array
+
+    def matvec(self, vector, ell=0):
+        """Function to multiply the matrix by a vector, for one Legendre order
+
+        Parameters
+        ----------
+        vector : np.array of floats
+            the vector, with one value for each group
+
+        ell : int, optional, default is 0
+            the Legendre order
+
+        Returns
+        -------
+        np.array of floats
+            the product ``A[:, :, ell] @ vector``
+        """
+
+        rows, columns, positions = self._entries()
+        return np.bincount(
+            rows,
+            weights=self.data[positions, ell] * np.asarray(vector)[columns],
+            minlength=self.shape[0],
+        )
+
+    def rmatvec(self, vector, ell=0):
+        """Function to multiply the transposed matrix by a vector, for one
+        Legendre order
+
+        Parameters
+        ----------
+        vector : np.array of floats
+            the vector, with one value for each group
+
+        ell : int, optional, default is 0
+            the Legendre order
+
+        Returns
+        -------
+        np.array of floats
+            the product ``A[:, :, ell].T @ vector``
+        """
+
+        rows, columns, positions = self._entries()
+        return np.bincount(
+            columns,
+            weights=self.data[positions, ell] * np.asarray(vector)[rows],
+            minlength=self.shape[1],
+        )
@@ -0,0 +1,212 @@
+import copy
+import numpy as np
+from groupy.base._banded_matrix import BandedMatrix
+
+
+def collapse_positions(fine_boundaries, coarse_boundaries, rtol=1e-6):
+    """Function to find the coarse group boundaries in a fine group
+    structure
+
+    Parameters
+    ----------
+    fine_boundaries : np.array of floats
+        the fine group boundaries, in increasing order
+
+    coarse_boundaries : np.array of floats
+        the coarse group boundaries, in increasing order, which must all be
+        fine group boundaries
+
+    rtol : float, optional, default is 1e-6
+        the relative tolerance for matching the boundaries
+
+    Returns
+    -------
+    np.array of ints
+        the index of each coarse boundary in the fine boundaries, so that
+        coarse group G is made of fine groups positions[G] to
+        positions[G + 1] - 1
+    """
+
+    fine = np.asarray(fine_boundaries, dtype=np.float64)
+    coarse = np.asarray(coarse_boundaries, dtype=np.float64)
+
+    if coarse.ndim != 1 or len(coarse) < 2 or np.any(np.diff(coarse) <= 0):
+        raise ValueError(f"The group boundaries must be at least two increasing values")
+
+    # take the nearest fine boundary, then check that it is the same value
+    above = np.clip(np.searchsorted(fine, coarse), 1, len(fine) - 1)
+    below = above - 1
+    nearest = np.where(
+        np.abs(fine[below] - coarse) <= np.abs(fine[above] - coarse), below, above
+    )
+    nested = np.isclose(fine[nearest], coarse, rtol=rtol, atol=0)
+    if not np.all(nested):
+        raise ValueError(
+            f"The group structure is not nested in the fine group structure: "
+            f"{coarse[~nested]} eV are not fine group boundaries"
+        )
+    return nearest
+
+
+def group_sum(values, positions, axis=-1):
+    """Function to sum the fine groups of each coarse group along one axis
+
+    Parameters
+    ----------
+    values : np.array of floats
+        the fine group values
+
+    positions : np.array of ints
+        the coarse boundaries in the fine group structure, from
+        collapse_positions
+
+    axis : int, optional, default is -1
+        the group axis
+
+    Returns
+    -------
+    np.array of floats
+        the sums, with the group axis shortened to the coarse groups
+    """
+
+    values = np.moveaxis(np.asarray(values), axis, -1)[
+        ..., positions[0] : positions[-1]
+    ]
+    sums = np.add.reduceat(values, positions[:-1] - positions[0], axis=-1)
+    return np.moveaxis(sums, -1, axis)
+
+
+def weighted_average(values, weights, positions, axis=-1):
+    """Function to average the fine groups of each coarse group along one
+    axis, with weights that have the same shape as the values
+
+    Coarse groups with no weight are zero.
+    """
+
+    numerator = group_sum(values * weights, positions, axis)
+    denominator = group_sum(weights, positions, axis)
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros_like(numerator, dtype=np.float64),
+        where=denominator != 0,
+    )
+
+
+def collapse_pointwise(section, positions, weights):
+    """Function to collapse a PointwiseValues section
+
+    Parameters
+    ----------
+    section : PointwiseValues object
+        the fine group section
+
+    positions : np.array of ints
+        the coarse boundaries in the fine group structure
+
+    weights : np.array of floats
+        the weight of each fine group value, with the shape of the values
+
+    Returns
+    -------
+    PointwiseValues object
+        the coarse group section, with the flux summed over each coarse
+        group
+    """
+
+    collapsed = copy.copy(section)
+    collapsed.values = weighted_average(section.values, weights, positions)
+    collapsed.flux_values = group_sum(section.flux_values, positions)
+    collapsed.number_groups = len(positions) - 1
+    return collapsed
+
+
+def collapse_outgoing(section, positions):
+    """Function to collapse an OutgoingDistribution section, by summing the
+    probability of the fine groups in each coarse group"""
+
+    collapsed = copy.copy(section)
+    collapsed.values = group_sum(section.values, positions)
+    collapsed.number_groups = len(positions) - 1
+    return collapsed
+
+
+def collapse_matrix(section, positions, weights):
+    """Function to collapse a ScatteringMatrix section, averaging over the
+    incoming groups with the weights and summing over the outgoing groups,
+    for every Legendre order
+
+    Parameters
+    ----------
+    section : ScatteringMatrix object
+        the fine group section
+
+    positions : np.array of ints
+        the coarse boundaries in the fine group structure
+
+    weights : np.array of floats
+        the weight of each incoming fine group, with the shape of the flux
+        values without their Legendre axis
+
+    Returns
+    -------
+    ScatteringMatrix object
+        the coarse group section
+    """
+
+    collapsed = copy.copy(section)
+    collapsed.values = _collapse_matrix_values(section.values, weights, positions)
+    collapsed.flux_values = group_sum(section.flux_values, positions, axis=-2)
+    collapsed.number_groups = len(positions) - 1
+    return collapsed
+
+
+def _collapse_matrix_values(values, weights, positions):
+    """Function to collapse dense matrices (with any leading axes), a
+    BandedMatrix, or a list of them"""
+
+    if isinstance(values, list):
+        return [
+            _collapse_matrix_values(item, weights[index], positions)
+            for index, item in enumerate(values)
+        ]
+
+    if isinstance(values, BandedMatrix):
+        return _collapse_banded(values, weights, positions)
+
+    weighted = values * weights[..., :, None, None]
+    sums = group_sum(group_sum(weighted, positions, axis=-3), positions, axis=-2)
+    denominator = group_sum(weights, positions)[..., :, None, None]
+    return np.divide(sums, denominator, out=np.zeros_like(sums), where=denominator != 0)
+
+
+def _collapse_banded(matrix, weights, positions):
+    """Function to collapse a BandedMatrix from its stored values, without
+    making the dense fine group matrix"""
+
+    number_groups = len(positions) - 1
+    number_legendre = matrix.shape[2]
+
+    # the coarse group of each fine group, or -1 outside of the structure
+    coarse = np.full(matrix.shape[0], -1, dtype=np.int64)
+    coarse[positions[0] : positions[-1]] = (
+        np.searchsorted(positions, np.arange(positions[0], positions[-1]), "right") - 1
+    )
+
+    rows, columns, entries = matrix._entries()
+    inside = (coarse[rows] >= 0) & (coarse[columns] >= 0)
+    rows, columns, entries = rows[inside], columns[inside], entries[inside]
+
+    flat = coarse[rows] * number_groups + coarse[columns]
+    values = matrix.data[entries] * weights[rows, None]
+    sums = np.stack(
+        [
+            np.bincount(flat, weights=values[:, ell], minlength=number_groups**2)
+            for ell in range(number_legendre)
+        ],
+        axis=-1,
+    ).reshape((number_groups, number_groups, number_legendre))
+
+    denominator = group_sum(weights, positions)[:, None, None]
+    sums = np.divide(sums, denominator, out=np.zeros_like(sums), where=denominator != 0)
+    return BandedMatrix.from_dense(sums)
@@ -0,0 +1,292 @@
+import numpy as np
+
+# the layout of an ENDF/GENDF line: six 11-character fields followed by the
+# MAT (4), MF (2), MT (3) and line number (5) identifiers
+LINE_WIDTH = 80
+FIELD_WIDTH = 11
+FIELDS_PER_LINE = 6
+
+CONTROL_DTYPE = np.dtype(
+    [
+        ("C1", np.float64),
+        ("C2", np.float64),
+        ("L1", np.int64),
+        ("L2", np.int64),
+        ("N1", np.int64),
+        ("N2", np.int64),
+        ("MAT", np.int64),
+        ("MF", np.int64),
+        ("MT", np.int64),
+        ("start", np.int64),
+    ]
+)
+
+_SPACE = ord(" ")
+_ZERO = ord("0")
+_EXPONENT = ord("e")
+_PLUS = ord("+")
+_MINUS = ord("-")
+_POINT = ord(".")
+_NINE = ord("9")
+_NEWLINE = ord("\n")
+
+_NUMERIC = np.zeros(256, dtype=bool)
+_NUMERIC[np.frombuffer(b"0123456789+-.eE ", dtype=np.uint8)] = True
+
+
+def as_char_array(buffer):
+    """Function to lay out ENDF-formatted text as a 2D array of characters
+
+    Buffers made of 80-character lines separated by single newlines are
+    viewed in place, without copying. Anything else (short lines, carriage
+    returns, a list of lines) is padded out to 80 columns first.
+
+    Parameters
+    ----------
+    buffer : str, bytes-like, or list of strings
+        the text, either as one buffer or as a list of lines
+
+    Returns
+    -------
+    np.array of uint8
+        the characters, with shape (number of lines, 80)
+    """
+
+    lines = None
+    if isinstance(buffer, (list, tuple)):
+        lines = buffer
+        buffer = "\n".join(lines) + "\n"
+
+    if isinstance(buffer, str):
+        buffer = buffer.encode("ascii")
+
+    chars = np.frombuffer(buffer, dtype=np.uint8)
+
+    # fast path - fixed width lines can be viewed directly
+    width = LINE_WIDTH + 1
+    if chars.size % width == 0 and np.all(chars[LINE_WIDTH::width] == _NEWLINE):
+        return chars.reshape((-1, width))[:, :LINE_WIDTH]
+
+    if lines is None:
+        lines = bytes(buffer).decode("ascii").splitlines()
+
+    text = "".join(line.rstrip("\r\n")[:LINE_WIDTH].ljust(LINE_WIDTH) for line in lines)
+    return np.frombuffer(text.encode("ascii"), dtype=np.uint8).reshape((-1, LINE_WIDTH))
+
+
+def decode_fields(chars):
+    """Function to convert fixed-width numeric fields to floats in bulk
+
+    Handles the ENDF convention of dropping the "E" from the exponent
+    (``1.234567+5``), as well as regular Fortran floats, integers and
+    blank fields (which are read as zero). Fields holding text, like an
+    ENDF description, are read as NaN.
+
+    Parameters
+    ----------
+    chars : np.array of uint8
+        the field characters, with shape (number of fields, field width)
+
+    Returns
+    -------
+    np.array of floats
+        the value of each field
+    """
+
+    number, width = chars.shape
+    chars = np.ascontiguousarray(chars)
+    columns = chars.T
+
+    # an exponent sign is a sign that directly follows a digit or a point
+    is_sign = columns[1:] - _PLUS <= _MINUS - _PLUS
+    follows_mantissa = columns[:-1] - _POINT <= _NINE - _POINT
+    exponent = is_sign & follows_mantissa
+    position = exponent.argmax(axis=0) + 1
+    has_exponent = exponent[position - 1, np.arange(number)]
+    position[~has_exponent] = width + 1
+
+    # shift everything from the exponent sign right by one, and put an "e"
+    # in the gap - working column by column keeps this cheap
+    expanded = np.empty((width + 1, number), dtype=np.uint8)
+    expanded[0] = columns[0]
+    for column in range(1, width + 1):
+        current = columns[column] if column < width else _SPACE
+        expanded[column] = np.where(column < position, current, columns[column - 1])
+    expanded[position[has_exponent], has_exponent.nonzero()[0]] = _EXPONENT
+
+    # blank fields are zero
+    expanded[0, chars.view(f"S{width}").ravel() == b" " * width] = _ZERO
+
+    expanded = np.ascontiguousarray(expanded.T)
+    strings = expanded.view(f"S{width + 1}").ravel()
+    try:
+        return strings.astype(np.float64)
+    except ValueError:
+        # only text, like an ENDF description, can not be converted
+        text = ~_NUMERIC[expanded].all(axis=1)
+        values = np.where(text, b"0", strings).astype(np.float64)
+        values[text] = np.nan
+        return values
+
+
+def decode_integers(chars):
+    """Function to convert fixed-width integer fields to ints in bulk
+
+    Parameters
+    ----------
+    chars : np.array of uint8
+        the field characters, with shape (number of fields, field width)
+
+    Returns
+    -------
+    np.array of ints
+        the value of each field, with blank fields read as zero
+    """
+
+    digits = chars.astype(np.int64) - _ZERO
+    is_digit = (digits >= 0) & (digits <= 9)
+
+    values = np.zeros(chars.shape[0], dtype=np.int64)
+    for column in range(chars.shape[1]):
+        values = np.where(is_digit[:, column], values * 10 + digits[:, column], values)
+
+    negative = (chars == _MINUS).any(axis=1)
+    values[negative] *= -1
+    return values
+
+
+def decode_identifiers(line):
+    """Function to read the MAT, MF and MT numbers of one line
+
+    Parameters
+    ----------
+    line : bytes
+        the ENDF-formatted line
+
+    Returns
+    -------
+    tuple of ints
+        the MAT, MF and MT numbers, with blank numbers read as zero
+    """
+
+    # the three numbers are padded to 4 characters, so that one call to
+    # decode_integers reads them all
+    ids = line[66:75].ljust(9)
+    chars = np.frombuffer(ids[:4] + b"  " + ids[4:6] + b" " + ids[6:9], np.uint8)
+    mat, mf, mt = decode_integers(chars.reshape((3, 4))).tolist()
+    return mat, mf, mt
+
+
+def read_records(buffer):
+    """Function to decode every line of an ENDF-formatted buffer
+
+    Parameters
+    ----------
+    buffer : str, bytes-like, or list of strings
+        the text, either as one buffer or as a list of lines
+
+    Returns
+    -------
+    np.array of floats
+        the six numeric fields of each line, with shape (number of lines, 6).
+        Lines with MF=0 (the tape title, FEND, MEND and TEND records) are
+        read as zeros.
+
+    np.array of ints
+        the MAT, MF and MT of each line, with shape (number of lines, 3)
+    """
+
+    chars = as_char_array(buffer)
+    number = chars.shape[0]
+
+    ids = np.empty((number, 3), dtype=np.int64)
+    for i, (start, stop) in enumerate([(66, 70), (70, 72), (72, 75)]):
+        ids[:, i] = decode_integers(chars[:, start:stop])
+
+    # the tape title and the FEND, MEND and TEND records have no numbers
+    numeric = chars[:, : FIELD_WIDTH * FIELDS_PER_LINE].copy()
+    numeric[ids[:, 1] == 0] = _SPACE
+    values = decode_fields(numeric.reshape((-1, FIELD_WIDTH))).reshape(
+        (number, FIELDS_PER_LINE)
+    )
+
+    return values, ids
+
+
+def segment_indices(starts, lengths):
+    """Function to build the concatenation of several ranges of indices
+
+    Parameters
+    ----------
+    starts : np.array of ints
+        the first index of each range
+
+    lengths : np.array of ints
+        the length of each range
+
+    Returns
+    -------
+    np.array of ints
+        the indices ``starts[0], ..., starts[0] + lengths[0] - 1, starts[1], ...``
+    """
+
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+
+def decode_section(buffer):
+    """Function to decode one GENDF section
+
+    A GENDF section is a HEAD record followed by a series of records, each
+    made of a control line and the NW (N1) values that follow it. The
+    values of all records are returned in a single flat array, and the
+    ``start`` field of each control record is its offset into that array.
+
+    Parameters
+    ----------
+    buffer : str, bytes-like, or list of strings
+        the section text, either as one buffer or as a list of lines
+
+    Returns
+    -------
+    np.void
+        the HEAD record, with the fields of ``CONTROL_DTYPE``
+
+    np.array of ``CONTROL_DTYPE``
+        the control record of each LIST record in the section
+
+    np.array of floats
+        the values of every LIST record, one after the other
+    """
+
+    values, ids = read_records(buffer)
+
+    # walk the control lines - each one says how many value lines follow it
+    numbers_of_values = values[:, 4].astype(np.int64).tolist()
+    mts = ids[:, 2].tolist()
+    control_indices = []
+    index = 1
+    while index < len(mts) and mts[index] != 0:
+        control_indices.append(index)
+        index += 1 + -(-numbers_of_values[index] // FIELDS_PER_LINE)
+
+    control_indices = np.array(control_indices, dtype=np.int64)
+    lengths = values[control_indices, 4].astype(np.int64)
+    data = values.ravel()[
+        segment_indices((control_indices + 1) * FIELDS_PER_LINE, lengths)
+    ]
+
+    all_controls = np.concatenate([[0], control_indices])
+    controls = np.empty(len(all_controls), dtype=CONTROL_DTYPE)
+    controls["C1"] = values[all_controls, 0]
+    controls["C2"] = values[all_controls, 1]
+    for i, name in enumerate(["L1", "L2", "N1", "N2"]):
+        controls[name] = values[all_controls, 2 + i]
+    for i, name in enumerate(["MAT", "MF", "MT"]):
+        controls[name] = ids[all_controls, i]
+    controls["start"][0] = 0
+    controls["start"][1:] = np.cumsum(lengths) - lengths
+
+    return controls[0], controls[1:], data
@@ -0,0 +1,236 @@
+import re
+from pathlib import Path
+from groupy.base._decoder import decode_identifiers
+
+# the ENDF convention drops the "E" from the exponent, like 9.223800+4
+_EXPONENT = re.compile(rb"(?<=[0-9.])([+-])")
+
+
+class EndfHeader:
+    """Class to hold what the MF1/MT451 header of one ENDF material says
+    about it
+
+    Parameters
+    ----------
+    mat : int
+        the material number
+
+    za : float, optional, default is None
+        the ZA number (1000 * Z + A)
+
+    awr : float, optional, default is None
+        the mass of the target in neutron masses
+
+    description : str, optional, default is ""
+        the text description of the evaluation
+
+    sections : list of tuples, optional, default is None
+        the MF and MT of each section of the material
+
+    Attributes
+    ----------
+    mat : int
+        the material number
+
+    za : float or None
+        the ZA number
+
+    awr : float or None
+        the mass of the target in neutron masses
+
+    description : str
+        the text description of the evaluation, one line per record
+
+    sections : list of tuples
+        the MF and MT of each section, in the order of the directory
+
+    Methods
+    -------
+    has_section
+        Function to check whether the material has a section
+    """
+
+    def __init__(self, mat, za=None, awr=None, description="", sections=None):
+
+        self.mat = mat
+        self.za = za
+        self.awr = awr
+        self.description = description
+        self.sections = [] if sections is None else sections
+
+    @property
+    def file_numbers(self):
+        return list(dict.fromkeys(mf for mf, _ in self.sections))
+
+    def has_section(self, mf, mt):
+        """Function to check whether the material has a section
+
+        Parameters
+        ----------
+        mf : int
+            the file number
+
+        mt : int
+            the section number
+
+        Returns
+        -------
+        bool
+            whether the section is in the material
+        """
+
+        return (mf, mt) in self.sections
+
+    def __repr__(self):
+        return f"EndfHeader(MAT{self.mat}, {len(self.sections)} sections)"
+
+
+def read_endf_headers(filename):
+    """Function to get the header of every material of an ENDF file,
+    without reading the data
+
+    Only the MF1/MT451 records of each material are read. The directory at
+    the end of MT451 gives the number of lines of every section, so when
+    the lines all have the same length the rest of the material is skipped
+    with a single seek. If the directory is missing, or the skip does not
+    land on the MEND record of the material, the material is scanned
+    instead, reading only the MAT, MF and MT of each line.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path object
+        the ENDF file
+
+    Returns
+    -------
+    list of EndfHeader objects
+        the header of each material, in the order they are on the tape
+    """
+
+    filename = Path(filename)
+    if not filename.exists():
+        raise FileNotFoundError(f"The ENDF6-formatted file {filename} was not found.")
+
+    headers = []
+    with open(filename, "rb") as f:
+        while True:
+            position = f.tell()
+            line = f.readline()
+            if not line:
+                break
+
+            # skip the tape identification, MEND and TEND records
+            mat, mf, mt = decode_identifiers(line)
+            if mat <= 0 or mt == 0:
+                continue
+
+            if (mf, mt) == (1, 451):
+                header, number_lines = _read_directory(f, line)
+                if number_lines is None:
+                    # the sections are found by the scan instead
+                    header.sections = [(mf, mt)]
+                    _scan_material(f, header)
+                elif not _skip_material(f, position, len(line), number_lines, mat):
+                    _scan_material(f, None)
+            else:
+                header = EndfHeader(mat, sections=[(mf, mt)])
+                _scan_material(f, header)
+            headers.append(header)
+
+    if not headers:
+        raise ValueError(f"No ENDF materials were found in {filename}")
+    return headers
+
+
+def _field(line, index):
+    """Function to get one 11-character field of a line as a float"""
+
+    text = line[11 * index : 11 * (index + 1)].strip()
+    if not text:
+        return 0.0
+    return float(_EXPONENT.sub(rb"e\1", text))
+
+
+def _read_directory(f, head):
+    """Function to read the rest of MF1/MT451, which is the file position
+    after its HEAD record
+
+    Returns
+    -------
+    EndfHeader object
+        the header of the material
+
+    int
+        the number of lines of the material, from its HEAD record through
+        its MEND record, or None if the directory is missing
+    """
+
+    mat = decode_identifiers(head)[0]
+    header = EndfHeader(mat, za=_field(head, 0), awr=_field(head, 1))
+
+    # ENDF-6 has three CONT records after the HEAD, and the last gives the
+    # number of description and directory lines; earlier formats have one
+    cont = f.readline()
+    if int(_field(cont, 5)) == 6:
+        f.readline()
+        cont = f.readline()
+    number_description, number_directory = int(_field(cont, 4)), int(_field(cont, 5))
+
+    description = [f.readline() for _ in range(number_description)]
+    header.description = "\n".join(
+        line[:66].decode("ascii", errors="replace").rstrip() for line in description
+    )
+
+    sizes = {}
+    for _ in range(number_directory):
+        line = f.readline()
+        if decode_identifiers(line) != (mat, 1, 451):
+            return header, None
+        mf, mt = int(_field(line, 2)), int(_field(line, 3))
+        header.sections.append((mf, mt))
+        sizes[mf] = sizes.get(mf, 0) + int(_field(line, 4)) + 1
+
+    if not header.sections:
+        return header, None
+
+    # each section ends with a SEND record and each file with a FEND
+    # record, and the material ends with a MEND record
+    return header, sum(sizes.values()) + len(sizes) + 1
+
+
+def _skip_material(f, position, width, number_lines, mat):
+    """Function to seek past the MEND record of a material, if every line
+    has the same width
+
+    Returns
+    -------
+    bool
+        whether the file is now after the MEND record; if not, it is put
+        back after the HEAD record of the material
+    """
+
+    f.seek(position + (number_lines - 2) * width)
+    fend, mend = f.readline(), f.readline()
+    if (
+        len(fend) == width
+        and len(mend) == width
+        and decode_identifiers(fend) == (mat, 0, 0)
+        and decode_identifiers(mend) == (0, 0, 0)
+    ):
+        return True
+
+    f.seek(position + width)
+    return False
+
+
+def _scan_material(f, header):
+    """Function to read the MAT, MF and MT of each line up to the MEND
+    record of a material, adding its sections to the header if one is
+    given"""
+
+    for line in f:
+        mat, mf, mt = decode_identifiers(line)
+        if mat <= 0:
+            return
+        if header is not None and mt > 0 and header.sections[-1] != (mf, mt):
+            header.sections.append((mf, mt))
@@ -1,5 +1,5 @@
-import fortranformat as ff
 import numpy as np
+from groupy.base._decoder import decode_section
 
 
 class EnergyBoundaryValues:
@@ -27,8 +27,12 @@ class EnergyBoundaryValues:
     group_types : str
         the particle type for the groups ("neutron" or "gamma")
 
-    sigma0 : float
-        the sigma0 value for the calculation
+    sigma0 : float or np.array of floats
+        the sigma0 value for the calculation, or the sigma0 values when
+        there is more than one
+
+    temperature : float
+        the temperature of the calculation in K
 
     Methods
     -------
@@ -54,16 +58,11 @@ class EnergyBoundaryValues:
         None
 
         """
-        control_line = ff.FortranRecordReader("(2G11.0,4I11,I4,I2,I3,I5)")
-        energy_line = ff.FortranRecordReader("(6G11.0)")
-
-        self.ZA, self.AWR, _, nz, _, _, _, mf, mt, _ = control_line.read(lines[0])
+        head, records, data = decode_section(lines)
 
-        # check that there is only 1 sigma0 value
-        if nz != 1:
-            raise NotImplementedError(
-                f"Multiple sigma0 values are not yet implemented."
-            )
+        self.ZA, self.AWR = head["C1"], head["C2"]
+        nz, ntw = int(head["L2"]), int(head["N2"])
+        mf, mt = head["MF"], head["MT"]
 
         # check that MF and MT are correct
         if mf != 1 or mt != 451:
@@ -71,8 +70,9 @@ class EnergyBoundaryValues:
                 f"The EnergyBoundaryValues class must be given MF1 MT451 section, not the MT{mf} MT{mt} section."
             )
 
-        # read the next control line
-        temp, _, ngn, ngg, nw, _, _, _, _, _ = control_line.read(lines[1])
+        # the control line for the list of values
+        ngn, ngg = int(records["L1"][0]), int(records["L2"][0])
+        self.temperature = records["C1"][0]
 
         # figure out neutron or gamma groups and get number
         if ngn > 0:
@@ -84,18 +84,12 @@ class EnergyBoundaryValues:
         else:
             raise ValueError(f"Both NGN and NGG cannot be zero.")
 
-        # read the group boundaries
-
-        # the first line has zero and then sigma0 first
-        vals = energy_line.read(lines[2])
-        self.sigma0 = vals[1]
-        self.energy_boundaries = vals[2:]
+        # the values are the title, then sigma0, then the neutron group
+        # boundaries and the gamma group boundaries
+        self.sigma0 = data[ntw] if nz == 1 else data[ntw : ntw + nz]
 
-        for line in lines[3:-1]:
-            for val in energy_line.read(line):
-                if val > 0:
-                    self.energy_boundaries.append(val)
+        start = ntw + nz
+        if self.group_types == "gamma":
+            start += ngn + 1
 
-        self.energy_boundaries = np.array(self.energy_boundaries)[
-            : self.number_groups + 1
-        ]
+        self.energy_boundaries = data[start : start + self.number_groups + 1]
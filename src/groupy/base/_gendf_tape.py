@@ -0,0 +1,252 @@
+import mmap
+import numpy as np
+from pathlib import Path
+from groupy.base._decoder import LINE_WIDTH, as_char_array, decode_integers
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("MAT", np.int64),
+        ("MF", np.int64),
+        ("MT", np.int64),
+        ("block", np.int64),
+        ("start", np.int64),
+        ("stop", np.int64),
+    ]
+)
+
+_NEWLINE = ord("\n")
+
+
+class GendfTape:
+    """Class to index the sections of a GENDF file without parsing them
+
+    The file is memory-mapped, and the MAT, MF and MT of every line
+    (columns 67-75) are read in a single vectorized pass to find where
+    each section starts and stops. Sections are handed out as zero-copy
+    slices of the mapped file.
+
+    A material can appear in several blocks (each ended by a MEND record),
+    which is how GROUPR writes the results of a run with several
+    temperatures - one block per temperature.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path object
+        the GENDF file
+
+    Attributes
+    ----------
+    title : str
+        the tape title, from the first line
+
+    index : np.array of INDEX_DTYPE
+        the MAT, MF, MT, block and the line range of each section
+
+    material_numbers : list of ints
+        the MAT numbers in the file
+
+    Methods
+    -------
+    number_blocks
+        Function to get the number of blocks of a material
+
+    file_numbers
+        Function to get the MF numbers of a material
+
+    section_numbers
+        Function to get the MT numbers of a file
+
+    section
+        Function to get the text of a section
+
+    """
+
+    def __init__(self, filename):
+
+        self.filename = Path(filename)
+
+        if not self.filename.exists():
+            raise FileNotFoundError(f"The GENDF file {self.filename} was not found")
+
+        self.read()
+
+    def read(self):
+        """Function to map the file and index its sections
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        if self.filename.stat().st_size == 0:
+            raise ValueError(f"The GENDF file {self.filename} is empty")
+
+        with open(self.filename, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # lines that are not 80 characters long (or a file without a final
+        # newline) can not be viewed in place, so pad them out once
+        width = LINE_WIDTH + 1
+        chars = np.frombuffer(buffer, dtype=np.uint8)
+        if chars.size % width != 0 or np.any(chars[LINE_WIDTH::width] != _NEWLINE):
+            chars = as_char_array(buffer)
+            newlines = np.full((chars.shape[0], 1), _NEWLINE, dtype=np.uint8)
+            buffer = np.hstack([chars, newlines]).tobytes()
+            chars = np.frombuffer(buffer, dtype=np.uint8)
+
+        self._buffer = buffer
+        chars = chars.reshape((-1, width))
+
+        mat = decode_integers(chars[:, 66:70])
+        mf = decode_integers(chars[:, 70:72])
+        mt = decode_integers(chars[:, 72:75])
+
+        self.title = bytes(chars[0, :66]).decode("ascii").strip()
+
+        # a section is a run of lines with the same MAT/MF/MT and a
+        # non-zero MT
+        changed = np.ones(len(mt), dtype=bool)
+        changed[1:] = (mat[1:] != mat[:-1]) | (mf[1:] != mf[:-1]) | (mt[1:] != mt[:-1])
+        run_starts = np.flatnonzero(changed)
+        run_stops = np.append(run_starts[1:], len(mt))
+
+        sections = mt[run_starts] > 0
+        starts, stops = run_starts[sections], run_stops[sections]
+
+        # include the SEND record that closes the section
+        following = np.minimum(stops, len(mt) - 1)
+        send = (
+            (stops < len(mt))
+            & (mt[following] == 0)
+            & (mf[following] == mf[starts])
+            & (mat[following] == mat[starts])
+        )
+        stops = stops + send
+
+        # count the MEND records to find the block of each section, then
+        # number the blocks of each material from zero
+        ends = np.cumsum(mat == 0)[starts]
+        blocks = np.zeros(len(starts), dtype=np.int64)
+        for material in np.unique(mat[starts]):
+            found = mat[starts] == material
+            blocks[found] = np.searchsorted(np.unique(ends[found]), ends[found])
+
+        self.index = np.empty(len(starts), dtype=INDEX_DTYPE)
+        self.index["MAT"] = mat[starts]
+        self.index["MF"] = mf[starts]
+        self.index["MT"] = mt[starts]
+        self.index["block"] = blocks
+        self.index["start"] = starts
+        self.index["stop"] = stops
+
+    @property
+    def material_numbers(self):
+        return list(dict.fromkeys(self.index["MAT"].tolist()))
+
+    def number_blocks(self, mat):
+        """Function to get the number of blocks of a material
+
+        Parameters
+        ----------
+        mat : int
+            the material number
+
+        Returns
+        -------
+        int
+            the number of blocks, which is the number of temperatures for
+            GROUPR output
+        """
+
+        index = self.index[self.index["MAT"] == mat]
+        return int(index["block"].max()) + 1 if len(index) else 0
+
+    def file_numbers(self, mat, block=0):
+        """Function to get the MF numbers of a material
+
+        Parameters
+        ----------
+        mat : int
+            the material number
+
+        block : int, optional, default is 0
+            the block of the material
+
+        Returns
+        -------
+        list of ints
+            the MF numbers, in the order they are in the file
+        """
+
+        index = self.index[(self.index["MAT"] == mat) & (self.index["block"] == block)]
+        return list(dict.fromkeys(index["MF"].tolist()))
+
+    def section_numbers(self, mat, mf, block=0):
+        """Function to get the MT numbers of a file
+
+        Parameters
+        ----------
+        mat : int
+            the material number
+
+        mf : int
+            the file number
+
+        block : int, optional, default is 0
+            the block of the material
+
+        Returns
+        -------
+        list of ints
+            the MT numbers, in the order they are in the file
+        """
+
+        index = self.index[
+            (self.index["MAT"] == mat)
+            & (self.index["MF"] == mf)
+            & (self.index["block"] == block)
+        ]
+        return index["MT"].tolist()
+
+    def section(self, mat, mf, mt, block=0):
+        """Function to get the text of a section
+
+        Parameters
+        ----------
+        mat : int
+            the material number
+
+        mf : int
+            the file number
+
+        mt : int
+            the section number
+
+        block : int, optional, default is 0
+            the block of the material
+
+        Returns
+        -------
+        memoryview
+            the lines of the section (including its SEND record), without
+            copying them out of the file
+        """
+
+        found = self.index[
+            (self.index["MAT"] == mat)
+            & (self.index["MF"] == mf)
+            & (self.index["MT"] == mt)
+            & (self.index["block"] == block)
+        ]
+        if len(found) == 0:
+            raise KeyError(
+                f"MAT{mat} MF{mf} MT{mt} (block {block}) is not in {self.filename}"
+            )
+
+        width = LINE_WIDTH + 1
+        start, stop = found["start"][0], found["stop"][0]
+        return memoryview(self._buffer)[start * width : stop * width]
@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def interpolation_weights(grid, points):
+    """Function to find the grid interval of each point, and its linear
+    interpolation weight
+
+    Points outside of the grid are moved to the nearest end of the grid, so
+    the values there are held constant rather than extrapolated.
+
+    Parameters
+    ----------
+    grid : np.array of floats
+        the grid, in increasing order
+
+    points : np.array of floats
+        the points to interpolate to
+
+    Returns
+    -------
+    np.array of ints
+        the index of the grid value below each point
+
+    np.array of ints
+        the index of the grid value above each point
+
+    np.array of floats
+        the weight of the value above each point, so that the interpolated
+        value is ``(1 - weight) * below + weight * above``
+    """
+
+    grid = np.asarray(grid, dtype=np.float64)
+    points = np.asarray(points, dtype=np.float64)
+
+    if len(grid) == 1:
+        index = np.zeros(points.shape, dtype=np.int64)
+        return index, index, np.zeros(points.shape)
+
+    points = np.clip(points, grid[0], grid[-1])
+    lower = np.searchsorted(grid, points, side="right") - 1
+    lower = np.clip(lower, 0, len(grid) - 2)
+    weight = (points - grid[lower]) / (grid[lower + 1] - grid[lower])
+    return lower, lower + 1, weight
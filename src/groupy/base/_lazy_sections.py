@@ -0,0 +1,77 @@
+from collections.abc import Mapping
+
+
+class LazySections(Mapping):
+    """Class to hold the sections of one MF, decoding each one on first
+    access
+
+    Parameters
+    ----------
+    keys : iterable of ints
+        the MT numbers of the sections
+
+    loader : callable
+        function that takes an MT number and returns the parsed section
+
+    Attributes
+    ----------
+    loaded : list of ints
+        the MT numbers of the sections that have been decoded
+
+    Methods
+    -------
+    load_all
+        Function to decode all of the sections that have not been decoded
+
+    """
+
+    def __init__(self, keys, loader):
+
+        self._keys = list(keys)
+        self._key_set = set(self._keys)
+        self._loader = loader
+        self._sections = {}
+
+    @property
+    def loaded(self):
+        return list(self._sections)
+
+    def __getitem__(self, mt):
+        try:
+            return self._sections[mt]
+        except KeyError:
+            if mt not in self._key_set:
+                raise
+        section = self._loader(mt)
+        self._sections[mt] = section
+        return section
+
+    def __contains__(self, mt):
+        return mt in self._key_set
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return (
+            f"LazySections({self._keys}, {len(self._sections)} of "
+            f"{len(self._keys)} loaded)"
+        )
+
+    def load_all(self):
+        """Function to decode all of the sections that have not been decoded
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        for mt in self._keys:
+            self[mt]
@@ -6,8 +6,8 @@ def make_reconr(mat, title, tolerance=0.001):
 
     Parameters
     ----------
-    mat : int
-        material number
+    mat : int or list
+        material number, or a list of the material numbers on the tape
 
     title : str
         title for the run
@@ -24,8 +24,9 @@ def make_reconr(mat, title, tolerance=0.001):
     input = " reconr\n"
     input += f"  20 21/\n"
     input += f"  'pendf tape for {title}' /\n"
-    input += f"  {mat} 0 / mat ; num extra points\n"
-    input += f"  {tolerance} / tolerance \n"
+    for material in np.atleast_1d(mat).tolist():
+        input += f"  {material} 0 / mat ; num extra points\n"
+        input += f"  {tolerance} / tolerance \n"
     input += "  0 /\n --\n --\n"
     return input
 
@@ -35,11 +36,13 @@ def make_broadr(mat, temp, tolerance=0.001):
 
     Parameters
     ----------
-    mat : int
-        material number
+    mat : int or list
+        material number, or a list of the material numbers on the tape,
+        which are all broadened with the same parameters
 
-    temp : int or float
-        temperature for the run in K
+    temp : int or float, or list
+        temperature for the run in K, or a list of temperatures to
+        broaden to in one run
 
     tolerance : float, optional, default is 0.001
         the tolerance for broadening
@@ -50,11 +53,19 @@ def make_broadr(mat, temp, tolerance=0.001):
         the lines for the input file
     """
 
+    mats = np.atleast_1d(mat).tolist()
+    temps = np.atleast_1d(temp).tolist()
+
     input = " broadr\n"
     input += f"  20 21 22 /\n"
-    input += f"  {mat} 1 / mat ; num temps\n"
+    input += f"  {mats[0]} {len(temps)} / mat ; num temps\n"
     input += f"  {tolerance} / tolerance\n"
-    input += f"  {temp} / temperature [K]\n"
+    if len(temps) == 1:
+        input += f"  {temps[0]} / temperature [K]\n"
+    else:
+        input += f"  {' '.join(str(t) for t in temps)} / temperatures [K]\n"
+    for material in mats[1:]:
+        input += f"  {material} / next mat\n"
     input += "  0 /\n --\n --\n"
     return input
 
@@ -68,16 +79,19 @@ def make_groupr(
     has_nubar=False,
     has_pfns=False,
     legendre_order=4,
+    sigma0=1e10,
 ):
     """Function to write a groupr input
 
     Parameters
     ----------
-    mat : int
-        material number
+    mat : int or list
+        material number, or a list of the material numbers on the tape,
+        which are all grouped with the same parameters
 
-    temp : int or float
-        temperature for the run in K
+    temp : int or float, or list
+        temperature for the run in K, or a list of temperatures. The
+        temperatures must have been broadened to by broadr.
 
     title : str
         title for the run
@@ -95,15 +109,22 @@ def make_groupr(
             9   claw weight function
             11  vitamin-e weight function
 
-    has_nubar : bool, optional, default is False
-        whether or not the evaluation has nubar
+    has_nubar : bool or list, optional, default is False
+        whether or not the evaluation has nubar, or a list with a value for
+        each material
 
-    has_pfns : bool, optional, default is False
-        whether or not the evaluation has a PFNS
+    has_pfns : bool or list, optional, default is False
+        whether or not the evaluation has a PFNS, or a list with a value for
+        each material
 
     legendre_order : int, optional, default is 4
         the order to reconstruct the angular distributions
 
+    sigma0 : float or list, optional, default is 1e10
+        the sigma0 (background cross section) value in barns, or a list of
+        values for a self-shielding table, starting with infinite dilution.
+        GROUPR needs the values to be positive and strictly decreasing.
+
     Returns
     -------
     str
@@ -124,12 +145,35 @@ def make_groupr(
     except TypeError:
         raise TypeError(f"the flux paramter must be an integer.")
 
+    mats = np.atleast_1d(mat).tolist()
+    nubar = np.broadcast_to(has_nubar, len(mats)).tolist()
+    pfns = np.broadcast_to(has_pfns, len(mats)).tolist()
+    temps = np.atleast_1d(temp).tolist()
+    sigma0 = np.atleast_1d(sigma0).astype(float)
+    if np.any(sigma0 <= 0) or np.any(np.diff(sigma0) >= 0):
+        raise ValueError(
+            f"The sigma0 values {sigma0.tolist()} must be positive and strictly "
+            f"decreasing, starting with infinite dilution."
+        )
+
+    # the shortest form that reads back as the same value, so NJOY groups at
+    # exactly the dilutions asked for
+    sigzs = [
+        np.format_float_scientific(sigz, trim="0", exp_digits=2).replace("e+", "e")
+        for sigz in sigma0
+    ]
+
     input = " groupr\n"
     input += f"  20 22 0 91 /\n"
-    input += f"  {mat} {ign} 0 {iwt} {legendre_order} /\n"
+    if len(temps) == 1 and len(sigzs) == 1:
+        input += f"  {mats[0]} {ign} 0 {iwt} {legendre_order} /\n"
+    else:
+        input += (
+            f"  {mats[0]} {ign} 0 {iwt} {legendre_order} {len(temps)} {len(sigzs)} /\n"
+        )
     input += f"  '{title}' /\n"
-    input += f"  {temp} /\n"
-    input += "  1.0e10 /\n"
+    input += f"  {' '.join(str(t) for t in temps)} /\n"
+    input += f"  {' '.join(sigzs)} /\n"
 
     # group boundaries - split into lines 5 long
     if ign == 1:
@@ -147,12 +191,18 @@ def make_groupr(
                     break
             input += "\n"
 
-    input += "  3 /\n"
-    if has_nubar:
-        input += "  3 452 'total nubar' /\n"
-    if has_pfns:
-        input += "  5 18 'pfns' /\n"
-    input += "  6 / scattering matrices \n"
-    input += "  0 /\n"
+    # the list of reactions is repeated for each temperature, and the
+    # lists of the next material follow its material number
+    for index, material in enumerate(mats):
+        if index > 0:
+            input += f"  {material} / next mat\n"
+        for _ in temps:
+            input += "  3 /\n"
+            if nubar[index]:
+                input += "  3 452 'total nubar' /\n"
+            if pfns[index]:
+                input += "  5 18 'pfns' /\n"
+            input += "  6 / scattering matrices \n"
+            input += "  0 /\n"
     input += "  0 /\n --\n --\n"
     return input
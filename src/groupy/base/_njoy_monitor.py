@@ -0,0 +1,243 @@
+import os
+import re
+import time
+from groupy.base._run_metrics import MODULE_LINE
+
+# the lines that stop a run as soon as NJOY writes them
+DEFAULT_ERROR_PATTERNS = [r"\*\*\*error"]
+
+# NJOY's error routine names the module, like "***error in groupr***"
+ERROR_MODULE = re.compile(r"\*\*\*error in (\w+)", re.IGNORECASE)
+
+# the number of seconds between reads of the listing
+POLL_INTERVAL = 0.05
+
+# the number of bytes read from the listing at a time
+READ_SIZE = 1 << 16
+
+
+class NjoyRunError(RuntimeError):
+    """Exception for an NJOY run that failed, or was stopped early
+
+    Attributes
+    ----------
+    reason : str
+        "error" if NJOY wrote a line that matched an error pattern,
+        "failed" if it stopped with an error status, "timeout" if it ran
+        for longer than the timeout, or "stalled" if it wrote nothing for
+        longer than the stall timeout
+
+    module : str or None
+        the NJOY module that was running
+
+    line : str or None
+        the line that matched an error pattern
+
+    listing : str
+        everything NJOY wrote before it stopped
+
+    returncode : int or None
+        the exit status of the NJOY process
+    """
+
+    def __init__(
+        self, message, reason, module=None, line=None, listing="", returncode=None
+    ):
+        super().__init__(message)
+        self.reason = reason
+        self.module = module
+        self.line = line
+        self.listing = listing
+        self.returncode = returncode
+
+
+class NjoyMonitor:
+    """Class to follow the listing of an NJOY run as it is written, and
+    decide when the run should be stopped
+
+    Parameters
+    ----------
+    error_patterns : list of str, optional, default is None
+        regular expressions (matched without case) for lines that stop the
+        run. Default is None, which uses DEFAULT_ERROR_PATTERNS. An empty
+        list never stops the run for its output.
+
+    timeout : float, optional, default is None
+        the number of seconds the run can take
+
+    stall_timeout : float, optional, default is None
+        the number of seconds the run can go without writing anything
+
+    echo : bool, optional, default is False
+        If true, each line is printed as it is read
+
+    Attributes
+    ----------
+    module : str or None
+        the module that is running
+
+    failure : tuple or None
+        the reason, and the line that matched an error pattern, once the
+        run should be stopped
+    """
+
+    def __init__(
+        self, error_patterns=None, timeout=None, stall_timeout=None, echo=False
+    ):
+
+        if error_patterns is None:
+            error_patterns = DEFAULT_ERROR_PATTERNS
+        self.error_patterns = [
+            re.compile(pattern, re.IGNORECASE) for pattern in error_patterns
+        ]
+        self.timeout = timeout
+        self.stall_timeout = stall_timeout
+        self.echo = echo
+
+        self.module = None
+        self.failure = None
+        self.position = 0
+        self._lines = []
+        self._partial = ""
+        self.start()
+
+    def start(self):
+        """Function to start the clocks, when the process starts"""
+
+        self.start_time = self.last_output = time.perf_counter()
+
+    @property
+    def wall_time(self):
+        return time.perf_counter() - self.start_time
+
+    @property
+    def listing(self):
+        return "".join(self._lines) + self._partial
+
+    def read(self, fd):
+        """Function to read what NJOY has written to the listing file since
+        the last read, without moving the file position NJOY writes at
+
+        Parameters
+        ----------
+        fd : int
+            the file descriptor of the listing
+
+        Returns
+        -------
+        None
+        """
+
+        while True:
+            chunk = os.pread(fd, READ_SIZE, self.position)
+            if not chunk:
+                return
+            self.position += len(chunk)
+            self.feed(chunk.decode(errors="replace"))
+
+    def feed(self, text):
+        """Function to add text from the listing, and check each complete
+        line
+
+        Parameters
+        ----------
+        text : str
+            the new text
+
+        Returns
+        -------
+        None
+        """
+
+        self.last_output = time.perf_counter()
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line + "\n")
+
+    def finish(self):
+        """Function to check the last line, if it has no newline"""
+
+        if self._partial:
+            line, self._partial = self._partial, ""
+            self._line(line)
+
+    def _line(self, line):
+        self._lines.append(line)
+        if self.echo:
+            print(line, end="")
+
+        match = MODULE_LINE.match(line)
+        if match is not None:
+            self.module = match.group(1)
+
+        if self.failure is None:
+            for pattern in self.error_patterns:
+                if pattern.search(line):
+                    match = ERROR_MODULE.search(line)
+                    if match is not None:
+                        self.module = match.group(1).lower()
+                    self.failure = ("error", line.strip())
+                    break
+
+    def check(self):
+        """Function to check whether the run should be stopped
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bool
+            whether the run should be stopped
+        """
+
+        if self.failure is None:
+            now = time.perf_counter()
+            if self.timeout is not None and now - self.start_time > self.timeout:
+                self.failure = ("timeout", None)
+            elif (
+                self.stall_timeout is not None
+                and now - self.last_output > self.stall_timeout
+            ):
+                self.failure = ("stalled", None)
+        return self.failure is not None
+
+    def raise_for_failure(self, returncode):
+        """Function to raise an NjoyRunError if the run was stopped or
+        failed
+
+        Parameters
+        ----------
+        returncode : int
+            the exit status of the NJOY process
+
+        Returns
+        -------
+        None
+        """
+
+        where = "" if self.module is None else f" in {self.module}"
+        if self.failure is not None:
+            reason, line = self.failure
+            if reason == "timeout":
+                message = f"timed out after {self.timeout} s{where}"
+            elif reason == "stalled":
+                message = f"no output for {self.stall_timeout} s{where}"
+            else:
+                message = f"error{where}: {line}"
+        elif returncode == 77:
+            reason, line = "failed", None
+            message = f"NJOY run failed{where}"
+        else:
+            return
+
+        raise NjoyRunError(
+            f"NJOY did not run: {message}",
+            reason,
+            self.module,
+            line,
+            self.listing,
+            returncode,
+        )
@@ -1,5 +1,5 @@
-import fortranformat as ff
 import numpy as np
+from groupy.base._decoder import decode_section
 
 
 class OutgoingDistribution:
@@ -19,7 +19,8 @@ class OutgoingDistribution:
         the number of groups
 
     values : np.array of floats
-        the values
+        the values. When there is more than one sigma0 value, the values
+        have shape (number of sigma0 values, number of groups).
 
     number_legendre : int
         the number of Legendre coeffs used in the calculation
@@ -55,28 +56,29 @@ class OutgoingDistribution:
         None
 
         """
-        control_line = ff.FortranRecordReader("(2G11.0,4I11,I4,I2,I3,I5)")
-        value_line = ff.FortranRecordReader("(6G11.0)")
+        head, records, data = decode_section(lines)
 
-        self.ZA, _, nl, nz, lrflag, ngn, mat, mf, mt, _ = control_line.read(lines[0])
+        self.ZA = head["C1"]
+        nl, nz, ngn, mf, mt = head["L1"], head["L2"], head["N2"], head["MF"], head["MT"]
 
         if mf not in [5]:
             raise ValueError(f"Outgoing distributions must come from MF5, not MF{mf}")
 
-        # check that there is only 1 sigma0 value
-        if nz != 1:
-            raise NotImplementedError(
-                f"Multiple sigma0 values are not yet implemented."
-            )
+        self.mt = int(mt)
+        self.number_groups = int(ngn)
+        self.number_legendre = int(nl)
 
-        self.mt = mt
-        self.number_groups = ngn
-        self.number_legendre = nl
+        self.temperature = records["C1"][0]
 
-        self.temperature, _, _, _, _, _, _, _, _, _ = control_line.read(lines[1])
+        # each record holds NG2 values, starting at group IG2LO, with NL
+        # values for each sigma0
+        self.values = np.zeros((nz, self.number_groups))
+        for record in records:
+            ng2, ig2lo, start = record["L1"], record["L2"], record["start"]
+            for iz in range(nz):
+                self.values[iz, ig2lo - 1 : ig2lo - 1 + ng2] = data[
+                    start + nl * iz : start + ng2 * nl * nz : nl * nz
+                ]
 
-        self.values = np.zeros(self.number_groups)
-
-        for i in range(int(np.ceil(self.number_groups / 6))):
-            vals = np.array(value_line.read(lines[2 + i]))
-            self.values[i * 6 : (i + 1) * 6] = vals[vals > 0]
+        if nz == 1:
+            self.values = self.values[0]
@@ -1,5 +1,5 @@
-import fortranformat as ff
 import numpy as np
+from groupy.base._decoder import decode_section
 
 
 class PointwiseValues:
@@ -20,13 +20,15 @@ class PointwiseValues:
         the number of groups
 
     values : np.array of floats
-        the values (in barns for cross sections)
+        the values (in barns for cross sections). When there is more than
+        one sigma0 value, the values have shape (number of sigma0 values,
+        number of groups).
 
     number_legendre : int
         the number of Legendre coeffs used in the calculation
 
     flux_values : np.array of floats
-        the flux values
+        the flux values, with the same shape as the values
 
     temperature : float
         the temperature of the calculation in K
@@ -59,35 +61,28 @@ class PointwiseValues:
         None
 
         """
-        control_line = ff.FortranRecordReader("(2G11.0,4I11,I4,I2,I3,I5)")
-        value_line = ff.FortranRecordReader("(2G11.0)")
+        head, records, data = decode_section(lines)
 
-        self.ZA, _, nl, nz, lrflag, ngn, mat, mf, mt, _ = control_line.read(lines[0])
+        self.ZA = head["C1"]
+        nl, nz, ngn, mf, mt = head["L1"], head["L2"], head["N2"], head["MF"], head["MT"]
 
         if mf != 3:
             raise ValueError(f"PointwiseValues must come from MF3, not MF{mf}")
 
-        # check that there is only 1 sigma0 value
-        if nz != 1:
-            raise NotImplementedError(
-                f"Multiple sigma0 values are not yet implemented."
-            )
-
-        self.mt = mt
-        self.number_groups = ngn
-        self.number_legendre = nl
-
-        self.values = np.zeros(self.number_groups)
-        self.flux_values = np.zeros(self.number_groups)
-        for i in range(self.number_groups):
-            temp, _, ng2, ig2lo, nw, ig, _, _, _, _ = control_line.read(
-                lines[2 * i + 1]
-            )
-            flux, sigma = value_line.read(lines[2 * i + 2])
-            self.values[ig - 1] = sigma
-            self.flux_values[ig - 1] = flux
-
-            if ig == self.number_groups:
-                break
-
-        self.temperature = temp
+        self.mt = int(mt)
+        self.number_groups = int(ngn)
+        self.number_legendre = int(nl)
+
+        # each record holds the flux values and then the pointwise values
+        # for group IG, with NL values for each sigma0
+        rows = records["N2"] - 1
+        flux_positions = records["start"][:, None] + nl * np.arange(nz)
+        self.values = np.zeros((nz, self.number_groups))
+        self.flux_values = np.zeros((nz, self.number_groups))
+        self.values[:, rows] = data[flux_positions + nl * nz].T
+        self.flux_values[:, rows] = data[flux_positions].T
+
+        if nz == 1:
+            self.values, self.flux_values = self.values[0], self.flux_values[0]
+
+        self.temperature = records["C1"][-1]
@@ -0,0 +1,194 @@
+import json
+import re
+import sys
+
+# NJOY writes a line when each module starts, with its clock in seconds,
+# and the clock alone when the run stops
+MODULE_LINE = re.compile(r"^\s*([a-z]\w*)\.\.\..*?(\d+\.\d+)s\s*$")
+TOTAL_LINE = re.compile(r"^\s*(\d+\.\d+)s\s*$")
+
+
+class NjoyRunMetrics:
+    """Class to hold the timing and resource use of one NJOY run
+
+    Parameters
+    ----------
+    wall_time : float
+        the number of seconds the NJOY process ran for
+
+    listing : str, optional, default is ""
+        the text NJOY wrote to stdout, which has the time each module
+        started
+
+    rusage : resource.struct_rusage, optional, default is None
+        the resource use of the NJOY process
+
+    returncode : int, optional, default is None
+        the exit status of the NJOY process
+
+    Attributes
+    ----------
+    wall_time : float
+        the number of seconds the NJOY process ran for
+
+    module_times : list of tuples
+        the name of each module in the order they ran, and the number of
+        seconds NJOY's clock gave it (None if the run stopped before the
+        module finished)
+
+    user_time : float or None
+        the user CPU time of the NJOY process in seconds, if known
+
+    system_time : float or None
+        the system CPU time of the NJOY process in seconds, if known
+
+    peak_rss : int or None
+        the peak resident memory of the NJOY process in bytes, if known
+
+    returncode : int or None
+        the exit status of the NJOY process
+
+    Methods
+    -------
+    module_time
+        Function to get the total time of one module
+
+    to_dict
+        Function to get the metrics as a dictionary that can be written as
+        JSON
+    """
+
+    def __init__(self, wall_time, listing="", rusage=None, returncode=None):
+
+        self.wall_time = wall_time
+        self.module_times = parse_module_times(listing)
+        self.returncode = returncode
+
+        if rusage is None:
+            self.user_time = self.system_time = self.peak_rss = None
+        else:
+            self.user_time = rusage.ru_utime
+            self.system_time = rusage.ru_stime
+            # ru_maxrss is in kilobytes, except on macOS where it is bytes
+            scale = 1 if sys.platform == "darwin" else 1024
+            self.peak_rss = rusage.ru_maxrss * scale
+
+    @property
+    def cpu_time(self):
+        if self.user_time is None:
+            return None
+        return self.user_time + self.system_time
+
+    @property
+    def modules(self):
+        return list(dict.fromkeys(module for module, _ in self.module_times))
+
+    def module_time(self, module):
+        """Function to get the total time of one module
+
+        Parameters
+        ----------
+        module : str
+            the module name, such as "groupr"
+
+        Returns
+        -------
+        float
+            the number of seconds NJOY's clock gave every run of the module
+        """
+
+        if module not in self.modules:
+            raise KeyError(f"{module} did not run")
+        return sum(
+            seconds or 0.0 for name, seconds in self.module_times if name == module
+        )
+
+    def to_dict(self):
+        """Function to get the metrics as a dictionary that can be written
+        as JSON
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            the metrics
+        """
+
+        return {
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "user_time": self.user_time,
+            "system_time": self.system_time,
+            "peak_rss": self.peak_rss,
+            "returncode": self.returncode,
+            "module_times": [list(item) for item in self.module_times],
+        }
+
+    def __repr__(self):
+        modules = ", ".join(
+            f"{name} {seconds:.2f} s"
+            for name, seconds in self.module_times
+            if seconds is not None
+        )
+        return f"NjoyRunMetrics(wall time {self.wall_time:.2f} s; {modules})"
+
+
+def parse_module_times(listing):
+    """Function to get the time of each module from an NJOY listing
+
+    Each module takes from the clock on its line to the clock on the next
+    module line, or to the clock NJOY writes when it stops.
+
+    Parameters
+    ----------
+    listing : str
+        the text NJOY wrote to stdout
+
+    Returns
+    -------
+    list of tuples
+        the module name and its number of seconds, or None for a module
+        that did not finish
+    """
+
+    marks, total = [], None
+    for line in listing.splitlines():
+        match = MODULE_LINE.match(line)
+        if match is not None:
+            marks.append((match.group(1), float(match.group(2))))
+            continue
+        match = TOTAL_LINE.match(line)
+        if match is not None and marks:
+            total = float(match.group(1))
+
+    module_times = []
+    for index, (module, start) in enumerate(marks):
+        stop = marks[index + 1][1] if index + 1 < len(marks) else total
+        module_times.append((module, None if stop is None else stop - start))
+    return module_times
+
+
+def write_metrics_log(filename, record):
+    """Function to append one record to a JSON lines file
+
+    The record is written with a single write, so several processes can
+    log to the same file.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path object
+        the JSON lines file
+
+    record : dict
+        the record
+
+    Returns
+    -------
+    None
+    """
+
+    with open(filename, "a") as f:
+        f.write(json.dumps(record) + "\n")
@@ -1,5 +1,6 @@
-import fortranformat as ff
 import numpy as np
+from groupy.base._decoder import decode_section, segment_indices
+from groupy.base._banded_matrix import BandedMatrix
 
 
 class ScatteringMatrix:
@@ -10,6 +11,10 @@ class ScatteringMatrix:
     lines : list of strings
         the lines from the GENDF file
 
+    sparse : bool, optional, default is False
+        If true, the values are stored as a BandedMatrix instead of a
+        dense array
+
     Attributes
     ----------
     mt : int
@@ -18,8 +23,16 @@ class ScatteringMatrix:
     number_groups : int
         the number of groups
 
-    values : np.array of floats
-        the values
+    values : np.array of floats or BandedMatrix
+        the values, with shape (number of groups, number of groups,
+        number of Legendre coeffs). When there is more than one sigma0
+        value, there is a leading sigma0 axis (or, for sparse values, a
+        list with one BandedMatrix for each sigma0).
+
+    flux_values : np.array of floats
+        the flux values, with shape (number of groups, number of
+        Legendre coeffs), and a leading sigma0 axis when there is more
+        than one sigma0 value
 
     number_legendre : int
         the number of Legendre coeffs used in the calculation
@@ -38,8 +51,9 @@ class ScatteringMatrix:
 
     """
 
-    def __init__(self, lines):
+    def __init__(self, lines, sparse=False):
 
+        self.sparse = sparse
         self.parse_lines(lines)
 
     def parse_lines(self, lines):
@@ -55,52 +69,92 @@ class ScatteringMatrix:
         None
 
         """
-        control_line = ff.FortranRecordReader("(2G11.0,4I11,I4,I2,I3,I5)")
-        value_line = ff.FortranRecordReader("(6G11.0)")
+        head, records, data = decode_section(lines)
 
-        self.ZA, _, nl, nz, lrflag, ngn, mat, mf, mt, _ = control_line.read(lines[0])
+        self.ZA = head["C1"]
+        nl, nz, ngn, mf, mt = head["L1"], head["L2"], head["N2"], head["MF"], head["MT"]
 
         if mf != 6:
             raise ValueError(f"Outgoing distributions must come from MF6, not MF{mf}")
 
-        # check that there is only 1 sigma0 value
-        if nz != 1:
-            raise NotImplementedError(
-                f"Multiple sigma0 values are not yet implemented."
-            )
-
-        self.mt = mt
-        self.number_groups = ngn
-        self.number_legendre = nl
-
-        self.values = np.zeros(
-            (self.number_groups, self.number_groups, self.number_legendre)
+        self.mt = int(mt)
+        self.number_groups = int(ngn)
+        self.number_legendre = int(nl)
+
+        # read the shape of every row first
+        ng2, ig2lo, nw, ig = records["L1"], records["L2"], records["N1"], records["N2"]
+        starts = records["start"]
+
+        # each column of a record has NL values for each sigma0, so the
+        # value for column k, order l and sigma0 iz is at
+        # start + k * NL * NZ + l + NL * iz
+        offsets = np.arange(nl)[:, None] + nl * np.arange(nz)
+
+        # IG=0 holds a fission spectrum for the rows that are given as
+        # a production cross section (IG2LO=0)
+        spectrum = np.zeros(self.number_groups)
+        spectrum_first, spectrum_last = self.number_groups, 0
+        for i in np.flatnonzero(ig == 0):
+            first, last = ig2lo[i] - 1, ig2lo[i] - 1 + ng2[i]
+            spectrum[first:last] = data[starts[i] : starts[i] + ng2[i]]
+            spectrum_first = min(first, spectrum_first)
+            spectrum_last = max(last, spectrum_last)
+
+        # row index is [IG-1], col indices are [IG2LO-1 : IG2LO-1 + NG2-1],
+        # and the first column is the flux values
+        flux_values = np.zeros((self.number_groups, nl, nz))
+        band = (ig > 0) & (ig2lo > 0)
+        band_rows = ig[band] - 1
+        flux_values[band_rows] = data[starts[band, None, None] + offsets]
+
+        band_lengths = ng2[band] - 1
+        columns = segment_indices(np.ones(len(band_rows)), band_lengths)
+        column_starts = np.repeat(starts[band], band_lengths) + columns * nl * nz
+        band_values = data[column_starts[:, None, None] + offsets]
+
+        # the production rows have one flux value and one production value,
+        # and their band is the fission spectrum
+        production = (ig > 0) & (ig2lo == 0)
+        production_rows = ig[production] - 1
+        width = nw[production] // ng2[production]
+        dilutions = nl * np.arange(nz)
+        flux_values[production_rows, 0] = data[starts[production, None] + dilutions]
+
+        spectrum_length = max(spectrum_last - spectrum_first, 0)
+        production_values = np.zeros((len(production_rows), spectrum_length, nl, nz))
+        production_values[:, :, 0] = (
+            data[(starts[production] + width)[:, None, None] + dilutions]
+            * spectrum[spectrum_first : spectrum_first + spectrum_length, None]
         )
-        self.flux_values = np.zeros((self.number_groups, self.number_legendre))
+        production_values = production_values.reshape((-1, nl, nz))
 
-        matrix_lines = lines[1:]
-        while len(matrix_lines) > 1:
-            temp, _, ng2, ig2l0, nw, ig, _, _, _, _ = control_line.read(
-                matrix_lines.pop(0)
+        rows = np.concatenate([band_rows, production_rows])
+        first_columns = np.concatenate(
+            [ig2lo[band] - 1, np.full(len(production_rows), spectrum_first)]
+        )
+        lengths = np.concatenate(
+            [band_lengths, np.full(len(production_rows), spectrum_length)]
+        )
+        values = np.concatenate([band_values, production_values])
+
+        # one matrix for each sigma0
+        self.flux_values = np.moveaxis(flux_values, 2, 0)
+        if self.sparse:
+            self.values = [
+                BandedMatrix(
+                    self.number_groups, rows, first_columns, lengths, values[..., iz]
+                )
+                for iz in range(nz)
+            ]
+        else:
+            self.values = np.zeros(
+                (nz, self.number_groups, self.number_groups, self.number_legendre)
             )
-            num_value_lines = int(np.ceil(nw / 6))
-            # print(f"ig: {ig} {ng2} {nw} {num_value_lines}")
-            vals = []
-            for j in range(num_value_lines):
-                for val in value_line.read(matrix_lines.pop(0)):
-                    vals.append(val)
-
-            # row index is [IG-1], col indices are [IG2LO-1 : IG2LO-1 + NG2-1]
-
-            # the flux values are the first (NLxNZ) values
-            self.flux_values[ig - 1, :] = vals[: self.number_legendre]
-
-            # the rest are the matrix values - there are (NLxNZ) in each
-            # column
-            for k in range(ng2 - 1):
-                col_index = ig2l0 - 1 + k
-                self.values[ig - 1, col_index, :] = vals[
-                    (k + 1) * self.number_legendre : (k + 2) * self.number_legendre
-                ]
-
-        self.temperature = temp
+            self.values[
+                :, np.repeat(rows, lengths), segment_indices(first_columns, lengths)
+            ] = np.moveaxis(values, 2, 0)
+
+        if nz == 1:
+            self.values, self.flux_values = self.values[0], self.flux_values[0]
+
+        self.temperature = records["C1"][-1]
@@ -0,0 +1,154 @@
+import numpy as np
+from groupy.base._banded_matrix import BandedMatrix
+
+# the format np.savetxt uses by default, so the files are unchanged
+CSV_FORMAT = "%.18e"
+
+# the number of rows formatted at a time
+CHUNK_ROWS = 4096
+
+# the MT numbers that are summed to give MT4 when it is not in the file
+INELASTIC_MTS = range(51, 92)
+
+
+def pointwise_table(sections, energy_boundaries, mts):
+    """Function to put the values of several sections into one table, with
+    the energy boundaries in the first column and a column for each MT
+
+    The table is allocated once, and missing MT's are left as zeros (or the
+    sum of MT51-91 for MT4). The last row, at the top energy boundary, has
+    no values.
+
+    Parameters
+    ----------
+    sections : mapping
+        the sections with a values attribute, keyed by MT
+
+    energy_boundaries : np.array of floats
+        the group boundaries in eV
+
+    mts : list of ints
+        the MT numbers of the columns
+
+    Returns
+    -------
+    np.array of floats
+        the table, with shape (number of boundaries, number of MT's + 1)
+    """
+
+    table = np.zeros((len(energy_boundaries), len(mts) + 1))
+    table[:, 0] = energy_boundaries
+    for column, mt in enumerate(mts, start=1):
+        if mt in sections:
+            table[:-1, column] = sections[mt].values
+        elif mt == 4:
+            for partial_mt in INELASTIC_MTS:
+                if partial_mt in sections:
+                    table[:-1, column] += sections[partial_mt].values
+    return table
+
+
+def scattering_table(sections, energy_boundaries, mt, legendre_order=0):
+    """Function to lay out one Legendre order of a scattering matrix with
+    the energy boundaries as the first row and column
+
+    Parameters
+    ----------
+    sections : mapping
+        the ScatteringMatrix objects, keyed by MT
+
+    energy_boundaries : np.array of floats
+        the group boundaries in eV
+
+    mt : int
+        the MT number. If it is 4 and not in the sections, the matrices of
+        MT51-91 are summed.
+
+    legendre_order : int, optional, default is 0
+        the Legendre order. Orders past the order of the matrix are zeros.
+
+    Returns
+    -------
+    np.array of floats
+        the table, with shape (number of boundaries + 1, number of
+        boundaries + 1)
+    """
+
+    size = len(energy_boundaries) + 1
+    table = np.zeros((size, size))
+    table[1:, 0] = energy_boundaries
+    table[0, 1:] = energy_boundaries
+
+    if mt in sections:
+        parts = [sections[mt]]
+    elif mt == 4:
+        parts = [sections[partial] for partial in INELASTIC_MTS if partial in sections]
+    else:
+        parts = []
+
+    for section in parts:
+        if legendre_order < section.values.shape[2]:
+            table[1:-1, 1:-1] += _dense(section.values[:, :, legendre_order])
+    return table
+
+
+def write_csv(filename, table, header=None):
+    """Function to write a table to a CSV file, formatting the numbers in
+    bulk rather than one row at a time
+
+    The file is the same as the one np.savetxt writes with a comma
+    delimiter.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path object
+        the CSV file
+
+    table : np.array of floats
+        the 2D table
+
+    header : str, optional, default is None
+        the header line, which is written after "# "
+
+    Returns
+    -------
+    None
+    """
+
+    rows, columns = table.shape
+    row_format = ",".join([CSV_FORMAT] * columns)
+
+    with open(filename, "w") as f:
+        if header is not None:
+            f.write(f"# {header}\n")
+        for start in range(0, rows, CHUNK_ROWS):
+            chunk = table[start : start + CHUNK_ROWS]
+            chunk_format = "\n".join([row_format] * len(chunk)) + "\n"
+            f.write(chunk_format % tuple(chunk.ravel().tolist()))
+
+
+def dense_values(values):
+    """Function to get section values as a dense array, for values that are
+    an array, a BandedMatrix or a list of them (one per temperature or
+    sigma0 value)
+
+    Parameters
+    ----------
+    values : np.array, BandedMatrix or list
+        the values
+
+    Returns
+    -------
+    np.array of floats
+        the dense values
+    """
+
+    if isinstance(values, list):
+        return np.stack([dense_values(item) for item in values])
+    return _dense(values)
+
+
+def _dense(values):
+    if isinstance(values, BandedMatrix):
+        return values.toarray()
+    return np.asarray(values)
@@ -0,0 +1,343 @@
+import contextlib
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from groupy.njoy import run_njoy
+from groupy.parse import GrouprOutput
+from groupy.library import GrouprLibrary, read_groupr_output
+from groupy.base._archive import MANIFEST
+
+# the files a worker writes into the job directory: a marker when the job
+# starts, and the parsed output
+STARTED = ".started"
+PARSED = "parsed"
+
+
+class BatchJob:
+    """Class to hold one NJOY run of a batch
+
+    Parameters
+    ----------
+    name : str
+        the job name, which is also the name of its scratch directory
+
+    endf6_file : str or pathlib.Path object
+        the ENDF6-formatted file
+
+    directory : pathlib.Path object
+        the scratch directory the job runs in
+
+    options : dict
+        the keyword arguments for run_njoy
+
+    Attributes
+    ----------
+    status : str
+        "pending", "done" or "failed"
+
+    wall_time : float
+        the time the job took in the worker, in seconds
+
+    error : str
+        the error message (with the traceback) if the job failed
+
+    output : GrouprOutput object or GrouprLibrary object
+        the parsed GROUPR output, if the job succeeded, with a
+        GrouprLibrary when the ENDF file has several materials
+
+    """
+
+    def __init__(self, name, endf6_file, directory, options):
+
+        self.name = name
+        self.endf6_file = Path(endf6_file)
+        self.directory = Path(directory)
+        self.options = options
+
+        self.status = "pending"
+        self.wall_time = None
+        self.error = None
+        self.output = None
+
+    def __repr__(self):
+        return f"BatchJob({self.name!r}, status={self.status!r})"
+
+
+class BatchReport:
+    """Class to hold the results of a batch of NJOY runs
+
+    Parameters
+    ----------
+    jobs : list of BatchJob objects
+        the jobs of the batch
+
+    wall_time : float
+        the time the whole batch took, in seconds
+
+    Attributes
+    ----------
+    succeeded : list of BatchJob objects
+        the jobs that finished
+
+    failed : list of BatchJob objects
+        the jobs that failed
+
+    outputs : dict
+        the GrouprOutput of each job that finished, keyed by job name
+
+    Methods
+    -------
+    summary
+        Function to create a text summary of the batch
+
+    """
+
+    def __init__(self, jobs, wall_time):
+
+        self.jobs = jobs
+        self.wall_time = wall_time
+
+    @property
+    def succeeded(self):
+        return [job for job in self.jobs if job.status == "done"]
+
+    @property
+    def failed(self):
+        return [job for job in self.jobs if job.status == "failed"]
+
+    @property
+    def outputs(self):
+        return {job.name: job.output for job in self.succeeded}
+
+    def summary(self):
+        """Function to create a text summary of the batch
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            one line per job with its status and wall time, then the totals
+        """
+
+        width = max([len(job.name) for job in self.jobs] + [3])
+        lines = [f"{'job':<{width}}  status  wall time (s)"]
+        for job in self.jobs:
+            wall_time = "" if job.wall_time is None else f"{job.wall_time:13.2f}"
+            lines.append(f"{job.name:<{width}}  {job.status:<6}  {wall_time}")
+            if job.status == "failed":
+                lines.append(f"    {job.error.strip().splitlines()[-1]}")
+
+        lines.append(
+            f"{len(self.succeeded)} of {len(self.jobs)} jobs finished "
+            f"in {self.wall_time:.2f} s"
+        )
+        return "\n".join(lines)
+
+
+def _run_job(runner, endf6_file, directory, options, sparse):
+    """Function to run one job in a worker process
+
+    The GROUPR output is parsed in the worker too, so that the jobs are
+    parsed in parallel, and saved into the job directory for the parent
+    process to load memory-mapped. Only paths and strings are sent back to
+    the parent process, so that large arrays are never pickled.
+    """
+
+    directory = Path(directory)
+    (directory / STARTED).touch()
+
+    start = time.perf_counter()
+    try:
+        runner(endf6_file, directory=directory, **options)
+        read_groupr_output(directory / "tape91", sparse).save(directory / PARSED)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    return time.perf_counter() - start, error
+
+
+def _load_output(directory):
+    """Function to load the output a worker saved into a job directory"""
+
+    if (directory / PARSED / MANIFEST).exists():
+        return GrouprOutput.load(directory / PARSED)
+    return GrouprLibrary.load(directory / PARSED)
+
+
+def _run_pools(groups, runner, max_workers, sparse, verbose):
+    """Function to run each group of jobs on its own process pool, all at
+    the same time, setting the status of each job as it finishes
+
+    Returns
+    -------
+    list of BatchJob objects
+        the jobs that did not finish because a worker process of their pool
+        died, which breaks the pool
+    """
+
+    lost = []
+    with contextlib.ExitStack() as stack:
+        futures = {}
+        for group in groups:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=min(max_workers, len(group)))
+            )
+            for job in group:
+                (job.directory / STARTED).unlink(missing_ok=True)
+                future = executor.submit(
+                    _run_job, runner, job.endf6_file, job.directory, job.options, sparse
+                )
+                futures[future] = job
+
+        # the jobs are collected as they finish, so a slow job does not hold
+        # back the others; the report keeps the order they were made in
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                job.wall_time, job.error = future.result()
+            except BrokenProcessPool:
+                job.error = traceback.format_exc()
+                lost.append(job)
+                continue
+
+            if job.error is None:
+                try:
+                    job.output = _load_output(job.directory)
+                except Exception:
+                    job.error = traceback.format_exc()
+            _finish(job, verbose)
+
+    return lost
+
+
+def _finish(job, verbose):
+    """Function to set the status of a job that is not run again"""
+
+    job.status = "failed" if job.error is not None else "done"
+    if verbose:
+        print(f"{job.name}: {job.status}")
+
+
+def run_batch(
+    endf6_files,
+    options=None,
+    directory=".",
+    max_workers=None,
+    sparse=False,
+    cache=None,
+    runner=run_njoy,
+    verbose=False,
+    scratch=None,
+):
+    """Function to run NJOY for many ENDF files on a pool of processes
+
+    One job is made for every combination of ENDF file and option set. Each
+    job runs in its own scratch directory inside ``directory``, and a job
+    that fails does not stop the others. The GROUPR output of each job is
+    parsed in its worker and saved into the "parsed" subdirectory of the
+    job directory, from which it is loaded memory-mapped. If a worker
+    process dies, only the job it was running fails, and the other jobs
+    are run again on a new pool.
+
+    Parameters
+    ----------
+    endf6_files : list of str or pathlib.Path objects
+        the ENDF6-formatted files
+
+    options : dict or list of dicts, optional, default is None
+        the keyword arguments for run_njoy (temperature, group_boundaries,
+        ...) of each option set. If there is no "title", the name of the
+        ENDF file is used. Default is None, which runs each file once with
+        the default options.
+
+    directory : str or pathlib.Path object, optional, default is '.'
+        the directory in which the job directories are created
+
+    max_workers : int, optional, default is None
+        the number of worker processes. Default is None, which uses the
+        number of processors.
+
+    sparse : bool, optional, default is False
+        If true, the scattering matrices of the results are stored as
+        BandedMatrix objects
+
+    cache : NjoyCache object, optional, default is None
+        the NJOY cache to use in every job
+
+    runner : function, optional, default is run_njoy
+        the function that runs NJOY, called as
+        ``runner(endf6_file, directory=..., **options)``. It must be
+        importable at module level so it can be sent to the workers.
+
+    verbose : bool, optional, default is False
+        If true, the status of each job is printed as it finishes
+
+    scratch : ScratchSpace object, optional, default is None
+        If given, NJOY is run in a scratch directory for each job, and only
+        the files the ScratchSpace keeps are moved into the job directory
+
+    Returns
+    -------
+    BatchReport object
+        the jobs, with their status, wall time and parsed output
+    """
+
+    if options is None:
+        options = [{}]
+    elif isinstance(options, dict):
+        options = [options]
+
+    directory = Path(directory).absolute()
+
+    # one job per file and option set, each with its own directory
+    jobs = []
+    names = set()
+    for endf6_file in endf6_files:
+        endf6_file = Path(endf6_file).absolute()
+        for i, option_set in enumerate(options):
+            name = endf6_file.stem if len(options) == 1 else f"{endf6_file.stem}_{i}"
+            if name in names:
+                name = f"{name}_{len(jobs)}"
+            names.add(name)
+
+            option_set = dict(option_set)
+            option_set.setdefault("title", endf6_file.stem)
+            if cache is not None:
+                option_set["cache"] = cache
+            if scratch is not None:
+                option_set["scratch"] = scratch
+
+            job = BatchJob(name, endf6_file, directory / name, option_set)
+            job.directory.mkdir(parents=True, exist_ok=True)
+            jobs.append(job)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    pending = jobs
+    while pending:
+        lost = _run_pools([pending], runner, max_workers, sparse, verbose)
+
+        # a dead worker fails every job left in its pool, so the jobs that
+        # had not started are run again on a new pool, and each job that
+        # was running is run again on a pool of its own, so that only the
+        # job that kills its worker fails
+        running = [job for job in lost if (job.directory / STARTED).exists()]
+        pending = [job for job in lost if job not in running]
+        if len(running) > 1:
+            groups = [[job] for job in running]
+            running = _run_pools(groups, runner, max_workers, sparse, verbose)
+        elif not running:
+            # the pool broke before any job started, and would again
+            running, pending = pending, []
+        for job in running:
+            _finish(job, verbose)
+
+    return BatchReport(jobs, time.perf_counter() - start)
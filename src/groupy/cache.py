@@ -0,0 +1,438 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from groupy.parse import GrouprOutput
+from groupy.base._archive import MANIFEST
+
+
+def file_hash(filename, chunk_size=1 << 20):
+    """Function to hash the contents of a file
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path object
+        the file
+
+    chunk_size : int, optional, default is 1 MiB
+        the number of bytes to read at a time
+
+    Returns
+    -------
+    str
+        the SHA-256 hex digest of the file contents
+    """
+
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Class to cache parsed GENDF files on disk
+
+    Each parsed file is saved with GrouprOutput.save in a subdirectory
+    named by the hash of the GENDF file contents, the groupy version and
+    the parse options. Opening the same file again loads the saved
+    arrays (memory-mapped) instead of parsing it.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path object
+        the cache directory, which is created if needed
+
+    Attributes
+    ----------
+    hits : int
+        the number of loads that were found in the cache
+
+    misses : int
+        the number of loads that had to parse the file
+
+    Methods
+    -------
+    key
+        Function to get the cache key for a GENDF file
+
+    load
+        Function to get the parsed GENDF file, from the cache if possible
+
+    clear
+        Function to remove everything from the cache
+
+    """
+
+    def __init__(self, directory):
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, filename, sparse=False, material=None, backend="native"):
+        """Function to get the cache key for a GENDF file
+
+        Parameters
+        ----------
+        filename : str or pathlib.Path object
+            the GENDF file
+
+        sparse : bool, optional, default is False
+            whether the scattering matrices are stored as BandedMatrix
+            objects
+
+        material : int, optional, default is None
+            the MAT number of the material that is parsed
+
+        backend : {"native", "endftk"}, optional, default is "native"
+            the parser that reads the file
+
+        Returns
+        -------
+        str
+            the cache key
+        """
+
+        from groupy import __version__
+
+        digest = hashlib.sha256(file_hash(filename).encode("ascii"))
+        digest.update(
+            f"groupy {__version__} sparse={sparse} material={material} "
+            f"backend={backend}".encode("ascii")
+        )
+        return digest.hexdigest()
+
+    def load(self, filename, sparse=False, mmap=True, material=None, backend="native"):
+        """Function to get the parsed GENDF file, from the cache if possible
+
+        Parameters
+        ----------
+        filename : str or pathlib.Path object
+            the GENDF file
+
+        sparse : bool, optional, default is False
+            If true, the scattering matrices are stored as BandedMatrix
+            objects
+
+        material : int, optional, default is None
+            the MAT number of the material to parse. Default is None, which
+            parses the first material of the file.
+
+        backend : {"native", "endftk"}, optional, default is "native"
+            the parser used when the file is not in the cache
+
+        mmap : bool, optional, default is True
+            If true, arrays loaded from the cache are memory-mapped
+
+        Returns
+        -------
+        GrouprOutput object
+            the parsed file
+        """
+
+        filename = Path(filename)
+        if not filename.exists():
+            raise FileNotFoundError(f"The GENDF file {filename} was not found")
+
+        entry = self.directory / self.key(filename, sparse, material, backend)
+        if (entry / MANIFEST).exists():
+            self.hits += 1
+            return GrouprOutput.load(entry, mmap=mmap)
+
+        self.misses += 1
+        obj = GrouprOutput(
+            filename, sparse=sparse, eager=True, backend=backend, material=material
+        )
+
+        # write into a temporary directory first, so that a half-written
+        # entry is never read
+        temporary = Path(tempfile.mkdtemp(dir=self.directory, prefix=".partial-"))
+        try:
+            obj.save(temporary)
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True)
+        else:
+            _publish(temporary, entry, MANIFEST)
+
+        return obj
+
+    def clear(self):
+        """Function to remove everything from the cache
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        for path in self.directory.iterdir():
+            if path.is_dir():
+                shutil.rmtree(path)
+
+
+class NjoyCache:
+    """Class to cache NJOY results on disk
+
+    Each result is saved in a subdirectory named by the hash of the ENDF
+    file contents and the NJOY input deck, so the same evaluation run with
+    the same options is only processed once. When the cache grows past
+    ``max_size``, the least recently used results are removed.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path object
+        the cache directory, which is created if needed
+
+    max_size : int, optional, default is None
+        the maximum size of the cache in bytes. Default is None, in which
+        case nothing is removed.
+
+    Attributes
+    ----------
+    hits : int
+        the number of results that were found in the cache
+
+    misses : int
+        the number of results that were not in the cache
+
+    evictions : int
+        the number of results removed to keep the cache under max_size
+
+    size : int
+        the size of the cached files in bytes
+
+    Methods
+    -------
+    key
+        Function to get the cache key for an NJOY run
+
+    get
+        Function to copy a cached result into a directory
+
+    put
+        Function to add a result to the cache
+
+    stats
+        Function to get the cache statistics
+
+    clear
+        Function to remove everything from the cache
+
+    """
+
+    # the NJOY files that are kept for each run
+    files = ["tape91", "output"]
+
+    def __init__(self, directory, max_size=None):
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _entries(self):
+        return [
+            path
+            for path in self.directory.iterdir()
+            if path.is_dir() and (path / "tape91").exists()
+        ]
+
+    @property
+    def size(self):
+        return sum(
+            path.stat().st_size for entry in self._entries() for path in entry.iterdir()
+        )
+
+    def key(self, endf6_file, njoy_input):
+        """Function to get the cache key for an NJOY run
+
+        Parameters
+        ----------
+        endf6_file : str or pathlib.Path object
+            the ENDF6-formatted file
+
+        njoy_input : str
+            the NJOY input deck, from write_njoy_input
+
+        Returns
+        -------
+        str
+            the cache key
+        """
+
+        digest = hashlib.sha256(file_hash(endf6_file).encode("ascii"))
+        digest.update(njoy_input.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key, directory):
+        """Function to copy a cached result into a directory
+
+        Parameters
+        ----------
+        key : str
+            the cache key
+
+        directory : str or pathlib.Path object
+            the directory to copy the NJOY files into
+
+        Returns
+        -------
+        bool
+            whether the result was in the cache
+        """
+
+        entry = self.directory / key
+        if not (entry / "tape91").exists():
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        for name in self.files:
+            if (entry / name).exists():
+                shutil.copyfile(entry / name, Path(directory) / name)
+
+        # mark the entry as recently used
+        os.utime(entry / "tape91")
+        return True
+
+    def put(self, key, directory):
+        """Function to add a result to the cache
+
+        Parameters
+        ----------
+        key : str
+            the cache key
+
+        directory : str or pathlib.Path object
+            the directory NJOY was run in
+
+        Returns
+        -------
+        None
+        """
+
+        directory = Path(directory)
+        if not (directory / "tape91").exists():
+            raise FileNotFoundError(f"There is no tape91 in {directory} to cache")
+
+        # copy into a temporary directory first, so that a half-written
+        # entry is never read
+        entry = self.directory / key
+        temporary = Path(tempfile.mkdtemp(dir=self.directory, prefix=".partial-"))
+        for name in self.files:
+            if (directory / name).exists():
+                shutil.copyfile(directory / name, temporary / name)
+
+        _publish(temporary, entry, "tape91")
+
+        self.evict()
+
+    def evict(self):
+        """Function to remove the least recently used results until the
+        cache is no bigger than max_size
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        if self.max_size is None:
+            return
+
+        entries = []
+        for entry in self._entries():
+            size = sum(path.stat().st_size for path in entry.iterdir())
+            entries.append(((entry / "tape91").stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Function to get the cache statistics
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            the hits, misses, evictions, number of entries and size in bytes
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries()),
+            "size": self.size,
+        }
+
+    def clear(self):
+        """Function to remove everything from the cache
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        for path in self.directory.iterdir():
+            if path.is_dir():
+                shutil.rmtree(path)
+
+
+def _publish(temporary, entry, marker):
+    """Function to move a finished temporary directory into place as a cache
+    entry, without removing an entry that another process may be reading
+
+    If a complete entry, one with the marker file, is already there, another
+    process saved the same result first and the temporary directory is
+    removed. An incomplete entry is renamed aside in one step before it is
+    removed, so the entry path never holds a half-removed directory.
+
+    Returns
+    -------
+    bool
+        whether the temporary directory became the entry
+    """
+
+    for _ in range(2):
+        try:
+            os.replace(temporary, entry)
+            return True
+        except OSError:
+            if (entry / marker).exists():
+                break
+
+        aside = Path(tempfile.mkdtemp(dir=entry.parent, prefix=".stale-"))
+        try:
+            os.replace(entry, aside)
+        except OSError:
+            pass
+        shutil.rmtree(aside, ignore_errors=True)
+
+    shutil.rmtree(temporary, ignore_errors=True)
+    return False
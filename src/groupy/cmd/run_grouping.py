@@ -1,8 +1,8 @@
 import argparse
 import sys
-import ENDFtk
 from pathlib import Path
-from groupy import run_njoy, GrouprOutput
+from groupy import run_njoy, GrouprLibrary
+from groupy.base._endf_header import read_endf_headers
 
 
 def main(argv=sys.argv[1:]):
@@ -34,11 +34,7 @@ def main(argv=sys.argv[1:]):
     if not endf_file.exists():
         raise FileNotFoundError(f"Cannot find ENDF6 file {endf_file}")
 
-    tape = ENDFtk.tree.Tape.from_file(str(endf_file))
-    mat_num = tape.material_numbers[0]
-    mat = tape.material(mat_num)
-    file1 = mat.file(1).parse()
-    desc = file1.section(451).description
+    desc = read_endf_headers(endf_file)[0].description
     isotope = desc.splitlines()[0][:11].replace(" ", "")
     isotope = "".join(isotope.split("-")[1:])
     title = f"grouped{isotope}"
@@ -57,8 +53,11 @@ def main(argv=sys.argv[1:]):
     if verbose:
         print(f"\nParsing GROUPR output...")
 
-    print("\n(ENDFtk info messages can be ignored)")
-    obj = GrouprOutput(gendf_file)
+    # every material on the tape was grouped; the files of each material
+    # are written with its MAT number when there is more than one
+    obj = GrouprLibrary(gendf_file)
+    if len(obj) == 1:
+        obj = next(iter(obj.values()))
 
     if verbose:
         print(f"\nWriting out to csv files....")
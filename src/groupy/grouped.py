@@ -1,5 +1,5 @@
-from groupy import run_njoy, GrouprOutput
-import ENDFtk
+from groupy.njoy import run_njoy
+from groupy.library import read_groupr_output
 from pathlib import Path
 
 
@@ -15,6 +15,9 @@ def get_grouped_data(
     legendre_order=1,
     verbose=False,
     write=True,
+    cache=None,
+    sigma0=1e10,
+    scratch=None,
 ):
     """Function to create an njoy input file and run njoy, then parse
     the GROUPR output and return a GrouprOutput object.
@@ -31,8 +34,9 @@ def get_grouped_data(
         the directory in which to run NJOY. Default is the current
         directory.
 
-    temperature : float, optional, default is 293 K
-        the temperature of the run in K
+    temperature : float or list, optional, default is 293 K
+        the temperature of the run in K. If a list, the evaluation is
+        reconstructed once and broadened and grouped at each temperature.
 
     reconr_tolerance : float, optional, default is 0.001
         the tolerance for the reconr module
@@ -64,10 +68,24 @@ def get_grouped_data(
     write : bool, optional, default is True
         If true, write out the values to csv files
 
+    cache : NjoyCache object, optional, default is None
+        If given, NJOY is only run when the same ENDF file and input are
+        not already in the cache
+
+    sigma0 : float or list, optional, default is 1e10
+        the sigma0 (background cross section) value in barns, or a list of
+        values for a self-shielding table, starting with infinite dilution
+
+    scratch : ScratchSpace object, optional, default is None
+        If given, NJOY is run in a scratch directory, and only the files the
+        ScratchSpace keeps are moved into ``directory``
+
     Returns
     --------
-    GrouprOutput object
-        the data parsed from NJOY
+    GrouprOutput object or GrouprLibrary object
+        the data parsed from NJOY. When the ENDF file has several materials,
+        a GrouprLibrary with every one of them, and the csv files of each
+        material have "_MAT{mat}" added to their title.
     """
 
     directory = Path(directory)
@@ -84,11 +102,14 @@ def get_grouped_data(
         flux,
         legendre_order,
         verbose,
+        cache,
+        sigma0=sigma0,
+        scratch=scratch,
     )
 
     # collect the output
-    gendf_file = directory / "tape91"
-    obj = GrouprOutput(gendf_file)
+    # every material on the tape was grouped, so all of them are read
+    obj = read_groupr_output(directory / "tape91")
 
     # write the output files
     if write:
@@ -0,0 +1,286 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from groupy.parse import GrouprOutput
+from groupy.base._gendf_tape import GendfTape
+
+
+class GrouprLibrary:
+    """Class to hold every material of a GENDF file with several materials,
+    such as the output of GROUPR for a library tape
+
+    The file is indexed once, and a GrouprOutput object is made for each
+    material from that index. When eager is true, the materials are parsed
+    on a pool of threads.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path object
+        the GENDF file
+
+    sparse : bool, optional, default is False
+        If true, the scattering matrices are stored as BandedMatrix
+        objects instead of dense arrays
+
+    eager : bool, optional, default is False
+        If true, every section of every material is parsed when the file is
+        opened. Otherwise each section is only parsed the first time it is
+        accessed.
+
+    max_workers : int, optional, default is None
+        the number of threads to parse materials with when eager is true.
+        Default is None, which uses the ThreadPoolExecutor default.
+
+    metrics : ParseMetrics object, optional, default is None
+        If given, the time to index the file, and the parse of every
+        section of every material, are recorded in it
+
+    Attributes
+    ----------
+    materials : dict
+        the GrouprOutput object of each material, keyed by material number,
+        in the order they are in the file
+
+    material_numbers : list of ints
+        the material numbers in the file
+
+    ZA_values : list of ints
+        the ZA of each material, in the same order
+
+    Methods
+    -------
+    by_ZA
+        Function to get the material with a ZA
+
+    write_to_csv
+        Function to write the grouped values of every material into CSV
+        files
+
+    save
+        Function to save the parsed values of every material into a
+        directory
+
+    load
+        Function to load a library saved with GrouprLibrary.save
+
+    """
+
+    def __init__(
+        self, filename, sparse=False, eager=False, max_workers=None, metrics=None
+    ):
+
+        self.filename = Path(filename)
+        self.sparse = sparse
+        self.eager = eager
+        self.metrics = metrics
+
+        start = time.perf_counter()
+        tape = GendfTape(self.filename)
+        if metrics is not None:
+            metrics.record_load(self.filename, "native", time.perf_counter() - start)
+        self.title = tape.title
+        if len(tape.material_numbers) == 0:
+            raise ValueError(f"No materials were found in {self.filename}")
+
+        def parse(mat):
+            return GrouprOutput(
+                self.filename,
+                sparse=sparse,
+                eager=eager,
+                material=mat,
+                metrics=metrics,
+                tape=tape,
+            )
+
+        if eager and len(tape.material_numbers) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                outputs = list(executor.map(parse, tape.material_numbers))
+        else:
+            outputs = [parse(mat) for mat in tape.material_numbers]
+
+        self._set_materials(outputs)
+
+    def _set_materials(self, outputs):
+        """Function to key the GrouprOutput objects of the materials by MAT
+        number and by ZA"""
+
+        self.materials = {obj.material_number: obj for obj in outputs}
+
+        # several evaluations of one nuclide can be on a tape with different
+        # MAT numbers, so each ZA keeps all of its materials
+        self._by_ZA = {}
+        for obj in outputs:
+            self._by_ZA.setdefault(obj.ZA, []).append(obj.material_number)
+
+    @property
+    def material_numbers(self):
+        return list(self.materials)
+
+    @property
+    def ZA_values(self):
+        return [obj.ZA for obj in self.materials.values()]
+
+    def by_ZA(self, za):
+        """Function to get the material with a ZA. If several materials
+        have the ZA, a ValueError is raised and the material has to be
+        chosen by its MAT number instead.
+
+        Parameters
+        ----------
+        za : int
+            the ZA, like 92238 for U-238
+
+        Returns
+        -------
+        GrouprOutput object
+            the material
+        """
+
+        try:
+            mats = self._by_ZA[za]
+        except KeyError:
+            raise KeyError(f"There is no material with ZA {za} in {self.filename}")
+        if len(mats) > 1:
+            raise ValueError(
+                f"The materials {mats} in {self.filename} all have ZA {za}; "
+                f"choose one by its MAT number"
+            )
+        return self.materials[mats[0]]
+
+    def write_to_csv(
+        self, title=None, directory=None, verbose=False, legendre_orders=None
+    ):
+        """Function to write the grouped values of every material into CSV
+        files, with GrouprOutput.write_to_csv. The files of each material
+        have "_MAT{mat}" added to the title.
+
+        Parameters
+        ----------
+        title : string, optional, default is None
+            title for the csv files. Default is None, in which case the
+            title of the tape will be used (with spaces removed)
+
+        directory : string, optional, default is None
+            path of the directory where the files should be written
+
+        verbose : bool, optional, default is False
+            If true, will print the files names as they are created
+
+        legendre_orders : list of ints, optional, default is None
+            the Legendre orders of the scattering matrices to write. Default
+            is None, which only writes ell=0.
+
+        Returns
+        -------
+        None
+        """
+
+        if title is None:
+            title = self.title.replace(" ", "")
+        for mat, obj in self.items():
+            obj.write_to_csv(f"{title}_MAT{mat}", directory, verbose, legendre_orders)
+
+    def save(self, directory):
+        """Function to save the parsed values of every material into a
+        directory, with GrouprOutput.save writing each material into a
+        "MAT{mat}" subdirectory, and the order of the materials into a
+        "materials" file
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path object
+            the directory to write, which is created if needed
+
+        Returns
+        -------
+        None
+        """
+
+        directory = Path(directory)
+        for mat, obj in self.items():
+            obj.save(directory / f"MAT{mat}")
+        (directory / "materials").write_text(
+            "".join(f"{mat}\n" for mat in self.material_numbers)
+        )
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Function to load a library saved with GrouprLibrary.save
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path object
+            the directory written by GrouprLibrary.save
+
+        mmap : bool, optional, default is True
+            If true, the arrays are memory-mapped read-only instead of
+            read into memory
+
+        Returns
+        -------
+        GrouprLibrary object
+            the saved materials, in the order they were in the file
+        """
+
+        directory = Path(directory)
+        if not (directory / "materials").exists():
+            raise FileNotFoundError(f"There is no saved library in {directory}")
+        outputs = [
+            GrouprOutput.load(directory / f"MAT{mat}", mmap=mmap)
+            for mat in (directory / "materials").read_text().split()
+        ]
+
+        obj = cls.__new__(cls)
+        obj.filename = outputs[0].filename
+        obj.title = outputs[0].title
+        obj.sparse = outputs[0].sparse
+        obj.eager = True
+        obj.metrics = None
+        obj._set_materials(outputs)
+        return obj
+
+    def __getitem__(self, mat):
+        try:
+            return self.materials[mat]
+        except KeyError:
+            raise KeyError(f"MAT{mat} is not in {self.filename}")
+
+    def __contains__(self, mat):
+        return mat in self.materials
+
+    def __iter__(self):
+        return iter(self.materials)
+
+    def __len__(self):
+        return len(self.materials)
+
+    def items(self):
+        return self.materials.items()
+
+    def values(self):
+        return self.materials.values()
+
+
+def read_groupr_output(filename, sparse=False):
+    """Function to read a GENDF file made by GROUPR, with every material on
+    it
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path object
+        the GENDF file
+
+    sparse : bool, optional, default is False
+        If true, the scattering matrices are stored as BandedMatrix objects
+
+    Returns
+    -------
+    GrouprOutput object or GrouprLibrary object
+        the material, when the file has one, or a GrouprLibrary with every
+        material
+    """
+
+    library = GrouprLibrary(filename, sparse=sparse)
+    if len(library) == 1:
+        return next(iter(library.values()))
+    return library
@@ -1,7 +1,9 @@
-import ENDFtk
-import os, subprocess
+import asyncio, contextlib, os, shutil, signal, subprocess, tempfile, time
 from pathlib import Path
 from groupy.base._njoy_modules import *
+from groupy.base._endf_header import read_endf_headers
+from groupy.base._run_metrics import NjoyRunMetrics, write_metrics_log
+from groupy.base._njoy_monitor import NjoyMonitor, NjoyRunError, POLL_INTERVAL
 
 
 def run_njoy(
@@ -15,9 +17,24 @@ def run_njoy(
     flux=5,
     legendre_order=1,
     verbose=False,
+    cache=None,
+    timeout=None,
+    sigma0=1e10,
+    metrics_log=None,
+    error_patterns=None,
+    stall_timeout=None,
+    scratch=None,
 ):
     """Function to create an njoy input file and run njoy
 
+    NJOY is started in ``directory`` without changing the working directory
+    of this process, so runs in different directories can be made from
+    several threads at once.
+
+    Every material on the ENDF tape is processed in the one run, so the
+    GENDF file has a material for each of them, which can be read with
+    GrouprLibrary.
+
     Parameters
     ----------
     endf6_file : str or pathlib.Path object
@@ -30,8 +47,9 @@ def run_njoy(
         the directory in which to run NJOY. Default is the current
         directory.
 
-    temperature : float, optional, default is 293 K
-        the temperature of the run in K
+    temperature : float or list, optional, default is 293 K
+        the temperature of the run in K. If a list, the evaluation is
+        reconstructed once and broadened and grouped at each temperature.
 
     reconr_tolerance : float, optional, default is 0.001
         the tolerance for the reconr module
@@ -58,113 +76,626 @@ def run_njoy(
 
 
     verbose : bool, optional, default is False
-        If true, extra information will be printed to the screen
+        If true, extra information will be printed to the screen, along
+        with the NJOY listing as it is written. Otherwise the listing is
+        only kept in the metrics and in any NjoyRunError.
+
+    cache : NjoyCache object, optional, default is None
+        If given, the NJOY output is copied from the cache when the same
+        ENDF file and input were run before, and saved to the cache
+        otherwise.
+
+    timeout : float, optional, default is None
+        the number of seconds to wait for NJOY before it is killed. Default
+        is None, which waits until it is done.
+
+        A run that is stopped early, or fails, raises an NjoyRunError,
+        which has the reason and the module that was running.
+
+    sigma0 : float or list, optional, default is 1e10
+        the sigma0 (background cross section) value in barns, or a list of
+        values for a self-shielding table, starting with infinite dilution
+
+    metrics_log : str or pathlib.Path object, optional, default is None
+        If given, a JSON lines file that a record of the run and its
+        metrics is appended to
+
+    error_patterns : list of str, optional, default is None
+        regular expressions for lines of the NJOY listing that stop the run
+        as soon as they are written. Default is None, which stops on
+        "***error".
+
+    stall_timeout : float, optional, default is None
+        the number of seconds NJOY can go without writing to its listing
+        before it is killed. Default is None, which doesn't check.
+
+    scratch : ScratchSpace object, optional, default is None
+        If given, NJOY is run in a new scratch directory, and only the files
+        the ScratchSpace keeps are moved into ``directory``; the
+        intermediate tapes are removed. Default is None, which runs NJOY in
+        ``directory`` itself.
 
     Returns
     --------
-    None
+    NjoyRunMetrics object or None
+        the wall time, the time of each NJOY module, and the CPU time and
+        peak memory of the NJOY process. None if the output was found in
+        the cache.
     """
 
-    # check ENDF6 file
-    endf6_file = Path(endf6_file).absolute()
-    if not endf6_file.exists():
-        raise FileNotFoundError(f"The ENDF6-formatted file {endf6_file} was not found.")
+    endf6_file, directory, njoy_input, key, found = _start_run(
+        endf6_file,
+        title,
+        directory,
+        temperature,
+        reconr_tolerance,
+        broadr_tolerance,
+        group_boundaries,
+        flux,
+        legendre_order,
+        verbose,
+        sigma0,
+        cache,
+    )
+    if found:
+        return
+
+    with _run_directory(scratch, directory) as run_directory:
+        _write_tape(endf6_file, run_directory / "tape20")
+        metrics = _run_process(
+            run_directory, njoy_input, timeout, verbose, error_patterns, stall_timeout
+        )
+
+    _finish_run(metrics, title, endf6_file, directory, verbose, metrics_log, cache, key)
+    return metrics
+
+
+async def run_njoy_async(
+    endf6_file,
+    title,
+    directory=".",
+    temperature=293,
+    reconr_tolerance=0.001,
+    broadr_tolerance=0.001,
+    group_boundaries=2,
+    flux=5,
+    legendre_order=1,
+    verbose=False,
+    cache=None,
+    timeout=None,
+    sigma0=1e10,
+    metrics_log=None,
+    error_patterns=None,
+    stall_timeout=None,
+    scratch=None,
+):
+    """Function to create an njoy input file and run njoy from an asyncio
+    event loop
+
+    The parameters and the metrics returned are the same as for run_njoy.
+    The ENDF file, the cache and the metrics log are read and written in a
+    thread, and NJOY is polled between awaits, so the event loop is never
+    blocked. If the run times out or the task is cancelled, the NJOY
+    process is killed.
+
+    Parameters
+    ----------
+    endf6_file, title, directory, ... : see run_njoy
+
+    Returns
+    --------
+    NjoyRunMetrics object or None
+        the metrics of the run, or None if the output was found in the
+        cache
+    """
+
+    endf6_file, directory, njoy_input, key, found = await asyncio.to_thread(
+        _start_run,
+        endf6_file,
+        title,
+        directory,
+        temperature,
+        reconr_tolerance,
+        broadr_tolerance,
+        group_boundaries,
+        flux,
+        legendre_order,
+        verbose,
+        sigma0,
+        cache,
+    )
+    if found:
+        return
+
+    async with _run_directory_async(scratch, directory) as run_directory:
+        await asyncio.to_thread(_write_tape, endf6_file, run_directory / "tape20")
+        metrics = await _run_process_async(
+            run_directory, njoy_input, timeout, verbose, error_patterns, stall_timeout
+        )
+
+    await asyncio.to_thread(
+        _finish_run,
+        metrics,
+        title,
+        endf6_file,
+        directory,
+        verbose,
+        metrics_log,
+        cache,
+        key,
+    )
+    return metrics
+
+
+def _start_run(
+    endf6_file,
+    title,
+    directory,
+    temperature,
+    reconr_tolerance,
+    broadr_tolerance,
+    group_boundaries,
+    flux,
+    legendre_order,
+    verbose,
+    sigma0,
+    cache,
+):
+    """Function to write the NJOY input file, and copy the output from the
+    cache if the same run was made before
+
+    Returns
+    --------
+    pathlib.Path object
+        the absolute path of the ENDF file
+
+    pathlib.Path object
+        the absolute path of the run directory
+
+    str
+        the NJOY input
+
+    str or None
+        the cache key, or None if there is no cache
+
+    bool
+        whether the output was found in the cache
+    """
+
+    endf6_file, directory, njoy_input = _prepare_run(
+        endf6_file,
+        title,
+        directory,
+        temperature,
+        reconr_tolerance,
+        broadr_tolerance,
+        group_boundaries,
+        flux,
+        legendre_order,
+        verbose,
+        sigma0,
+    )
+
+    key, found = None, False
+    if cache is not None:
+        key = cache.key(endf6_file, njoy_input)
+        found = cache.get(key, directory)
+        if found and verbose:
+            print(f" Found the NJOY output in the cache")
+
+    return endf6_file, directory, njoy_input, key, found
+
+
+def _finish_run(
+    metrics, title, endf6_file, directory, verbose, metrics_log, cache, key
+):
+    """Function to record a finished NJOY run in the metrics log and the
+    cache, if they are given
+
+    Returns
+    --------
+    None
+    """
 
-    # open with ENDFtk and get the important information
-    tape = ENDFtk.tree.Tape.from_file(str(endf6_file))
-    mat_num = tape.material_numbers[0]
-    mat = tape.material(mat_num)
     if verbose:
-        print(f"\nRunning NJOY for {mat_num}")
+        print(f"NJOY completed")
 
-    # check for nubar
-    if mat.file(1).has_MT(452):
-        has_nubar = True
-        if verbose:
-            print(f"\t{mat_num} has nubar")
-    else:
-        has_nubar = False
-        if verbose:
-            print(f"\t{mat_num} does not have nubar")
+    if metrics_log is not None:
+        _log_metrics(metrics_log, title, endf6_file, directory, metrics)
 
-    # check for PFNS
-    if mat.has_MF(5) and mat.file(5).has_MT(18):
-        has_pfns = True
-        if verbose:
-            print(f"\t{mat_num} has PFNS")
-    else:
-        has_pfns = False
-        if verbose:
-            print(f"\t{mat_num} does not have PFNS")
+    if cache is not None:
+        cache.put(key, directory)
+
+
+def _prepare_run(
+    endf6_file,
+    title,
+    directory,
+    temperature,
+    reconr_tolerance,
+    broadr_tolerance,
+    group_boundaries,
+    flux,
+    legendre_order,
+    verbose,
+    sigma0,
+):
+    """Function to read the ENDF file and write the NJOY input file
+
+    Returns
+    --------
+    pathlib.Path object
+        the absolute path of the ENDF file
+
+    pathlib.Path object
+        the absolute path of the run directory
+
+    str
+        the NJOY input
+    """
+
+    endf6_file = Path(endf6_file).absolute()
+
+    # every material on the tape is processed in the one run
+    mat_num, has_nubar, has_pfns = _njoy_materials(endf6_file, verbose)
 
-    directory = Path(directory)
+    directory = Path(directory).absolute()
 
     # input file
-    input_file = Path(directory) / "input"
+    input_file = directory / "input"
     if verbose:
         print(f" Input file: {input_file}")
 
+    njoy_input = write_njoy_input(
+        mat_num,
+        title,
+        temperature,
+        reconr_tolerance,
+        broadr_tolerance,
+        group_boundaries,
+        flux,
+        has_nubar,
+        has_pfns,
+        legendre_order,
+        sigma0,
+    )
     with open(input_file, "w") as f:
-        f.write(
-            write_njoy_input(
-                mat_num,
-                title,
-                temperature,
-                reconr_tolerance,
-                broadr_tolerance,
-                group_boundaries,
-                flux,
-                has_nubar,
-                has_pfns,
-                legendre_order,
-            )
-        )
+        f.write(njoy_input)
 
-    # move to the directory and run NJOY
-    old_dir = Path(".").absolute()
-    os.chdir(directory)
-    if verbose:
-        print(f" Moved into {Path('.').absolute()}")
+    return endf6_file, directory, njoy_input
 
-    try:
 
-        # run NJOY
-        tape20 = Path("tape20")
-        tape20.write_text(endf6_file.read_text())
+def _njoy_materials(endf6_file, verbose=False):
+    """Function to get the material numbers, and whether there is nubar and
+    a PFNS, as the NJOY input functions take them: single values when the
+    ENDF file has one material, and lists when it has several
+
+    Returns
+    --------
+    int or list of ints
+        the material number, or the number of each material
+
+    bool or list of bools
+        whether the evaluation has nubar
+
+    bool or list of bools
+        whether the evaluation has a PFNS
+    """
 
-        # check that njoy executable is in the path
-        if "njoy" not in os.environ["PATH"]:
-            raise EnvironmentError(f"The NJOY executable needs to be in the Path.")
+    materials = _read_endf_materials(endf6_file, verbose)
+    if len(materials) == 1:
+        return materials[0]
+    return tuple(list(values) for values in zip(*materials))
 
-        # make sure the shared library can be found
-        if "LD_LIBRARY_PATH" not in os.environ.keys():
-            local_lib = Path("/usr/local/lib")
-            if local_lib.exists():
-                os.environ["LD_LIBRARY_PATH"] = "/usr/local/lib"
-            else:
-                raise EnvironmentError(
-                    f"LD_LIBRARY_PATH is not set, and /usr/local/lib does not exist."
-                )
 
-        with open("input", "r") as f:
-            inp = f.read()
+def _read_endf_materials(endf6_file, verbose=False):
+    """Function to get the material number, and whether there is nubar and
+    a PFNS, for every material of an ENDF file
 
-        p1 = subprocess.Popen(["njoy"], stdin=subprocess.PIPE, text=True)
-        p1.communicate(inp)
+    Returns
+    --------
+    list of tuples
+        the material number, whether the evaluation has nubar and whether
+        it has a PFNS, for each material in the order they are on the tape
+    """
 
-        if p1.returncode == 77:
-            raise RuntimeError(f"NJOY run failed")
+    # read the MF1/MT451 header of each material, without parsing the data
+    headers = {}
+    for header in read_endf_headers(endf6_file):
+        headers.setdefault(header.mat, header)
 
-        os.chdir(old_dir)
+    materials = []
+    for mat_num, header in headers.items():
         if verbose:
-            print(f" Moved back to {Path('.').absolute()}")
-            print(f"NJOY completed")
+            print(f"\nRunning NJOY for {mat_num}")
+
+        # check for nubar
+        if header.has_section(1, 452):
+            has_nubar = True
+            if verbose:
+                print(f"\t{mat_num} has nubar")
+        else:
+            has_nubar = False
+            if verbose:
+                print(f"\t{mat_num} does not have nubar")
+
+        # check for PFNS
+        if header.has_section(5, 18):
+            has_pfns = True
+            if verbose:
+                print(f"\t{mat_num} has PFNS")
+        else:
+            has_pfns = False
+            if verbose:
+                print(f"\t{mat_num} does not have PFNS")
+
+        materials.append((mat_num, has_nubar, has_pfns))
+
+    return materials
+
+
+def _write_tape(source, destination):
+    """Function to put an input tape for NJOY in its run directory
+
+    The tape is linked rather than copied: with a symbolic link, or a hard
+    link where symbolic links can't be made, and only copied (a block at a
+    time) if neither works. NJOY only reads its input tapes, so the source
+    is never changed.
+
+    Returns
+    --------
+    None
+    """
+
+    source, destination = Path(source).absolute(), Path(destination)
+
+    # replace a tape left by an earlier run, unless it is already the source
+    if destination.is_symlink() or destination.exists():
+        if destination.exists() and os.path.samefile(source, destination):
+            return
+        destination.unlink()
+
+    try:
+        os.symlink(source, destination)
+    except OSError:
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+
+
+def _run_directory(scratch, directory):
+    """Function to get the context that NJOY is run in: a scratch directory
+    from a ScratchSpace, or the run directory itself
+
+    Returns
+    --------
+    context manager
+        gives the directory to run NJOY in
+    """
+
+    if scratch is None:
+        return contextlib.nullcontext(directory)
+    return scratch.run(directory)
+
+
+@contextlib.asynccontextmanager
+async def _run_directory_async(scratch, directory):
+    """Function to get the context that NJOY is run in from an asyncio
+    event loop, as _run_directory does, with the scratch directory made and
+    finished in a thread
+
+    Returns
+    --------
+    async context manager
+        gives the directory to run NJOY in
+    """
+
+    if scratch is None:
+        yield directory
+        return
+
+    run_directory = await asyncio.to_thread(scratch.create)
+    try:
+        yield run_directory
+    except BaseException:
+        await asyncio.to_thread(scratch.finish, run_directory, directory, True)
+        raise
+    await asyncio.to_thread(scratch.finish, run_directory, directory)
+
+
+def _njoy_environment():
+    """Function to get the environment to run NJOY in
+
+    The environment is a copy, so os.environ is never changed.
+
+    Returns
+    --------
+    dict
+        the environment variables for the NJOY process
+    """
+
+    # check that njoy executable is in the path
+    if shutil.which("njoy") is None:
+        raise EnvironmentError(f"The NJOY executable needs to be in the Path.")
+
+    # make sure the shared library can be found
+    env = dict(os.environ)
+    if "LD_LIBRARY_PATH" not in env:
+        local_lib = Path("/usr/local/lib")
+        if local_lib.exists():
+            env["LD_LIBRARY_PATH"] = "/usr/local/lib"
+        else:
+            raise EnvironmentError(
+                f"LD_LIBRARY_PATH is not set, and /usr/local/lib does not exist."
+            )
+
+    return env
 
+
+def _run_process(
+    directory,
+    njoy_input,
+    timeout=None,
+    verbose=False,
+    error_patterns=None,
+    stall_timeout=None,
+):
+    """Function to run NJOY in a directory that already has its input
+    tapes, without changing the working directory of this process
+
+    Returns
+    --------
+    NjoyRunMetrics object
+        the wall time, the time of each NJOY module, and the CPU time and
+        peak memory of the NJOY process
+    """
+
+    steps = _process_steps(
+        directory, njoy_input, timeout, verbose, error_patterns, stall_timeout
+    )
+    try:
+        while True:
+            next(steps)
+            time.sleep(POLL_INTERVAL)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        steps.close()
+
+
+async def _run_process_async(
+    directory,
+    njoy_input,
+    timeout=None,
+    verbose=False,
+    error_patterns=None,
+    stall_timeout=None,
+):
+    """Function to run NJOY as _run_process does, waiting between polls
+    with asyncio.sleep so the event loop keeps running. If the task is
+    cancelled, the NJOY process is killed.
+
+    Returns
+    --------
+    NjoyRunMetrics object
+        the wall time, the time of each NJOY module, and the CPU time and
+        peak memory of the NJOY process
+    """
+
+    steps = _process_steps(
+        directory, njoy_input, timeout, verbose, error_patterns, stall_timeout
+    )
+    try:
+        while True:
+            next(steps)
+            await asyncio.sleep(POLL_INTERVAL)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        steps.close()
+
+
+def _process_steps(
+    directory, njoy_input, timeout, verbose, error_patterns, stall_timeout
+):
+    """Generator that runs NJOY, yielding each time the caller should wait
+    POLL_INTERVAL before it polls again, and returning the metrics
+
+    NJOY writes its listing (stdout and stderr) to a temporary file, which
+    is read as it grows, so the run is stopped as soon as it writes an
+    error, runs past the timeout, or stops writing for the stall timeout.
+    The input and listing go through files rather than pipes, so a killed
+    run can't be held open by anything NJOY started.
+
+    The process is reaped with a non-blocking os.wait4 in the same thread
+    that kills it, so it is never sent a signal after it has been reaped,
+    when its pid could already belong to another process. os.wait4 also
+    gives the resource use of this one process even when other NJOY runs
+    are going in other threads. Popen.kill is not used, as it reaps the
+    process itself and the resource use would be lost. If the generator
+    is closed before NJOY finishes, NJOY is killed.
+
+    Returns
+    --------
+    NjoyRunMetrics object
+        the wall time, the time of each NJOY module, and the CPU time and
+        peak memory of the NJOY process
+    """
+
+    monitor = NjoyMonitor(error_patterns, timeout, stall_timeout, echo=verbose)
+    try:
+        with tempfile.TemporaryFile("w+") as stdin, tempfile.TemporaryFile() as listing:
+            stdin.write(njoy_input)
+            stdin.seek(0)
+
+            process = subprocess.Popen(
+                ["njoy"],
+                stdin=stdin,
+                stdout=listing,
+                stderr=subprocess.STDOUT,
+                cwd=directory,
+                env=_njoy_environment(),
+            )
+            monitor.start()
+
+            rusage = None
+            try:
+                while True:
+                    rusage = _reap(process, os.WNOHANG)
+                    monitor.read(listing.fileno())
+                    if rusage is not None:
+                        break
+                    if monitor.check():
+                        os.kill(process.pid, signal.SIGKILL)
+                    yield
+                monitor.finish()
+            finally:
+                # don't leave NJOY running if the wait was interrupted
+                if rusage is None:
+                    os.kill(process.pid, signal.SIGKILL)
+                    rusage = _reap(process, 0)
     except Exception as error:
-        os.chdir(old_dir)
-        if verbose:
-            print(f" Moved back to {Path('.').absolute()}")
-        raise RuntimeError(f"NJOY did not run: {error}")
+        raise RuntimeError(f"NJOY did not run: {error}") from error
+
+    monitor.raise_for_failure(process.returncode)
+    return NjoyRunMetrics(
+        monitor.wall_time, monitor.listing, rusage, process.returncode
+    )
+
+
+def _reap(process, options):
+    """Function to reap a process with os.wait4, setting its return code
+
+    Returns
+    --------
+    resource.struct_rusage or None
+        the resource use of the process, or None if it is still running
+    """
+
+    pid, status, rusage = os.wait4(process.pid, options)
+    if pid == 0:
+        return None
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return rusage
+
+
+def _log_metrics(metrics_log, title, endf6_file, directory, metrics):
+    """Function to append the metrics of a run to a JSON lines file
+
+    Returns
+    --------
+    None
+    """
+
+    record = {
+        "title": title,
+        "endf6_file": str(endf6_file),
+        "directory": str(directory),
+        "time": time.time(),
+    }
+    record.update(metrics.to_dict())
+    write_metrics_log(metrics_log, record)
 
 
 def write_njoy_input(
@@ -178,19 +709,22 @@ def write_njoy_input(
     has_nubar=False,
     has_pfns=False,
     legendre_order=4,
+    sigma0=1e10,
 ):
     """Function to create the strings for an njoy input file
 
     Parameters
     ----------
-    mat : int
-        the material number
+    mat : int or list
+        the material number, or a list of the material numbers on the tape,
+        which are all processed with the same parameters
 
     title : str
         the run title
 
-    temperature : float, optional, default is 293 K
-        the temperature of the run in K
+    temperature : float or list, optional, default is 293 K
+        the temperature of the run in K. If a list, the evaluation is
+        reconstructed once and broadened and grouped at each temperature.
 
     reconr_tolerance : float, optional, default is 0.001
         the tolerance for the reconr module
@@ -211,6 +745,149 @@ def write_njoy_input(
             9   claw weight function
             11  vitamin-e weight function
 
+    has_nubar : bool or list, optional, default is False
+        whether or not the evaluation has nubar, or a list with a value for
+        each material
+
+    has_pfns : bool or list, optional, default is False
+        whether or not the evaluation has a PFNS, or a list with a value for
+        each material
+
+    legendre_order : int, optional, default is 4
+        the order to reconstruct the angular distributions
+
+    sigma0 : float or list, optional, default is 1e10
+        the sigma0 (background cross section) value in barns, or a list of
+        values for a self-shielding table, starting with infinite dilution
+
+    Returns
+    --------
+    str
+        the text for the input file
+    """
+
+    input = " -- \n -- "
+    input += title
+    input += "\n --\n"
+
+    input += make_reconr(mat, title, reconr_tolerance)
+    input += make_broadr(mat, temperature, broadr_tolerance)
+    input += make_groupr(
+        mat,
+        temperature,
+        title,
+        group_boundaries,
+        flux,
+        legendre_order=legendre_order,
+        has_nubar=has_nubar,
+        has_pfns=has_pfns,
+        sigma0=sigma0,
+    )
+
+    input += " stop"
+    return input
+
+
+def write_reconr_input(mat, title, tolerance=0.001):
+    """Function to create the strings for an njoy input file that only
+    reconstructs the evaluation, giving the PENDF file on tape21
+
+    Parameters
+    ----------
+    mat : int
+        the material number
+
+    title : str
+        the run title
+
+    tolerance : float, optional, default is 0.001
+        the tolerance for the reconr module
+
+    Returns
+    --------
+    str
+        the text for the input file
+    """
+
+    input = " -- \n -- "
+    input += title
+    input += "\n --\n"
+
+    input += make_reconr(mat, title, tolerance)
+
+    input += " stop"
+    return input
+
+
+def write_broadr_input(mat, title, temperature=293, tolerance=0.001):
+    """Function to create the strings for an njoy input file that only
+    broadens the PENDF file on tape21, giving the broadened PENDF file on
+    tape22
+
+    Parameters
+    ----------
+    mat : int
+        the material number
+
+    title : str
+        the run title
+
+    temperature : float or list, optional, default is 293 K
+        the temperature of the run in K, or a list of temperatures
+
+    tolerance : float, optional, default is 0.001
+        the tolerance for the broadr module
+
+    Returns
+    --------
+    str
+        the text for the input file
+    """
+
+    input = " -- \n -- "
+    input += title
+    input += "\n --\n"
+
+    input += make_broadr(mat, temperature, tolerance)
+
+    input += " stop"
+    return input
+
+
+def write_groupr_input(
+    mat,
+    title,
+    temperature=293,
+    group_boundaries=2,
+    flux=5,
+    has_nubar=False,
+    has_pfns=False,
+    legendre_order=4,
+    sigma0=1e10,
+):
+    """Function to create the strings for an njoy input file that only
+    runs groupr, reading the ENDF file from tape20 and an already broadened
+    PENDF file from tape22
+
+    Parameters
+    ----------
+    mat : int
+        the material number
+
+    title : str
+        the run title
+
+    temperature : float or list, optional, default is 293 K
+        the temperature of the run in K, or a list of temperatures, which
+        must all be in the PENDF file
+
+    group_boundaries : int or list
+        The group boundaries to use. If an integer, it represents ign in the
+        NJOY input. If a list, it is the energy boundaries in eV.
+
+    flux : int
+        The weighting flux to use - the iwt value in the NJOY input.
+
     has_nubar : bool, optional, default is False
         whether or not the evaluation has nubar
 
@@ -220,6 +897,9 @@ def write_njoy_input(
     legendre_order : int, optional, default is 4
         the order to reconstruct the angular distributions
 
+    sigma0 : float or list, optional, default is 1e10
+        the sigma0 (background cross section) value in barns, or a list of
+        values for a self-shielding table, starting with infinite dilution
 
     Returns
     --------
@@ -231,8 +911,6 @@ def write_njoy_input(
     input += title
     input += "\n --\n"
 
-    input += make_reconr(mat, title, reconr_tolerance)
-    input += make_broadr(mat, temperature, broadr_tolerance)
     input += make_groupr(
         mat,
         temperature,
@@ -242,6 +920,7 @@ def write_njoy_input(
         legendre_order=legendre_order,
         has_nubar=has_nubar,
         has_pfns=has_pfns,
+        sigma0=sigma0,
     )
 
     input += " stop"
@@ -1,10 +1,58 @@
-import ENDFtk
+import copy
+import time
 from pathlib import Path
 import numpy as np
 from groupy.base._energy_class import EnergyBoundaryValues
 from groupy.base._pointwise_class import PointwiseValues
 from groupy.base._outgoing_class import OutgoingDistribution
 from groupy.base._scattering_mat_class import ScatteringMatrix
+from groupy.base._lazy_sections import LazySections
+from groupy.base._gendf_tape import GendfTape
+from groupy.base._archive import save_value, load_value, write_archive, read_archive
+from groupy.base._axes import stack_temperatures, select_temperature, select_sigma0
+from groupy.base._collapse import (
+    collapse_positions,
+    collapse_pointwise,
+    collapse_outgoing,
+    collapse_matrix,
+)
+from groupy.base._writer import (
+    INELASTIC_MTS,
+    pointwise_table,
+    scattering_table,
+    write_csv,
+    dense_values,
+)
+
+SECTION_ATTRIBUTES = ["pointwise", "outgoing_distributions", "scattering_matrices"]
+
+# the MT's written by write_to_csv
+POINTWISE_MTS = [1, 18, 452]
+DISTRIBUTION_MTS = [18]
+SCATTERING_MTS = [
+    2,
+    4,
+    11,
+    16,
+    17,
+    22,
+    23,
+    24,
+    25,
+    28,
+    29,
+    30,
+    32,
+    33,
+    34,
+    35,
+    36,
+    37,
+    41,
+    42,
+    44,
+    45,
+]
 
 
 class GrouprOutput:
@@ -15,18 +63,102 @@ class GrouprOutput:
     filename : str or pathlib.Path object
         the GENDF file
 
+    sparse : bool, optional, default is False
+        If true, the scattering matrices are stored as BandedMatrix
+        objects instead of dense arrays
+
+    eager : bool, optional, default is False
+        If true, every section is parsed when the file is opened, and
+        pointwise, outgoing_distributions and scattering_matrices are
+        dictionaries. Otherwise they are LazySections mappings, and each
+        section is only parsed the first time it is accessed.
+
+    backend : {"native", "endftk"}, optional, default is "native"
+        How to read the file. "native" memory-maps the file and finds the
+        sections itself, and "endftk" reads it with ENDFtk. Files with
+        several temperatures can only be read with "native".
+
+    material : int, optional, default is None
+        the material number to read from a file with several materials.
+        Default is None, which reads the first material.
+
+    metrics : ParseMetrics object, optional, default is None
+        If given, the time to open the file, and the time, size and (if it
+        traces memory) peak memory of parsing each section are recorded in
+        it
+
+    tape : GendfTape object, optional, default is None
+        an index of the file that has already been made, so that the
+        materials of a tape can share one index (as GrouprLibrary does).
+        Default is None, which indexes the file. Only used with the
+        "native" backend.
+
 
     Attributes
     ----------
+    material_number : int
+        the material number
+
+    ZA : int
+        the ZA of the material
+
+    temperatures : np.array of floats
+        the temperatures in the file, in K. When there is more than one,
+        the values, flux values and temperature of every section have a
+        leading temperature axis, like ``pointwise[mt].values[T, g]``.
+
+    sigma0_values : np.array of floats
+        the sigma0 values (background cross sections) in the file, in
+        barns. When there is more than one, the values and flux values of
+        every section have a sigma0 axis, after the temperature axis if
+        there is one, like ``pointwise[mt].values[T, z, g]``.
 
     Methods
     -------
+    at_temperature
+        Function to get the values at one temperature
+
+    at_sigma0
+        Function to get the values at one sigma0 value
+
+    collapse
+        Function to collapse the values to a coarser group structure
+
+    save
+        Function to save the parsed values into a directory
+
+    load
+        Function to load values saved with GrouprOutput.save
+
+    write_to_csv
+        Function to write the grouped values into CSV files
 
     """
 
-    def __init__(self, filename):
+    def __init__(
+        self,
+        filename,
+        sparse=False,
+        eager=False,
+        backend="native",
+        material=None,
+        metrics=None,
+        tape=None,
+    ):
 
         self.filename = Path(filename)
+        self.sparse = sparse
+        self.eager = eager
+        self.backend = backend
+        self.material_number = material
+        self.metrics = metrics
+
+        if tape is not None:
+            if backend != "native":
+                raise ValueError(
+                    f"A shared tape can only be used by the native backend"
+                )
+            self._tape = tape
 
         # check that the file exists
         if not self.filename.exists():
@@ -39,6 +171,14 @@ class GrouprOutput:
     def energy_boundaries(self):
         return self._energy_boundaries.energy_boundaries
 
+    @property
+    def ZA(self):
+        return int(self._energy_boundaries.ZA)
+
+    @property
+    def sigma0_values(self):
+        return np.atleast_1d(self._energy_boundaries.sigma0)
+
     def parse(self):
         """Function to parse the full GENDF file
 
@@ -51,48 +191,439 @@ class GrouprOutput:
         None
         """
 
-        tape = ENDFtk.tree.Tape.from_file(str(self.filename))
-        mat = tape.material(tape.material_numbers[0])
-        self.material_number = mat.MAT
-
-        self.title = tape.content.splitlines()[0][:66].strip()
+        # the time to index a shared tape is recorded by whoever indexed it
+        shared = isinstance(getattr(self, "_tape", None), GendfTape)
+        start = time.perf_counter()
+        if self.backend == "native":
+            files = self._read_native()
+        elif self.backend == "endftk":
+            files = self._read_endftk()
+        else:
+            raise ValueError(f"Unknown GrouprOutput backend {self.backend}")
+        if self.metrics is not None and not shared:
+            self.metrics.record_load(
+                self.filename, self.backend, time.perf_counter() - start
+            )
 
-        for mf in mat.file_numbers.to_list():
+        for mf, (mts, read_section) in files.items():
 
-            # get the energies from MF1 MT451
+            # get the energies and temperatures from MF1 MT451
             if mf == 1:
 
-                mf1_mt451 = mat.file(mf).section(451).content.splitlines()
-                self._energy_boundaries = EnergyBoundaryValues(mf1_mt451)
+                mf1 = [
+                    self._parse_section(
+                        1, 451, block, read_section, EnergyBoundaryValues
+                    )
+                    for block in range(self._number_blocks)
+                ]
+                self._energy_boundaries = mf1[0]
+                self.temperatures = np.array([values.temperature for values in mf1])
 
             # go through the pointwise (MF3)
             elif mf == 3:
-                self.pointwise = {}
-                mf3 = mat.file(mf)
-                for mt in mf3.section_numbers.to_list():
-                    lines = mf3.section(mt).content.splitlines()
-                    self.pointwise[mt] = PointwiseValues(lines)
+                self.pointwise = LazySections(
+                    mts, self._section_loader(mf, read_section, PointwiseValues)
+                )
 
             # go through distributions (MF5)
             elif mf == 5:
-                self.outgoing_distributions = {}
-                mf5 = mat.file(mf)
-                for mt in mf5.section_numbers.to_list():
-                    lines = mf5.section(mt).content.splitlines()
-                    self.outgoing_distributions[mt] = OutgoingDistribution(lines)
+                self.outgoing_distributions = LazySections(
+                    mts, self._section_loader(mf, read_section, OutgoingDistribution)
+                )
 
             # go through scattering matrices (MF6)
             elif mf == 6:
-                self.scattering_matrices = {}
-                mf6 = mat.file(mf)
-                for mt in mf6.section_numbers.to_list():
-                    lines = mf6.section(mt).content.splitlines()
-                    self.scattering_matrices[mt] = ScatteringMatrix(lines)
+                self.scattering_matrices = LazySections(
+                    mts,
+                    self._section_loader(
+                        mf, read_section, ScatteringMatrix, sparse=self.sparse
+                    ),
+                )
 
             else:
                 raise NotImplementedError(f"GrouprOutput can't yet parse MF{mf}")
 
-    def write_to_csv(self, title=None, directory=None, verbose=False):
+        if self.eager:
+            for name in SECTION_ATTRIBUTES:
+                if hasattr(self, name):
+                    setattr(self, name, dict(getattr(self, name)))
+
+    def _read_native(self):
+        """Function to index the file with the native reader
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            the MT numbers and a function to read a section, for each MF
+        """
+
+        # a tape given to the constructor is shared, and not indexed again
+        if not isinstance(getattr(self, "_tape", None), GendfTape):
+            self._tape = GendfTape(self.filename)
+
+        mat = self._material(self._tape.material_numbers)
+        self.title = self._tape.title
+
+        # GROUPR writes the material once for each temperature
+        self._number_blocks = self._tape.number_blocks(mat)
+
+        files = {}
+        for mf in self._tape.file_numbers(mat):
+            files[mf] = (
+                self._tape.section_numbers(mat, mf),
+                lambda mt, block=0, mf=mf: self._tape.section(mat, mf, mt, block),
+            )
+        return files
+
+    def _read_endftk(self):
+        """Function to index the file with ENDFtk
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            the MT numbers and a function to read a section, for each MF
+        """
+
+        import ENDFtk
+
+        # keep the tape alive for the sections that are not parsed yet
+        self._tape = ENDFtk.tree.Tape.from_file(str(self.filename))
+        material_numbers = list(self._tape.material_numbers)
+        if len(set(material_numbers)) != len(material_numbers):
+            raise NotImplementedError(
+                f"Files with several temperatures can only be read with the native backend."
+            )
+        mat = self._tape.material(self._material(material_numbers))
+        self._number_blocks = 1
+
+        self.title = self._tape.content.splitlines()[0][:66].strip()
+
+        files = {}
+        for mf in mat.file_numbers.to_list():
+            file = mat.file(mf)
+            files[mf] = (
+                file.section_numbers.to_list(),
+                lambda mt, block=0, file=file: file.section(mt).content.splitlines(),
+            )
+        return files
+
+    def _material(self, material_numbers):
+        """Function to choose the material to read, and check that it is in
+        the file
+
+        Parameters
+        ----------
+        material_numbers : list of ints
+            the material numbers in the file
+
+        Returns
+        -------
+        int
+            the material number
+        """
+
+        if self.material_number is None:
+            self.material_number = material_numbers[0]
+        elif self.material_number not in material_numbers:
+            raise KeyError(f"MAT{self.material_number} is not in {self.filename}")
+        return self.material_number
+
+    def _section_loader(self, mf, read_section, section_class, **kwargs):
+        """Function to create the function that parses one section of a file
+
+        Parameters
+        ----------
+        mf : int
+            the MF number
+
+        read_section : callable
+            function that takes an MT number (and a block) and returns the
+            section text
+
+        section_class : class
+            the class to parse the section with
+
+        kwargs
+            extra arguments for the section class
+
+        Returns
+        -------
+        callable
+            function that takes an MT number and returns the parsed section,
+            with a temperature axis if there is more than one temperature
+        """
+
+        def load(mt):
+            if self._number_blocks == 1:
+                return self._parse_section(
+                    mf, mt, 0, read_section, section_class, **kwargs
+                )
+
+            sections = []
+            for block in range(self._number_blocks):
+                try:
+                    sections.append(
+                        self._parse_section(
+                            mf, mt, block, read_section, section_class, **kwargs
+                        )
+                    )
+                except KeyError:
+                    sections.append(None)
+            return stack_temperatures(sections, self.temperatures)
+
+        return load
+
+    def _parse_section(self, mf, mt, block, read_section, section_class, **kwargs):
+        """Function to read and parse one block of a section, recording it
+        in the metrics if there are any
+
+        Returns
+        -------
+        object
+            the section, parsed with section_class
+        """
+
+        if self.metrics is None:
+            return section_class(read_section(mt, block), **kwargs)
+
+        return self.metrics.measure(
+            self.filename,
+            self.material_number,
+            mf,
+            mt,
+            block,
+            lambda: read_section(mt, block),
+            lambda text: section_class(text, **kwargs),
+        )
+
+    def at_temperature(self, index):
+        """Function to get the values at one temperature
+
+        Parameters
+        ----------
+        index : int
+            the index of the temperature in ``temperatures``
+
+        Returns
+        -------
+        GrouprOutput object
+            the values at that temperature, without a temperature axis.
+            Every section is parsed, and the arrays are views of this
+            object's arrays.
+        """
+
+        if len(self.temperatures) == 1:
+            if index not in [0, -1]:
+                raise IndexError(f"There is only one temperature in {self.filename}")
+            return self
+
+        obj = copy.copy(self)
+        obj.temperatures = self.temperatures[index : index + 1 or None]
+        obj._number_blocks = 1
+        obj.eager = True
+        for name in SECTION_ATTRIBUTES:
+            if hasattr(self, name):
+                sections = {
+                    mt: select_temperature(section, index)
+                    for mt, section in getattr(self, name).items()
+                }
+                setattr(obj, name, sections)
+        return obj
+
+    def at_sigma0(self, index):
+        """Function to get the values at one sigma0 value
+
+        Parameters
+        ----------
+        index : int
+            the index of the sigma0 value in ``sigma0_values``
+
+        Returns
+        -------
+        GrouprOutput object
+            the values at that sigma0 value, without a sigma0 axis. Every
+            section is parsed, and the arrays are views of this object's
+            arrays.
+        """
+
+        sigma0_values = self.sigma0_values
+        if len(sigma0_values) == 1:
+            if index not in [0, -1]:
+                raise IndexError(f"There is only one sigma0 value in {self.filename}")
+            return self
+
+        obj = copy.copy(self)
+        obj._energy_boundaries = copy.copy(self._energy_boundaries)
+        obj._energy_boundaries.sigma0 = sigma0_values[index]
+        obj.eager = True
+        temperature_axis = len(self.temperatures) > 1
+        for name in SECTION_ATTRIBUTES:
+            if hasattr(self, name):
+                sections = {
+                    mt: select_sigma0(section, index, temperature_axis)
+                    for mt, section in getattr(self, name).items()
+                }
+                setattr(obj, name, sections)
+        return obj
+
+    def collapse(self, energy_boundaries, weights=None):
+        """Function to collapse the values to a coarser group structure
+
+        The coarse group boundaries must all be boundaries of this group
+        structure. Cross sections are averaged over the fine groups of each
+        coarse group with the flux of each section, and nubar (MT452) with
+        the flux times the fission cross section. Outgoing distributions are
+        summed over the fine groups. Every Legendre order of the scattering
+        matrices is averaged over the incoming fine groups with the scalar
+        flux and summed over the outgoing fine groups. The flux values are
+        summed.
+
+        Parameters
+        ----------
+        energy_boundaries : list or np.array of floats
+            the coarse group boundaries in eV, in increasing order
+
+        weights : np.array of floats, optional, default is None
+            a weighting spectrum with one value for each fine group, which
+            is used instead of the flux of each section
+
+        Returns
+        -------
+        GrouprOutput object
+            the collapsed values, with every section parsed
+        """
+
+        positions = collapse_positions(self.energy_boundaries, energy_boundaries)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != (len(self.energy_boundaries) - 1,):
+                raise ValueError(f"There must be one weight for each group")
+
+        def section_weights(flux_values):
+            if weights is None:
+                return flux_values
+            return np.broadcast_to(weights, np.shape(flux_values))
+
+        obj = copy.copy(self)
+        obj.eager = True
+        obj._energy_boundaries = copy.copy(self._energy_boundaries)
+        obj._energy_boundaries.energy_boundaries = self.energy_boundaries[positions]
+        obj._energy_boundaries.number_groups = len(positions) - 1
+
+        fission = self.pointwise[18].values if 18 in self.pointwise else None
+        pointwise = {}
+        for mt, section in self.pointwise.items():
+            section_weight = section_weights(section.flux_values)
+            if mt == 452 and fission is not None:
+                section_weight = section_weight * fission
+            pointwise[mt] = collapse_pointwise(section, positions, section_weight)
+        obj.pointwise = pointwise
+
+        if hasattr(self, "outgoing_distributions"):
+            obj.outgoing_distributions = {
+                mt: collapse_outgoing(section, positions)
+                for mt, section in self.outgoing_distributions.items()
+            }
+
+        if hasattr(self, "scattering_matrices"):
+            obj.scattering_matrices = {
+                mt: collapse_matrix(
+                    section, positions, section_weights(section.flux_values[..., 0])
+                )
+                for mt, section in self.scattering_matrices.items()
+            }
+
+        return obj
+
+    def save(self, directory):
+        """Function to save the parsed values into a directory, with the
+        arrays in one binary file and a JSON manifest, which can be read
+        back with GrouprOutput.load. Every section is parsed first.
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path object
+            the directory to write, which is created if needed
+
+        Returns
+        -------
+        None
+        """
+
+        from groupy import __version__
+
+        arrays = []
+        manifest = {
+            "groupy_version": __version__,
+            "filename": str(self.filename),
+            "title": self.title,
+            "material_number": int(self.material_number),
+            "sparse": self.sparse,
+            "temperatures": save_value(self.temperatures, arrays),
+            "energy_boundaries": save_value(self._energy_boundaries, arrays),
+        }
+        for name in SECTION_ATTRIBUTES:
+            if hasattr(self, name):
+                manifest[name] = {
+                    str(mt): save_value(section, arrays)
+                    for mt, section in getattr(self, name).items()
+                }
+
+        write_archive(manifest, arrays, directory)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Function to load values saved with GrouprOutput.save
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path object
+            the directory written by GrouprOutput.save
+
+        mmap : bool, optional, default is True
+            If true, the arrays are memory-mapped read-only instead of
+            read into memory
+
+        Returns
+        -------
+        GrouprOutput object
+            the saved values, with dictionaries of sections
+        """
+
+        manifest, arrays = read_archive(directory, mmap=mmap)
+
+        obj = cls.__new__(cls)
+        obj.filename = Path(manifest["filename"])
+        obj.title = manifest["title"]
+        obj.material_number = manifest["material_number"]
+        obj.sparse = manifest["sparse"]
+        obj.eager = True
+        obj.backend = "archive"
+        obj.metrics = None
+        obj.temperatures = load_value(manifest["temperatures"], arrays)
+        obj._number_blocks = len(obj.temperatures)
+        obj._energy_boundaries = load_value(manifest["energy_boundaries"], arrays)
+        for name in SECTION_ATTRIBUTES:
+            if name in manifest:
+                sections = {
+                    int(mt): load_value(entry, arrays)
+                    for mt, entry in manifest[name].items()
+                }
+                setattr(obj, name, sections)
+
+        return obj
+
+    def write_to_csv(
+        self, title=None, directory=None, verbose=False, legendre_orders=None
+    ):
         """Function to write the grouped values into CSV files. When a reaction
         is not available in the evaluation, zeros are printed.
 
@@ -104,13 +635,19 @@ class GrouprOutput:
 
         If MT51-91 are present, they will be summed to give MT4.
 
+        When there is more than one temperature, the files for each
+        temperature are written with "_{temperature}K" added to the title,
+        and when there is more than one sigma0 value, the files for each
+        sigma0 value are written with "_{sigma0}b" added to the title.
+
         All of the pointwise values are written into {title}_pointwise.csv, with
             the MT values as the column headers.
         All of the outgoing distributions are written into {title}_outgoing.csv,
             with the MT values as the column headers.
         Each of the scattering matrices are written to individual files,
-            {title}_scattering_matrix_{mt}_{ell}.csv, with the energy boundaries
-            as the row and column headers.
+            {title}_scattering_matrix_{mt}.csv for ell=0 and
+            {title}_scattering_matrix_{mt}_{ell}.csv for higher orders, with
+            the energy boundaries as the row and column headers.
 
         Parameters
         ----------
@@ -124,38 +661,91 @@ class GrouprOutput:
         verbose : bool, optional, default is False
             If true, will print the files names as they are created
 
+        legendre_orders : list of ints, optional, default is None
+            the Legendre orders of the scattering matrices to write. Default
+            is None, which only writes ell=0.
+
         Returns
         -------
         None
 
         """
 
-        pointwise_mts = [1, 18, 452]
-        distribution_mts = [18]
-        scattering_mts = [
-            2,
-            4,
-            11,
-            16,
-            17,
-            22,
-            23,
-            24,
-            25,
-            28,
-            29,
-            30,
-            32,
-            33,
-            34,
-            35,
-            36,
-            37,
-            41,
-            42,
-            44,
-            45,
-        ]
+        self.write_tables(title, directory, "csv", legendre_orders, verbose)
+
+    def write_tables(
+        self,
+        title=None,
+        directory=None,
+        format="csv",
+        legendre_orders=None,
+        verbose=False,
+    ):
+        """Function to write the tables of write_to_csv as CSV or binary
+        .npy files
+
+        The tables are the same for both formats. The .npy files have no
+        header, so the columns of the pointwise and outgoing tables are the
+        energy boundaries and then the MT's in the order listed in
+        write_to_csv.
+
+        Parameters
+        ----------
+        title : string, optional, default is None
+            title for the files. Default is None, in which case the object
+            title attribute will be used (with spaces removed)
+
+        directory : string, optional, default is None
+            path of the directory where the files should be written
+
+        format : {"csv", "npy"}, optional, default is "csv"
+            the file format
+
+        legendre_orders : list of ints, optional, default is None
+            the Legendre orders of the scattering matrices to write. Default
+            is None, which only writes ell=0.
+
+        verbose : bool, optional, default is False
+            If true, will print the files names as they are created
+
+        Returns
+        -------
+        None
+        """
+
+        if format not in ["csv", "npy"]:
+            raise ValueError(f"Unknown table format {format}")
+
+        # write the values at each temperature separately
+        if len(self.temperatures) > 1:
+            if title is None:
+                title = self.title.replace(" ", "")
+            for index, temperature in enumerate(self.temperatures):
+                self.at_temperature(index).write_tables(
+                    f"{title}_{temperature:g}K",
+                    directory,
+                    format,
+                    legendre_orders,
+                    verbose,
+                )
+            return
+
+        # and at each sigma0 value separately
+        if len(self.sigma0_values) > 1:
+            if title is None:
+                title = self.title.replace(" ", "")
+            for index, sigma0 in enumerate(self.sigma0_values):
+                self.at_sigma0(index).write_tables(
+                    f"{title}_{sigma0:g}b",
+                    directory,
+                    format,
+                    legendre_orders,
+                    verbose,
+                )
+            return
+
+        if legendre_orders is None:
+            legendre_orders = [0]
 
         # create file title
         if title is None:
@@ -166,93 +756,84 @@ class GrouprOutput:
         if directory is not None:
             stem = f"{directory}/{stem}"
 
+        def write(name, table, header=None):
+            filename = Path(f"{stem}{name}.{format}")
+            if verbose:
+                print(f"Writing {filename}")
+            if format == "csv":
+                write_csv(filename, table, header)
+            else:
+                np.save(filename, table)
+
         # pointwise
-        filename = Path(f"{stem}pointwise.csv")
+        table = pointwise_table(self.pointwise, self.energy_boundaries, POINTWISE_MTS)
+        write(
+            "pointwise", table, "Energy" + "".join(f",MT{mt}" for mt in POINTWISE_MTS)
+        )
 
-        header = "Energy"
-        array = np.array(self.energy_boundaries).reshape(
-            (len(self.energy_boundaries), 1)
+        # distributions
+        distributions = getattr(self, "outgoing_distributions", {})
+        table = pointwise_table(distributions, self.energy_boundaries, DISTRIBUTION_MTS)
+        write(
+            "outgoing",
+            table,
+            "Energy" + "".join(f",MT{mt}" for mt in DISTRIBUTION_MTS),
         )
-        for mt in pointwise_mts:
-            header += f",MT{mt}"
-            if mt in self.pointwise.keys():
-                array = np.hstack(
-                    [
-                        array,
-                        np.append(self.pointwise[mt].values, 0).reshape(
-                            (len(self.energy_boundaries), 1)
-                        ),
-                    ]
-                )
-            elif mt == 4:
-                total_inel = np.zeros(len(self.energy_boundaries))
-                for partial_mt in range(51, 92):
-                    if partial_mt in self.pointwise.keys():
-                        total_inel[:-1] += self.pointwise[partial_mt].values
-
-                array = np.hstack(
-                    [
-                        array,
-                        total_inel.reshape((len(self.energy_boundaries), 1)),
-                    ]
-                )
-            else:
-                array = np.hstack([array, np.zeros((len(self.energy_boundaries), 1))])
 
-        if verbose:
-            print(f"\nWriting pointwise data to {filename}")
-        np.savetxt(filename, array, delimiter=",", header=header)
+        # scattering matrices, where the missing ones all share one table
+        matrices = getattr(self, "scattering_matrices", {})
+        empty = None
+        for mt in SCATTERING_MTS:
+            for ell in legendre_orders:
+                name = f"scattering_matrix_{mt}" + (f"_{ell}" if ell > 0 else "")
+                if mt in matrices or (
+                    mt == 4 and any(partial in matrices for partial in INELASTIC_MTS)
+                ):
+                    table = scattering_table(matrices, self.energy_boundaries, mt, ell)
+                else:
+                    if empty is None:
+                        empty = scattering_table({}, self.energy_boundaries, mt)
+                    table = empty
+                write(name, table)
+
+    def write_to_npz(self, filename, compressed=False):
+        """Function to write every section into one binary .npz file
+
+        The file has the arrays "temperatures", "sigma0_values" and
+        "energy_boundaries", and "{name}_{mt}_values" and
+        "{name}_{mt}_flux_values" for each section (the outgoing
+        distributions have no flux values), where the name is
+        pointwise, outgoing_distributions or scattering_matrices. The values
+        are dense arrays with the same axes as the section values, and
+        every Legendre order of the scattering matrices is kept.
 
-        # distributions
-        filename = Path(f"{stem}outgoing.csv")
+        Parameters
+        ----------
+        filename : str or pathlib.Path object
+            the .npz file
 
-        header = "Energy"
-        array = np.array(self.energy_boundaries).reshape(
-            (len(self.energy_boundaries), 1)
-        )
-        for mt in distribution_mts:
-            header += f",MT{mt}"
-            if (
-                hasattr(self, "outgoing_distributions")
-                and mt in self.outgoing_distributions.keys()
-            ):
-                array = np.hstack(
-                    [
-                        array,
-                        np.append(self.outgoing_distributions[mt].values, 0).reshape(
-                            (len(self.energy_boundaries), 1)
-                        ),
-                    ]
-                )
-            else:
-                array = np.hstack([array, np.zeros((len(self.energy_boundaries), 1))])
-
-        if verbose:
-            print(f"\nWriting outgoing energy distribution data to {filename}")
-        np.savetxt(filename, array, delimiter=",", header=header)
-
-        # scattering matrices
-        for mt in scattering_mts:
-            filename = Path(f"{stem}scattering_matrix_{mt}.csv")
-            array = np.zeros(
-                (
-                    len(self.energy_boundaries) + 1,
-                    len(self.energy_boundaries) + 1,
-                )
-            )
-            array[1:, 0] = self.energy_boundaries
-            array[0, 1:] = self.energy_boundaries
-            if hasattr(self, "scattering_matrices"):
-                if mt in self.scattering_matrices.keys():
-                    array[1:-1, 1:-1] = self.scattering_matrices[mt].values[:, :, 0]
-                elif mt == 4:
-                    for partial_mt in range(51, 92):
-                        if partial_mt in self.scattering_matrices.keys():
-                            array[1:-1, 1:-1] += self.scattering_matrices[
-                                partial_mt
-                            ].values[:, :, 0]
+        compressed : bool, optional, default is False
+            If true, the arrays are compressed
 
-            if verbose:
-                print(f"Writing MT{mt} ell=0 scattering matrix to {filename}")
+        Returns
+        -------
+        None
+        """
 
-            np.savetxt(filename, array, delimiter=",")
+        arrays = {
+            "temperatures": np.atleast_1d(self.temperatures),
+            "sigma0_values": self.sigma0_values,
+            "energy_boundaries": self.energy_boundaries,
+        }
+        for name in SECTION_ATTRIBUTES:
+            for mt, section in getattr(self, name, {}).items():
+                arrays[f"{name}_{mt}_values"] = dense_values(section.values)
+                if hasattr(section, "flux_values"):
+                    arrays[f"{name}_{mt}_flux_values"] = dense_values(
+                        section.flux_values
+                    )
+
+        if compressed:
+            np.savez_compressed(filename, **arrays)
+        else:
+            np.savez(filename, **arrays)
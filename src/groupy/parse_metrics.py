@@ -0,0 +1,322 @@
+import csv
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+import numpy as np
+from groupy.base._banded_matrix import BandedMatrix
+from groupy.base._gendf_tape import LINE_WIDTH
+
+SectionMetrics = namedtuple(
+    "SectionMetrics",
+    [
+        "filename",
+        "mat",
+        "mf",
+        "mt",
+        "block",
+        "lines",
+        "bytes",
+        "read_time",
+        "decode_time",
+        "array_bytes",
+        "peak_memory",
+    ],
+)
+SectionMetrics.__doc__ = """the metrics of parsing one section
+
+read_time is the time to get the text of the section from the file, and
+decode_time the time to parse it. array_bytes is the size of the values
+and flux values. peak_memory is the most memory allocated while it was
+parsed, or None if memory was not traced."""
+
+LoadMetrics = namedtuple("LoadMetrics", ["filename", "backend", "load_time"])
+LoadMetrics.__doc__ = """the time to open and index one file"""
+
+
+class ParseMetrics:
+    """Class to record how long each section of a GENDF file takes to parse,
+    and how big it is
+
+    A ParseMetrics object is given to GrouprOutput (or GrouprLibrary), and
+    a record is added for every section that is parsed, and for every file
+    that is opened. One object can be shared by many files, such as all of
+    the files of a library, and by several threads. The timing only adds a
+    few clock reads to each section, so it can be left on; tracing the
+    memory with tracemalloc is much slower, and is off by default.
+
+    Parameters
+    ----------
+    callback : callable, optional, default is None
+        a function that is called with each SectionMetrics record as it is
+        made
+
+    trace_memory : bool, optional, default is False
+        If true, tracemalloc is started (if it is not already tracing) and
+        the peak memory of parsing each section is recorded. The peak is
+        for the whole process, so it is only meaningful when one section is
+        parsed at a time. Tracing is stopped by close(), or at the end of a
+        with block.
+
+    Attributes
+    ----------
+    sections : list of SectionMetrics
+        the record of each parsed section, in the order they were parsed
+
+    loads : list of LoadMetrics
+        the time to open and index each file
+
+    Methods
+    -------
+    measure
+        Function to read and parse one section, and record it
+
+    record_load
+        Function to record the time to open a file
+
+    to_records
+        Function to get the section records as dictionaries
+
+    table
+        Function to format the section records as a text table
+
+    write_csv
+        Function to write the section records to a CSV file
+
+    close
+        Function to stop tracing memory, if this object started it
+
+    """
+
+    def __init__(self, callback=None, trace_memory=False):
+
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.sections = []
+        self.loads = []
+        self._lock = threading.Lock()
+
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def total_time(self):
+        return sum(record.read_time + record.decode_time for record in self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __iter__(self):
+        return iter(list(self.sections))
+
+    def measure(self, filename, mat, mf, mt, block, read_section, parse_section):
+        """Function to read and parse one section, and record it
+
+        Parameters
+        ----------
+        filename : pathlib.Path object
+            the GENDF file
+
+        mat, mf, mt : int
+            the material, file and section numbers
+
+        block : int
+            the block (temperature) of the material
+
+        read_section : callable
+            function with no arguments that returns the text of the section
+
+        parse_section : callable
+            function that parses the text of the section
+
+        Returns
+        -------
+        object
+            the parsed section
+        """
+
+        start = time.perf_counter()
+        text = read_section()
+        read = time.perf_counter()
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            read = time.perf_counter()
+
+        section = parse_section(text)
+        stop = time.perf_counter()
+
+        peak_memory = None
+        if tracing:
+            peak_memory = max(tracemalloc.get_traced_memory()[1] - current, 0)
+
+        lines, size = _text_size(text)
+        record = SectionMetrics(
+            str(filename),
+            int(mat),
+            int(mf),
+            int(mt),
+            int(block),
+            lines,
+            size,
+            read - start,
+            stop - read,
+            _array_bytes(getattr(section, "values", None))
+            + _array_bytes(getattr(section, "flux_values", None)),
+            peak_memory,
+        )
+        with self._lock:
+            self.sections.append(record)
+        if self.callback is not None:
+            self.callback(record)
+        return section
+
+    def record_load(self, filename, backend, load_time):
+        """Function to record the time to open a file
+
+        Parameters
+        ----------
+        filename : pathlib.Path object
+            the GENDF file
+
+        backend : str
+            the reader, "native" or "endftk"
+
+        load_time : float
+            the number of seconds to open and index the file
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            self.loads.append(LoadMetrics(str(filename), backend, load_time))
+
+    def close(self):
+        """Function to stop tracing memory, if this object started it
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def to_records(self):
+        """Function to get the section records as dictionaries
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        list of dicts
+            the records, keyed by the SectionMetrics field names
+        """
+
+        return [record._asdict() for record in self]
+
+    def table(self, sort="decode_time", limit=None):
+        """Function to format the section records as a text table
+
+        Parameters
+        ----------
+        sort : str, optional, default is "decode_time"
+            the field to sort by, largest first. None keeps the order the
+            sections were parsed in.
+
+        limit : int, optional, default is None
+            the number of rows to show. Default is None, which shows all of
+            them.
+
+        Returns
+        -------
+        str
+            the table
+        """
+
+        records = list(self)
+        if sort is not None:
+            if sort not in SectionMetrics._fields:
+                raise ValueError(f"Can't sort by {sort}")
+            records.sort(key=lambda record: getattr(record, sort) or 0, reverse=True)
+        records = records[:limit]
+
+        lines = [
+            f"{'MAT':>5} {'MF':>3} {'MT':>4} {'block':>5} {'lines':>8} "
+            f"{'read (ms)':>10} {'decode (ms)':>12} {'arrays (kB)':>12} "
+            f"{'peak (kB)':>10}"
+        ]
+        for record in records:
+            peak = ""
+            if record.peak_memory is not None:
+                peak = f"{record.peak_memory / 1024:.1f}"
+            lines.append(
+                f"{record.mat:5d} {record.mf:3d} {record.mt:4d} {record.block:5d} "
+                f"{record.lines:8d} {1e3 * record.read_time:10.3f} "
+                f"{1e3 * record.decode_time:12.3f} {record.array_bytes / 1024:12.1f} "
+                f"{peak:>10}"
+            )
+        return "\n".join(lines)
+
+    def write_csv(self, filename):
+        """Function to write the section records to a CSV file, with a
+        column for each SectionMetrics field
+
+        Parameters
+        ----------
+        filename : str or pathlib.Path object
+            the CSV file
+
+        Returns
+        -------
+        None
+        """
+
+        with open(filename, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SectionMetrics._fields)
+            writer.writeheader()
+            writer.writerows(self.to_records())
+
+
+def _text_size(text):
+    """Function to count the lines and bytes of the text of a section,
+    which is a memoryview of the file or a list of lines"""
+
+    if isinstance(text, memoryview):
+        return text.nbytes // (LINE_WIDTH + 1), text.nbytes
+    if isinstance(text, (bytes, str)):
+        return text.count("\n" if isinstance(text, str) else b"\n"), len(text)
+    return len(text), sum(len(line) + 1 for line in text)
+
+
+def _array_bytes(value):
+    """Function to get the size of section values, which are an array, a
+    BandedMatrix or a list of them"""
+
+    if value is None:
+        return 0
+    if isinstance(value, list):
+        return sum(_array_bytes(item) for item in value)
+    if isinstance(value, BandedMatrix):
+        return (
+            value.data.nbytes + value.row_pointers.nbytes + value.first_columns.nbytes
+        )
+    return np.asarray(value).nbytes
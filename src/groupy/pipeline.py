@@ -0,0 +1,522 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from groupy.cache import file_hash
+from groupy.njoy import (
+    write_reconr_input,
+    write_broadr_input,
+    write_groupr_input,
+    _njoy_materials,
+    _write_tape,
+    _run_process,
+)
+from groupy.library import read_groupr_output
+
+
+class Stage:
+    """Class for one NJOY stage: an input deck, the tapes it reads and the
+    tape it makes
+
+    A stage is kept in ``directory/kind/key``, where the key is the hash of
+    its input deck, its input tapes and the key of the stage it depends on,
+    so stages with identical inputs share one directory.
+
+    Parameters
+    ----------
+    kind : str
+        the NJOY module of the stage - reconr, broadr or groupr
+
+    directory : pathlib.Path object
+        the directory for the stage directories
+
+    njoy_input : str
+        the text for the input file
+
+    product : str
+        the name of the tape the stage makes
+
+    tapes : dict, optional, default is None
+        the tapes copied into the stage, keyed by tape name
+
+    dependency : Stage object, optional, default is None
+        the stage whose product is linked into this stage
+
+    key_parts : tuple of str, optional, default is ()
+        other strings that identify the inputs of the stage, such as the
+        hash of the ENDF file
+
+    Attributes
+    ----------
+    key : str
+        the hash of the inputs of the stage
+
+    path : pathlib.Path object
+        the stage directory
+
+    product_file : pathlib.Path object
+        the tape made by the stage
+
+    done : bool
+        whether or not the stage has already been run
+
+    wall_time : float or None
+        the number of seconds NJOY took to run the stage, if known
+
+    metrics : NjoyRunMetrics object or None
+        the module times and resource use of the run, if the stage was run
+        by this object
+
+    Methods
+    -------
+    run
+        Function to run the stage
+    """
+
+    def __init__(
+        self,
+        kind,
+        directory,
+        njoy_input,
+        product,
+        tapes=None,
+        dependency=None,
+        key_parts=(),
+    ):
+
+        self.kind = kind
+        self.njoy_input = njoy_input
+        self.product = product
+        self.tapes = tapes or {}
+        self.dependency = dependency
+        self.metrics = None
+
+        dependency_key = "" if dependency is None else dependency.key
+        self.key = _hash(kind, dependency_key, *key_parts, njoy_input)
+        self.path = Path(directory) / kind / self.key
+
+    @property
+    def product_file(self):
+        return self.path / self.product
+
+    @property
+    def done(self):
+        return self.product_file.exists()
+
+    @property
+    def wall_time(self):
+        try:
+            return float((self.path / "wall_time").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def run(self, timeout=None):
+        """Function to run the stage in a temporary directory, then move the
+        input, the NJOY output, the wall time and the product tape into the
+        stage directory, so that a stage directory is only ever complete.
+        The product of the dependency is linked into the directory rather
+        than copied.
+
+        Parameters
+        ----------
+        timeout : float, optional, default is None
+            the number of seconds to wait for NJOY before it is killed
+
+        Returns
+        -------
+        float
+            the number of seconds NJOY took to run
+        """
+
+        if self.dependency is not None and not self.dependency.done:
+            raise RuntimeError(f"{self.dependency.path} has not been run")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = Path(tempfile.mkdtemp(dir=self.path.parent, prefix=".partial-"))
+        try:
+            (temporary / "input").write_text(self.njoy_input)
+            for name, source in self.tapes.items():
+                _write_tape(source, temporary / name)
+            if self.dependency is not None:
+                _write_tape(
+                    self.dependency.product_file, temporary / self.dependency.product
+                )
+
+            self.metrics = _run_process(temporary, self.njoy_input, timeout)
+            wall_time = self.metrics.wall_time
+            if not (temporary / self.product).exists():
+                raise RuntimeError(f"NJOY did not write {self.product} for {self.path}")
+
+            for path in temporary.iterdir():
+                if path.name not in ["input", "output", self.product]:
+                    path.unlink()
+            (temporary / "wall_time").write_text(f"{wall_time!r}\n")
+            try:
+                os.replace(temporary, self.path)
+            except OSError:
+                # another run finished the same stage first
+                pass
+        finally:
+            shutil.rmtree(temporary, ignore_errors=True)
+
+        return wall_time
+
+
+class NjoyPipeline:
+    """Class to run NJOY in stages for one evaluation, so that the
+    broadened PENDF file is made once and shared by many GROUPR runs
+
+    The reconr stage is run once for the reconr tolerance, and the broadr
+    stage once for the temperatures and the broadr tolerance, and their
+    PENDF files are kept in ``directory/reconr`` and ``directory/broadr``.
+    Each GROUPR stage only runs groupr against the broadened PENDF file, in
+    its own directory in ``directory/groupr``. Stage directories are named
+    by the hash of their inputs, so a stage that was already run (by this
+    pipeline or an earlier one) is not run again.
+
+    Parameters
+    ----------
+    endf6_file : str or pathlib.Path object
+        the ENDF6-formatted file
+
+    directory : str or pathlib.Path object, optional, default is '.'
+        the directory for the stage directories
+
+    temperature : float or list, optional, default is 293 K
+        the temperature of the run in K, or a list of temperatures
+
+    reconr_tolerance : float, optional, default is 0.001
+        the tolerance for the reconr module
+
+    broadr_tolerance : float, optional, default is 0.001
+        the tolerance for the broader module
+
+    timeout : float, optional, default is None
+        the number of seconds to wait for each NJOY run before it is killed
+
+    verbose : bool, optional, default is False
+        If true, extra information will be printed to the screen
+
+    Attributes
+    ----------
+    material_number : int or list of ints
+        the material number of the evaluation, or the number of each
+        material when the ENDF file has several
+
+    pendf_key : str
+        the hash of the ENDF file and the reconr and broadr inputs
+
+    Methods
+    -------
+    pendf
+        Function to get the broadened PENDF file, running reconr and broadr
+        if needed
+
+    groupr
+        Function to run GROUPR against the shared PENDF file
+
+    groupr_many
+        Function to run several GROUPR stages in parallel
+
+    """
+
+    def __init__(
+        self,
+        endf6_file,
+        directory=".",
+        temperature=293,
+        reconr_tolerance=0.001,
+        broadr_tolerance=0.001,
+        timeout=None,
+        verbose=False,
+    ):
+
+        self.endf6_file = Path(endf6_file).absolute()
+        self.directory = Path(directory).absolute()
+        self.temperature = temperature
+        self.reconr_tolerance = reconr_tolerance
+        self.broadr_tolerance = broadr_tolerance
+        self.timeout = timeout
+        self.verbose = verbose
+
+        # every material on the tape is processed in each stage
+        self.material_number, self.has_nubar, self.has_pfns = _njoy_materials(
+            self.endf6_file, verbose
+        )
+
+        reconr = _reconr_stage(
+            self.directory,
+            self.endf6_file,
+            file_hash(self.endf6_file),
+            self.material_number,
+            reconr_tolerance,
+        )
+        self._broadr = _broadr_stage(
+            self.directory,
+            reconr,
+            self.endf6_file,
+            self.material_number,
+            temperature,
+            broadr_tolerance,
+        )
+        self.pendf_key = self._broadr.key
+        self._pendf_lock = threading.Lock()
+
+    @property
+    def pendf_file(self):
+        return self._broadr.product_file
+
+    def pendf(self):
+        """Function to get the broadened PENDF file, running reconr and
+        broadr if needed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        pathlib.Path object
+            the PENDF file
+        """
+
+        with self._pendf_lock:
+            for stage in [self._broadr.dependency, self._broadr]:
+                if not stage.done:
+                    if self.verbose:
+                        print(f"Running {stage.kind} for {self.material_number}")
+                    stage.run(self.timeout)
+                elif self.verbose:
+                    print(f"Using the {stage.kind} output in {stage.path}")
+
+        return self.pendf_file
+
+    def groupr_input(
+        self,
+        title,
+        group_boundaries=2,
+        flux=5,
+        legendre_order=1,
+        sigma0=1e10,
+    ):
+        """Function to create the groupr input for one GROUPR stage
+
+        Parameters
+        ----------
+        title : str
+            the run title
+
+        group_boundaries : int or list
+            The group boundaries to use. If an integer, it represents ign in
+            the NJOY input. If a list, it is the energy boundaries in eV.
+
+        flux : int, optional, default is 5
+            The weighting flux to use - the iwt value in the NJOY input.
+
+        legendre_order : int, optional, default is 1
+            the order to reconstruct the angular distributions
+
+        sigma0 : float or list, optional, default is 1e10
+            the sigma0 value in barns, or a list of values
+
+        Returns
+        -------
+        str
+            the text for the input file
+        """
+
+        return write_groupr_input(
+            self.material_number,
+            title,
+            self.temperature,
+            group_boundaries,
+            flux,
+            self.has_nubar,
+            self.has_pfns,
+            legendre_order,
+            sigma0,
+        )
+
+    def groupr_stage(
+        self,
+        title,
+        group_boundaries=2,
+        flux=5,
+        legendre_order=1,
+        sigma0=1e10,
+    ):
+        """Function to get the stage for one GROUPR run, without running it
+
+        Parameters
+        ----------
+        title : str
+            the run title
+
+        group_boundaries : int or list
+            The group boundaries to use. If an integer, it represents ign in
+            the NJOY input. If a list, it is the energy boundaries in eV.
+
+        flux : int, optional, default is 5
+            The weighting flux to use - the iwt value in the NJOY input.
+
+        legendre_order : int, optional, default is 1
+            the order to reconstruct the angular distributions
+
+        sigma0 : float or list, optional, default is 1e10
+            the sigma0 value in barns, or a list of values
+
+        Returns
+        -------
+        Stage object
+            the GROUPR stage, which depends on the broadr stage
+        """
+
+        return _groupr_stage(
+            self._broadr,
+            self.endf6_file,
+            self.groupr_input(title, group_boundaries, flux, legendre_order, sigma0),
+        )
+
+    def groupr(
+        self,
+        title=None,
+        group_boundaries=2,
+        flux=5,
+        legendre_order=1,
+        sigma0=1e10,
+        sparse=False,
+    ):
+        """Function to run GROUPR against the shared PENDF file
+
+        Parameters
+        ----------
+        title : str, optional, default is None
+            the run title. Default is None, which uses the name of the ENDF
+            file.
+
+        group_boundaries : int or list
+            The group boundaries to use. If an integer, it represents ign in
+            the NJOY input. If a list, it is the energy boundaries in eV.
+
+        flux : int, optional, default is 5
+            The weighting flux to use - the iwt value in the NJOY input.
+
+        legendre_order : int, optional, default is 1
+            the order to reconstruct the angular distributions
+
+        sigma0 : float or list, optional, default is 1e10
+            the sigma0 value in barns, or a list of values
+
+        sparse : bool, optional, default is False
+            If true, the scattering matrices are stored as BandedMatrix
+            objects
+
+        Returns
+        -------
+        GrouprOutput object or GrouprLibrary object
+            the data parsed from the GROUPR stage, with a GrouprLibrary
+            when the ENDF file has several materials
+        """
+
+        if title is None:
+            title = self.endf6_file.stem
+
+        stage = self.groupr_stage(title, group_boundaries, flux, legendre_order, sigma0)
+
+        if not stage.done:
+            self.pendf()
+            if self.verbose:
+                print(f"Running groupr in {stage.path}")
+            stage.run(self.timeout)
+        elif self.verbose:
+            print(f"Using the GROUPR output in {stage.path}")
+
+        return read_groupr_output(stage.product_file, sparse)
+
+    def groupr_many(self, options, max_workers=None, sparse=False):
+        """Function to run several GROUPR stages in parallel against the
+        shared PENDF file
+
+        Parameters
+        ----------
+        options : list of dicts
+            the keyword arguments of groupr (title, group_boundaries, flux,
+            legendre_order, sigma0) for each stage
+
+        max_workers : int, optional, default is None
+            the number of NJOY processes to run at once. Default is None,
+            which uses the ThreadPoolExecutor default.
+
+        sparse : bool, optional, default is False
+            If true, the scattering matrices are stored as BandedMatrix
+            objects
+
+        Returns
+        -------
+        list of GrouprOutput or GrouprLibrary objects
+            the data parsed from each GROUPR stage, in the order of options
+        """
+
+        # make the PENDF file before the GROUPR stages start waiting on it
+        self.pendf()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.groupr, sparse=sparse, **option_set)
+                for option_set in options
+            ]
+            return [future.result() for future in futures]
+
+
+def _reconr_stage(directory, endf6_file, endf_hash, mat, tolerance):
+    """Function to make the reconr stage of an evaluation"""
+
+    return Stage(
+        "reconr",
+        directory,
+        write_reconr_input(mat, "pendf", tolerance),
+        "tape21",
+        tapes={"tape20": endf6_file},
+        key_parts=(endf_hash,),
+    )
+
+
+def _broadr_stage(directory, reconr, endf6_file, mat, temperature, tolerance):
+    """Function to make the broadr stage that broadens the PENDF file of a
+    reconr stage"""
+
+    return Stage(
+        "broadr",
+        directory,
+        write_broadr_input(mat, "pendf", temperature, tolerance),
+        "tape22",
+        tapes={"tape20": endf6_file},
+        dependency=reconr,
+    )
+
+
+def _groupr_stage(broadr, endf6_file, njoy_input):
+    """Function to make a groupr stage that reads the PENDF file of a broadr
+    stage"""
+
+    return Stage(
+        "groupr",
+        broadr.path.parent.parent,
+        njoy_input,
+        "tape91",
+        tapes={"tape20": endf6_file},
+        dependency=broadr,
+    )
+
+
+def _hash(*parts):
+    """Function to hash strings into a stage key"""
+
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
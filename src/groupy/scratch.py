@@ -0,0 +1,177 @@
+import contextlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# every scratch directory starts with this, so stale ones can be found
+PREFIX = "groupy-"
+
+
+class ScratchSpace:
+    """Class to give each NJOY run its own scratch directory, and clean it
+    up when the run is done
+
+    NJOY is run in a new directory inside ``root``, and when it finishes
+    only the files in ``keep`` are moved into the run directory; the
+    intermediate tapes (tape20, tape21, ...) are removed with the scratch
+    directory. A root on a memory file system, like "/dev/shm", keeps the
+    intermediate tapes off the disk altogether.
+
+    Parameters
+    ----------
+    root : str or pathlib.Path object, optional, default is None
+        the directory the scratch directories are made in. Default is None,
+        which uses the system temporary directory.
+
+    keep : list of str, optional, default is None
+        the files that are moved into the run directory after each run.
+        Default is None, which keeps "output" and "tape91".
+
+    keep_failed : bool, optional, default is False
+        If true, every file of a run that fails, including the
+        intermediate tapes, is moved into the run directory, to debug it
+
+    Attributes
+    ----------
+    root : pathlib.Path object
+        the directory the scratch directories are made in
+
+    Methods
+    -------
+    create
+        Function to make a new scratch directory
+
+    finish
+        Function to move the kept files out of a scratch directory, and
+        remove it
+
+    run
+        Context manager that gives a scratch directory for one run
+
+    clean
+        Function to remove scratch directories left behind by runs that
+        were killed
+
+    """
+
+    # the NJOY files that are kept by default
+    files = ["output", "tape91"]
+
+    def __init__(self, root=None, keep=None, keep_failed=False):
+
+        self.root = Path(tempfile.gettempdir() if root is None else root)
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"The scratch root {self.root} does not exist")
+        self.keep = list(self.files if keep is None else keep)
+        self.keep_failed = keep_failed
+
+    def create(self):
+        """Function to make a new scratch directory
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        pathlib.Path object
+            the scratch directory
+        """
+
+        return Path(tempfile.mkdtemp(dir=self.root, prefix=PREFIX))
+
+    def finish(self, scratch, directory, failed=False):
+        """Function to move the kept files out of a scratch directory, and
+        remove it
+
+        Parameters
+        ----------
+        scratch : pathlib.Path object
+            the scratch directory, from create
+
+        directory : str or pathlib.Path object
+            the run directory the kept files are moved into
+
+        failed : bool, optional, default is False
+            whether the run failed. If it did, and keep_failed is true,
+            every file is moved.
+
+        Returns
+        -------
+        None
+        """
+
+        directory = Path(directory)
+        try:
+            for path in Path(scratch).iterdir():
+                if path.name in self.keep or (failed and self.keep_failed):
+                    _move(path, directory / path.name)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    @contextlib.contextmanager
+    def run(self, directory):
+        """Context manager that gives a scratch directory for one run, and
+        finishes it when the block exits
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path object
+            the run directory the kept files are moved into
+
+        Returns
+        -------
+        pathlib.Path object
+            the scratch directory
+        """
+
+        scratch = self.create()
+        try:
+            yield scratch
+        except BaseException:
+            self.finish(scratch, directory, failed=True)
+            raise
+        self.finish(scratch, directory)
+
+    def clean(self, max_age=24 * 3600):
+        """Function to remove scratch directories left behind by runs that
+        were killed before they could clean up
+
+        Parameters
+        ----------
+        max_age : float, optional, default is one day
+            only scratch directories that have not been changed for this
+            many seconds are removed, so running jobs are left alone
+
+        Returns
+        -------
+        int
+            the number of scratch directories removed
+        """
+
+        removed = 0
+        for path in self.root.glob(f"{PREFIX}*"):
+            try:
+                if not path.is_dir() or time.time() - path.stat().st_mtime < max_age:
+                    continue
+            except OSError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        return removed
+
+    def __repr__(self):
+        return f"ScratchSpace({self.root}, keep={self.keep})"
+
+
+def _move(source, destination):
+    """Function to move a file, copying it if it is on another file system"""
+
+    try:
+        os.replace(source, destination)
+    except OSError:
+        if destination.is_symlink() or destination.is_file():
+            destination.unlink()
+        shutil.move(source, destination)
@@ -0,0 +1,109 @@
+import numpy as np
+from groupy.base._interpolation import interpolation_weights
+
+
+class SelfShieldingTable:
+    """Class to interpolate self-shielded group cross sections in
+    background cross section (sigma0) and temperature
+
+    The table is the Bondarenko table of one reaction from a GENDF file
+    with several sigma0 values (and optionally several temperatures). It
+    is interpolated linearly in ln(sigma0) and in sqrt(temperature), and
+    values outside of the table are held at the nearest edge.
+
+    Parameters
+    ----------
+    groupr_output : GrouprOutput object
+        the parsed GENDF file
+
+    mt : int
+        the MT number of the pointwise (MF3) values
+
+    Attributes
+    ----------
+    mt : int
+        the MT number
+
+    sigma0_values : np.array of floats
+        the sigma0 values of the table in barns, in increasing order
+
+    temperatures : np.array of floats
+        the temperatures of the table in K, in increasing order
+
+    values : np.array of floats
+        the table, with shape (number of temperatures, number of sigma0
+        values, number of groups)
+
+    Methods
+    -------
+    interpolate
+        Function to get the group values at many (sigma0, temperature)
+        points
+
+    """
+
+    def __init__(self, groupr_output, mt):
+
+        self.mt = mt
+
+        sigma0_values = groupr_output.sigma0_values
+        temperatures = np.atleast_1d(groupr_output.temperatures)
+        values = np.asarray(groupr_output.pointwise[mt].values)
+        values = values.reshape((len(temperatures), len(sigma0_values), -1))
+
+        # GROUPR lists sigma0 from infinite dilution down
+        sigma0_order = np.argsort(sigma0_values)
+        temperature_order = np.argsort(temperatures)
+        self.sigma0_values = sigma0_values[sigma0_order]
+        self.temperatures = temperatures[temperature_order]
+        self.values = values[temperature_order][:, sigma0_order]
+
+    @property
+    def number_groups(self):
+        return self.values.shape[2]
+
+    def interpolate(self, sigma0, temperature):
+        """Function to get the group values at many (sigma0, temperature)
+        points
+
+        Parameters
+        ----------
+        sigma0 : float or np.array of floats
+            the background cross sections in barns
+
+        temperature : float or np.array of floats
+            the temperatures in K, which are broadcast against sigma0
+
+        Returns
+        -------
+        np.array of floats
+            the values, with shape (broadcast shape of the points, number
+            of groups)
+        """
+
+        sigma0, temperature = np.broadcast_arrays(
+            np.asarray(sigma0, dtype=np.float64),
+            np.asarray(temperature, dtype=np.float64),
+        )
+        shape = sigma0.shape
+
+        z_below, z_above, z_weight = interpolation_weights(
+            np.log(self.sigma0_values), np.log(sigma0.ravel())
+        )
+        t_below, t_above, t_weight = interpolation_weights(
+            np.sqrt(self.temperatures), np.sqrt(temperature.ravel())
+        )
+        z_weight, t_weight = z_weight[:, None], t_weight[:, None]
+
+        below = (1 - z_weight) * self.values[t_below, z_below] + z_weight * (
+            self.values[t_below, z_above]
+        )
+        above = (1 - z_weight) * self.values[t_above, z_below] + z_weight * (
+            self.values[t_above, z_above]
+        )
+        values = (1 - t_weight) * below + t_weight * above
+
+        return values.reshape(shape + (self.number_groups,))
+
+    def __call__(self, sigma0, temperature):
+        return self.interpolate(sigma0, temperature)
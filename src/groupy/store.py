@@ -0,0 +1,477 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+import numpy as np
+from groupy.base._banded_matrix import BandedMatrix
+
+MANIFEST = "manifest.json"
+
+POINTWISE_DTYPE = np.dtype(
+    [
+        ("ZA", np.int64),
+        ("MAT", np.int64),
+        ("MT", np.int64),
+        ("temperature", np.float64),
+        ("sigma0", np.float64),
+    ]
+)
+
+MATRIX_DTYPE = np.dtype(
+    [
+        ("ZA", np.int64),
+        ("MAT", np.int64),
+        ("MT", np.int64),
+        ("temperature", np.float64),
+        ("sigma0", np.float64),
+        ("legendre", np.int64),
+        ("data_offset", np.int64),
+        ("data_length", np.int64),
+    ]
+)
+
+# the column files, and the dtype of their items
+COLUMNS = {
+    "pointwise_index": POINTWISE_DTYPE,
+    "pointwise_values": np.dtype(np.float64),
+    "pointwise_flux": np.dtype(np.float64),
+    "matrix_index": MATRIX_DTYPE,
+    "band_first_columns": np.dtype(np.int64),
+    "band_lengths": np.dtype(np.int64),
+    "band_data": np.dtype(np.float64),
+}
+
+
+class LibraryStore:
+    """Class for an on-disk library of many materials, stored by column and
+    memory-mapped
+
+    Every MF3 section of every material, temperature and sigma0 value is one
+    row of the pointwise arrays, so the cross sections of the whole library
+    are one contiguous (entries, groups) array with an index of (ZA, MAT,
+    MT, temperature, sigma0). The scattering matrices are kept in the band
+    layout of BandedMatrix: the first column and length of every row's band,
+    and the band values of all matrices one after the other.
+
+    Each column is its own binary file, and the manifest records how many
+    items of each file belong to the store. Adding a material only appends
+    to the column files and then replaces the manifest, so a store that is
+    open for reading is never changed under it, and a failed append leaves
+    the store as it was. One process should append at a time.
+
+    Every material in the store must have the same group structure.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path object
+        the store directory, which is created if needed
+
+    Attributes
+    ----------
+    energy_boundaries : np.array of floats
+        the group boundaries in eV
+
+    materials : list of dicts
+        the ZA, MAT, title, temperatures and sigma0 values of each material
+
+    pointwise_index : np.array of POINTWISE_DTYPE
+        the ZA, MAT, MT, temperature and sigma0 of each pointwise row
+
+    pointwise_values : np.array of floats
+        the pointwise values, with shape (number of rows, number of groups)
+
+    pointwise_flux : np.array of floats
+        the flux values, with the same shape as the values
+
+    matrix_index : np.array of MATRIX_DTYPE
+        the ZA, MAT, MT, temperature, sigma0, Legendre orders and position
+        of the band values of each scattering matrix
+
+    Methods
+    -------
+    append
+        Function to add a parsed GENDF file to the store
+
+    cross_section
+        Function to get the values of one MF3 section
+
+    scattering_matrix
+        Function to get one scattering matrix
+
+    select
+        Function to find the pointwise rows matching some of the index
+        fields
+
+    """
+
+    def __init__(self, directory):
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if not (self.directory / MANIFEST).exists():
+            self._write_manifest(
+                {
+                    "energy_boundaries": None,
+                    "materials": [],
+                    "lengths": dict.fromkeys(COLUMNS, 0),
+                }
+            )
+
+        self.open()
+
+    @property
+    def number_groups(self):
+        if self.energy_boundaries is None:
+            return 0
+        return len(self.energy_boundaries) - 1
+
+    @property
+    def ZA_values(self):
+        return [material["ZA"] for material in self.materials]
+
+    def open(self):
+        """Function to read the manifest and map the column files
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        with open(self.directory / MANIFEST, "r") as f:
+            manifest = json.load(f)
+
+        self._lengths = manifest["lengths"]
+        self.materials = manifest["materials"]
+        self.energy_boundaries = manifest["energy_boundaries"]
+        if self.energy_boundaries is not None:
+            self.energy_boundaries = np.array(self.energy_boundaries)
+
+        columns = {
+            name: _map_column(
+                self.directory / f"{name}.bin", dtype, self._lengths[name]
+            )
+            for name, dtype in COLUMNS.items()
+        }
+
+        rows = self._lengths["pointwise_index"]
+        self.pointwise_index = columns["pointwise_index"]
+        self.pointwise_values = columns["pointwise_values"].reshape(
+            (rows, self.number_groups)
+        )
+        self.pointwise_flux = columns["pointwise_flux"].reshape(
+            (rows, self.number_groups)
+        )
+        self.matrix_index = columns["matrix_index"]
+        self._band_first_columns = columns["band_first_columns"]
+        self._band_lengths = columns["band_lengths"]
+        self._band_data = columns["band_data"]
+
+        self._pointwise_rows = _row_lookup(self.pointwise_index)
+        self._matrix_rows = _row_lookup(self.matrix_index)
+
+    def append(self, groupr_output):
+        """Function to add a parsed GENDF file to the store
+
+        Parameters
+        ----------
+        groupr_output : GrouprOutput object
+            the parsed GENDF file, which must have the group structure of
+            the store
+
+        Returns
+        -------
+        None
+        """
+
+        za, mat = groupr_output.ZA, int(groupr_output.material_number)
+        if any(m["ZA"] == za and m["MAT"] == mat for m in self.materials):
+            raise ValueError(f"MAT{mat} (ZA {za}) is already in {self.directory}")
+
+        energy_boundaries = np.asarray(groupr_output.energy_boundaries)
+        if self.energy_boundaries is not None and not np.array_equal(
+            energy_boundaries, self.energy_boundaries
+        ):
+            raise ValueError(
+                f"MAT{mat} does not have the group structure of {self.directory}"
+            )
+
+        temperatures = np.atleast_1d(groupr_output.temperatures)
+        sigma0_values = np.atleast_1d(groupr_output.sigma0_values)
+        new = {name: [] for name in COLUMNS}
+        data_offset = self._lengths["band_data"]
+
+        for it, temperature in enumerate(temperatures):
+            for iz, sigma0 in enumerate(sigma0_values):
+                obj = groupr_output.at_temperature(it).at_sigma0(iz)
+
+                for mt, section in obj.pointwise.items():
+                    new["pointwise_index"].append((za, mat, mt, temperature, sigma0))
+                    new["pointwise_values"].append(section.values)
+                    new["pointwise_flux"].append(section.flux_values)
+
+                for mt, section in getattr(obj, "scattering_matrices", {}).items():
+                    matrix = section.values
+                    if not isinstance(matrix, BandedMatrix):
+                        matrix = BandedMatrix.from_dense(matrix)
+                    data = matrix.data.ravel()
+                    new["matrix_index"].append(
+                        (
+                            za,
+                            mat,
+                            mt,
+                            temperature,
+                            sigma0,
+                            matrix.shape[2],
+                            data_offset,
+                            len(data),
+                        )
+                    )
+                    new["band_first_columns"].append(matrix.first_columns)
+                    new["band_lengths"].append(np.diff(matrix.row_pointers))
+                    new["band_data"].append(data)
+                    data_offset += len(data)
+
+        # append to the column files past the lengths in the manifest, which
+        # also drops anything left by an append that failed
+        lengths = dict(self._lengths)
+        for name, dtype in COLUMNS.items():
+            if dtype.names:
+                array = np.array(new[name], dtype=dtype)
+            elif new[name]:
+                array = np.concatenate(new[name]).astype(dtype)
+            else:
+                array = np.zeros(0, dtype=dtype)
+
+            with open(self.directory / f"{name}.bin", "ab") as f:
+                f.truncate(lengths[name] * dtype.itemsize)
+                f.write(array.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            lengths[name] += len(array)
+
+        material = {
+            "ZA": za,
+            "MAT": mat,
+            "title": groupr_output.title,
+            "temperatures": temperatures.tolist(),
+            "sigma0_values": sigma0_values.tolist(),
+        }
+        self._write_manifest(
+            {
+                "energy_boundaries": energy_boundaries.tolist(),
+                "materials": self.materials + [material],
+                "lengths": lengths,
+            }
+        )
+        self.open()
+
+    def select(self, za=None, mt=None, temperature=None, sigma0=None, mat=None):
+        """Function to find the pointwise rows matching some of the index
+        fields
+
+        Parameters
+        ----------
+        za : int, optional, default is None
+            the ZA. Default is None, which matches every ZA.
+
+        mt : int, optional, default is None
+            the MT number. Default is None, which matches every MT.
+
+        temperature : float, optional, default is None
+            the temperature in K. Default is None, which matches every
+            temperature.
+
+        sigma0 : float, optional, default is None
+            the sigma0 value in barns. Default is None, which matches every
+            sigma0 value.
+
+        mat : int, optional, default is None
+            the material number. Default is None, which matches every
+            material.
+
+        Returns
+        -------
+        np.array of ints
+            the rows of pointwise_index and pointwise_values
+        """
+
+        return np.flatnonzero(
+            _matches(self.pointwise_index, za, mt, temperature, sigma0, mat)
+        )
+
+    def cross_section(self, za, mt, temperature=None, sigma0=None, mat=None):
+        """Function to get the values of one MF3 section
+
+        Parameters
+        ----------
+        za : int
+            the ZA
+
+        mt : int
+            the MT number
+
+        temperature : float, optional, default is None
+            the temperature in K. It can be left out when the material only
+            has one temperature.
+
+        sigma0 : float, optional, default is None
+            the sigma0 value in barns. It can be left out when the material
+            only has one sigma0 value.
+
+        mat : int, optional, default is None
+            the material number. It can be left out when only one material
+            has the ZA, and must be given for materials that share one, like
+            the ground and metastable states of an isotope.
+
+        Returns
+        -------
+        np.array of floats
+            the values, as a read-only view of the store
+        """
+
+        row = self._find(
+            self._pointwise_rows,
+            self.pointwise_index,
+            za,
+            mt,
+            temperature,
+            sigma0,
+            mat,
+        )
+        return self.pointwise_values[row]
+
+    def scattering_matrix(self, za, mt, temperature=None, sigma0=None, mat=None):
+        """Function to get one scattering matrix
+
+        Parameters
+        ----------
+        za : int
+            the ZA
+
+        mt : int
+            the MT number
+
+        temperature : float, optional, default is None
+            the temperature in K. It can be left out when the material only
+            has one temperature.
+
+        sigma0 : float, optional, default is None
+            the sigma0 value in barns. It can be left out when the material
+            only has one sigma0 value.
+
+        mat : int, optional, default is None
+            the material number. It can be left out when only one material
+            has the ZA, and must be given for materials that share one, like
+            the ground and metastable states of an isotope.
+
+        Returns
+        -------
+        BandedMatrix object
+            the matrix, with its band values a read-only view of the store
+        """
+
+        row = self._find(
+            self._matrix_rows, self.matrix_index, za, mt, temperature, sigma0, mat
+        )
+        entry = self.matrix_index[row]
+        ng = self.number_groups
+
+        lengths = self._band_lengths[row * ng : (row + 1) * ng]
+        start, stop = entry["data_offset"], entry["data_offset"] + entry["data_length"]
+
+        matrix = BandedMatrix.__new__(BandedMatrix)
+        matrix.shape = (ng, ng, int(entry["legendre"]))
+        matrix.row_pointers = np.concatenate([[0], np.cumsum(lengths)])
+        matrix.first_columns = self._band_first_columns[row * ng : (row + 1) * ng]
+        matrix.data = self._band_data[start:stop].reshape((-1, matrix.shape[2]))
+        return matrix
+
+    def _find(self, rows, index, za, mt, temperature, sigma0, mat=None):
+        """Function to find the one row of an index for a section, filling
+        in the material, temperature and sigma0 when there is only one"""
+
+        if mat is None or temperature is None or sigma0 is None:
+            found = index[_matches(index, za, mt, temperature, sigma0, mat)]
+            if len(found) == 0:
+                raise KeyError(f"ZA {za} MT{mt} is not in {self.directory}")
+            if mat is None:
+                mats = np.unique(found["MAT"]).tolist()
+                if len(mats) > 1:
+                    raise ValueError(
+                        f"ZA {za} has several materials ({mats}), so mat must be "
+                        f"given"
+                    )
+                mat = mats[0]
+                found = found[found["MAT"] == mat]
+            if temperature is None and len(np.unique(found["temperature"])) == 1:
+                temperature = found["temperature"][0]
+            if sigma0 is None and len(np.unique(found["sigma0"])) == 1:
+                sigma0 = found["sigma0"][0]
+            if temperature is None or sigma0 is None:
+                raise ValueError(
+                    f"ZA {za} MT{mt} has several temperatures or sigma0 values, "
+                    f"so they must be given"
+                )
+
+        try:
+            return rows[(za, int(mat), mt, float(temperature), float(sigma0))]
+        except KeyError:
+            raise KeyError(
+                f"ZA {za} MAT{mat} MT{mt} at {temperature} K and {sigma0} b is not "
+                f"in {self.directory}"
+            )
+
+    def _write_manifest(self, manifest):
+        """Function to replace the manifest in one step"""
+
+        temporary = tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, prefix=".manifest-", delete=False
+        )
+        with temporary as f:
+            json.dump(manifest, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary.name, self.directory / MANIFEST)
+
+
+def _map_column(filename, dtype, length):
+    """Function to memory-map the first items of a column file"""
+
+    if length == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode="r", shape=(length,))
+
+
+def _row_lookup(index):
+    """Function to map (ZA, MAT, MT, temperature, sigma0) to the row of an
+    index"""
+
+    keys = zip(
+        index["ZA"].tolist(),
+        index["MAT"].tolist(),
+        index["MT"].tolist(),
+        index["temperature"].tolist(),
+        index["sigma0"].tolist(),
+    )
+    return {key: row for row, key in enumerate(keys)}
+
+
+def _matches(index, za, mt, temperature, sigma0, mat=None):
+    """Function to find the rows of an index matching the given fields"""
+
+    found = np.ones(len(index), dtype=bool)
+    for name, value in [
+        ("ZA", za),
+        ("MAT", mat),
+        ("MT", mt),
+        ("temperature", temperature),
+        ("sigma0", sigma0),
+    ]:
+        if value is not None:
+            found &= index[name] == value
+    return found
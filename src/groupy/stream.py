@@ -0,0 +1,109 @@
+from pathlib import Path
+import numpy as np
+from groupy.base._decoder import decode_identifiers
+from groupy.base._energy_class import EnergyBoundaryValues
+from groupy.base._pointwise_class import PointwiseValues
+from groupy.base._outgoing_class import OutgoingDistribution
+from groupy.base._scattering_mat_class import ScatteringMatrix
+
+SECTION_CLASSES = {
+    1: EnergyBoundaryValues,
+    3: PointwiseValues,
+    5: OutgoingDistribution,
+    6: ScatteringMatrix,
+}
+
+
+def iter_sections(filename, mf=None, mt=None, mat=None, sparse=False):
+    """Function to parse the sections of a GENDF file one at a time, as the
+    file is read
+
+    Only the lines of the section being read are kept, so the memory used
+    does not grow with the size of the file. Sections that are not selected
+    are skipped without being decoded. A material with several temperatures
+    gives each section once for each temperature, in the order they are in
+    the file.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path object
+        the GENDF file
+
+    mf : int or list, optional, default is None
+        the MF number(s) to parse. Default is None, which parses MF1, MF3,
+        MF5 and MF6.
+
+    mt : int or list, optional, default is None
+        the MT number(s) to parse. Default is None, which parses every MT.
+
+    mat : int or list, optional, default is None
+        the material number(s) to parse. Default is None, which parses
+        every material.
+
+    sparse : bool, optional, default is False
+        If true, the scattering matrices are stored as BandedMatrix
+        objects
+
+    Yields
+    ------
+    EnergyBoundaryValues, PointwiseValues, OutgoingDistribution or
+    ScatteringMatrix object
+        the parsed section, with its ZA, temperature and (except for MF1)
+        MT number as attributes
+    """
+
+    filename = Path(filename)
+    if not filename.exists():
+        raise FileNotFoundError(f"The GENDF file {filename} was not found")
+
+    mfs, mts, mats = _selection(mf), _selection(mt), _selection(mat)
+    if mfs is not None and not mfs <= set(SECTION_CLASSES):
+        raise NotImplementedError(
+            f"iter_sections can't yet parse MF{sorted(mfs - set(SECTION_CLASSES))}"
+        )
+
+    def parse(section_mf, lines):
+        if section_mf == 6:
+            return ScatteringMatrix(b"".join(lines), sparse=sparse)
+        return SECTION_CLASSES[section_mf](b"".join(lines))
+
+    with open(filename, "rb") as f:
+
+        # skip the tape title
+        f.readline()
+
+        current, section_mf, lines = None, None, []
+        for line in f:
+
+            # the section ends where the MAT/MF/MT changes, which is at
+            # its SEND record
+            ids = line[66:75]
+            if ids != current:
+                if lines:
+                    yield parse(section_mf, lines)
+                    lines = []
+
+                current = ids
+                line_mat, line_mf, line_mt = decode_identifiers(line)
+                selected = (
+                    line_mt > 0
+                    and line_mf in SECTION_CLASSES
+                    and (mats is None or line_mat in mats)
+                    and (mfs is None or line_mf in mfs)
+                    and (mts is None or line_mt in mts)
+                )
+                section_mf = line_mf if selected else None
+
+            if section_mf is not None:
+                lines.append(line)
+
+        if lines:
+            yield parse(section_mf, lines)
+
+
+def _selection(values):
+    """Function to turn an optional number or list of numbers into a set"""
+
+    if values is None:
+        return None
+    return set(np.atleast_1d(values).tolist())
@@ -0,0 +1,498 @@
+import itertools
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+import numpy as np
+from groupy.cache import file_hash
+from groupy.njoy import write_groupr_input, _njoy_materials
+from groupy.library import read_groupr_output
+from groupy.pipeline import _reconr_stage, _broadr_stage, _groupr_stage
+
+SweepPoint = namedtuple(
+    "SweepPoint",
+    [
+        "endf6_file",
+        "temperature",
+        "reconr_tolerance",
+        "broadr_tolerance",
+        "group_boundaries",
+        "flux",
+        "legendre_order",
+        "sigma0",
+    ],
+)
+SweepPoint.__doc__ = "The sweep parameters of one NJOY run"
+
+STAGE_KINDS = ["reconr", "broadr", "groupr"]
+
+
+class SweepPlan:
+    """Class to expand a grid of NJOY parameters into the stages needed to
+    run it, merging the stages with identical inputs
+
+    Every point of the grid needs a reconr, a broadr and a groupr stage.
+    The reconr stage only depends on the ENDF file and the reconr
+    tolerance, and the broadr stage only on those, the temperature and the
+    broadr tolerance, so most points of a grid share them.
+
+    Parameters
+    ----------
+    endf6_files : list of str or pathlib.Path objects
+        the ENDF6-formatted files
+
+    directory : str or pathlib.Path object, optional, default is '.'
+        the directory for the stage directories
+
+    temperatures : list or tuple, optional, default is (293,)
+        the temperatures in K
+
+    reconr_tolerances : list or tuple, optional, default is (0.001,)
+        the tolerances for the reconr module
+
+    broadr_tolerances : list or tuple, optional, default is (0.001,)
+        the tolerances for the broadr module
+
+    group_structures : list or tuple, optional, default is (2,)
+        the group boundaries. Each item is either an integer, which is ign
+        in the NJOY input, or a list of energy boundaries in eV.
+
+    fluxes : list or tuple, optional, default is (5,)
+        the weighting fluxes - the iwt values in the NJOY input
+
+    legendre_orders : list or tuple, optional, default is (1,)
+        the orders to reconstruct the angular distributions
+
+    sigma0_values : list or tuple, optional, default is (1e10,)
+        the sigma0 values in barns. Each item is either a value or a list of
+        values for one self-shielding table.
+
+    verbose : bool, optional, default is False
+        If true, extra information will be printed to the screen
+
+    Attributes
+    ----------
+    points : list of SweepPoint objects
+        the points of the grid, in the order of the cross product
+
+    stages : dict
+        the unique stages, keyed by stage key, with every stage after the
+        stage it depends on
+
+    groupr_stages : dict
+        the groupr stage of each point, keyed by SweepPoint
+
+    """
+
+    def __init__(
+        self,
+        endf6_files,
+        directory=".",
+        temperatures=(293,),
+        reconr_tolerances=(0.001,),
+        broadr_tolerances=(0.001,),
+        group_structures=(2,),
+        fluxes=(5,),
+        legendre_orders=(1,),
+        sigma0_values=(1e10,),
+        verbose=False,
+    ):
+
+        self.directory = Path(directory).absolute()
+        self.points = []
+        self.stages = {}
+        self.groupr_stages = {}
+
+        for endf6_file in endf6_files:
+            endf6_file = Path(endf6_file).absolute()
+            mat, has_nubar, has_pfns = _njoy_materials(endf6_file, verbose)
+            endf_hash = file_hash(endf6_file)
+
+            grid = itertools.product(
+                temperatures,
+                reconr_tolerances,
+                broadr_tolerances,
+                group_structures,
+                fluxes,
+                legendre_orders,
+                sigma0_values,
+            )
+            for (
+                temperature,
+                reconr_tolerance,
+                broadr_tolerance,
+                group_boundaries,
+                flux,
+                legendre_order,
+                sigma0,
+            ) in grid:
+                reconr = self._add(
+                    _reconr_stage(
+                        self.directory, endf6_file, endf_hash, mat, reconr_tolerance
+                    )
+                )
+                broadr = self._add(
+                    _broadr_stage(
+                        self.directory,
+                        reconr,
+                        endf6_file,
+                        mat,
+                        temperature,
+                        broadr_tolerance,
+                    )
+                )
+                njoy_input = write_groupr_input(
+                    mat,
+                    endf6_file.stem,
+                    temperature,
+                    group_boundaries,
+                    flux,
+                    has_nubar,
+                    has_pfns,
+                    legendre_order,
+                    sigma0,
+                )
+                groupr = self._add(_groupr_stage(broadr, endf6_file, njoy_input))
+
+                point = SweepPoint(
+                    str(endf6_file),
+                    _freeze(temperature),
+                    reconr_tolerance,
+                    broadr_tolerance,
+                    _freeze(group_boundaries),
+                    flux,
+                    legendre_order,
+                    _freeze(sigma0),
+                )
+                self.points.append(point)
+                self.groupr_stages[point] = groupr
+
+    def _add(self, stage):
+        """Function to add a stage to the plan, giving back the stage
+        already planned if one has the same inputs"""
+
+        return self.stages.setdefault(stage.key, stage)
+
+    def point_stages(self, point):
+        """Function to get the reconr, broadr and groupr stages of a point
+
+        Parameters
+        ----------
+        point : SweepPoint object
+            the point of the grid
+
+        Returns
+        -------
+        list of Stage objects
+            the stages of the point, in the order they run
+        """
+
+        stages = [self.groupr_stages[point]]
+        while stages[0].dependency is not None:
+            stages.insert(0, stages[0].dependency)
+        return stages
+
+    def stage_counts(self):
+        """Function to count the unique stages of each kind
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            the number of unique stages, keyed by the NJOY module
+        """
+
+        counts = dict.fromkeys(STAGE_KINDS, 0)
+        for stage in self.stages.values():
+            counts[stage.kind] += 1
+        return counts
+
+
+class SweepReport:
+    """Class for the results of a parameter sweep
+
+    Parameters
+    ----------
+    plan : SweepPlan object
+        the plan that was run
+
+    status : dict
+        the status of each stage - 'run', 'reused', 'failed' or 'skipped' -
+        keyed by stage key
+
+    errors : dict
+        the exception of each failed or skipped stage, keyed by stage key
+
+    sparse : bool, optional, default is False
+        If true, the scattering matrices are stored as BandedMatrix objects
+
+    Attributes
+    ----------
+    results : dict
+        the GrouprOutput object of each point that ran, or a GrouprLibrary
+        when the ENDF file has several materials, keyed by SweepPoint
+
+    errors : dict
+        the exception of each point that did not run, or whose GROUPR
+        output could not be read, keyed by SweepPoint
+
+    njoy_time : float
+        the seconds of NJOY time needed for the unique stages
+
+    naive_time : float
+        the seconds of NJOY time that running every point of the grid from
+        the ENDF file would need
+
+    saved_time : float
+        the seconds of NJOY time saved by sharing stages
+
+    Methods
+    -------
+    select
+        Function to get the results matching some of the sweep parameters
+
+    summary
+        Function to describe the sweep
+
+    """
+
+    def __init__(self, plan, status, errors, sparse=False):
+
+        self.plan = plan
+        self.status = status
+
+        self.results = {}
+        self.errors = {}
+        for point in plan.points:
+            stage = plan.groupr_stages[point]
+            if stage.key in errors:
+                self.errors[point] = errors[stage.key]
+            else:
+                # a tape91 that can not be read only fails its own point
+                try:
+                    self.results[point] = read_groupr_output(stage.product_file, sparse)
+                except Exception as error:
+                    self.errors[point] = error
+
+        # stages that failed have no wall time, and are left out of both
+        self.njoy_time = sum(_wall_time(stage) for stage in plan.stages.values())
+        self.naive_time = sum(
+            _wall_time(stage)
+            for point in plan.points
+            for stage in plan.point_stages(point)
+        )
+
+    @property
+    def saved_time(self):
+        return self.naive_time - self.njoy_time
+
+    def select(self, **parameters):
+        """Function to get the results matching some of the sweep
+        parameters
+
+        Parameters
+        ----------
+        parameters
+            the values of the SweepPoint fields to match
+
+        Returns
+        -------
+        dict
+            the matching GrouprOutput objects, keyed by SweepPoint
+        """
+
+        parameters = {name: _freeze(value) for name, value in parameters.items()}
+        return {
+            point: output
+            for point, output in self.results.items()
+            if all(getattr(point, name) == value for name, value in parameters.items())
+        }
+
+    def summary(self):
+        """Function to describe the sweep
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            the numbers of points and stages, and the NJOY time saved
+        """
+
+        counts = self.plan.stage_counts()
+        number_points = len(self.plan.points)
+        statuses = list(self.status.values())
+
+        lines = [
+            f"{number_points} points, {len(self.plan.stages)} stages instead of "
+            f"{len(STAGE_KINDS) * number_points} "
+            f"({', '.join(f'{counts[kind]} {kind}' for kind in STAGE_KINDS)})",
+            f"{statuses.count('run')} stages run, {statuses.count('reused')} "
+            f"reused, {statuses.count('failed')} failed, "
+            f"{statuses.count('skipped')} skipped",
+        ]
+        if self.naive_time > 0:
+            lines.append(
+                f"NJOY time {self.njoy_time:.1f} s instead of "
+                f"{self.naive_time:.1f} s, saved {self.saved_time:.1f} s "
+                f"({100 * self.saved_time / self.naive_time:.0f}%)"
+            )
+        for point, error in self.errors.items():
+            lines.append(f"failed: {point}: {error}")
+        return "\n".join(lines)
+
+
+def run_sweep(
+    endf6_files,
+    directory=".",
+    temperatures=(293,),
+    reconr_tolerances=(0.001,),
+    broadr_tolerances=(0.001,),
+    group_structures=(2,),
+    fluxes=(5,),
+    legendre_orders=(1,),
+    sigma0_values=(1e10,),
+    max_workers=None,
+    sparse=False,
+    timeout=None,
+    verbose=False,
+):
+    """Function to run NJOY over a grid of parameters, running each unique
+    reconr, broadr and groupr stage once
+
+    Stages are run on a pool of threads as soon as the stage they depend on
+    is done. Stages found in the directory from earlier sweeps or pipelines
+    are not run again, and a failed stage only fails the points that need
+    it.
+
+    Parameters
+    ----------
+    endf6_files : list of str or pathlib.Path objects
+        the ENDF6-formatted files
+
+    directory : str or pathlib.Path object, optional, default is '.'
+        the directory for the stage directories
+
+    temperatures : list or tuple, optional, default is (293,)
+        the temperatures in K
+
+    reconr_tolerances : list or tuple, optional, default is (0.001,)
+        the tolerances for the reconr module
+
+    broadr_tolerances : list or tuple, optional, default is (0.001,)
+        the tolerances for the broadr module
+
+    group_structures : list or tuple, optional, default is (2,)
+        the group boundaries. Each item is either an integer, which is ign
+        in the NJOY input, or a list of energy boundaries in eV.
+
+    fluxes : list or tuple, optional, default is (5,)
+        the weighting fluxes - the iwt values in the NJOY input
+
+    legendre_orders : list or tuple, optional, default is (1,)
+        the orders to reconstruct the angular distributions
+
+    sigma0_values : list or tuple, optional, default is (1e10,)
+        the sigma0 values in barns. Each item is either a value or a list of
+        values for one self-shielding table.
+
+    max_workers : int, optional, default is None
+        the number of NJOY processes to run at once. Default is None, which
+        uses the ThreadPoolExecutor default.
+
+    sparse : bool, optional, default is False
+        If true, the scattering matrices are stored as BandedMatrix objects
+
+    timeout : float, optional, default is None
+        the number of seconds to wait for each NJOY run before it is killed
+
+    verbose : bool, optional, default is False
+        If true, extra information will be printed to the screen
+
+    Returns
+    -------
+    SweepReport object
+        the results of the sweep, keyed by the sweep parameters
+    """
+
+    plan = SweepPlan(
+        endf6_files,
+        directory,
+        temperatures,
+        reconr_tolerances,
+        broadr_tolerances,
+        group_structures,
+        fluxes,
+        legendre_orders,
+        sigma0_values,
+        verbose,
+    )
+    status, errors = _run_stages(plan.stages.values(), max_workers, timeout, verbose)
+
+    report = SweepReport(plan, status, errors, sparse)
+    if verbose:
+        print(report.summary())
+    return report
+
+
+def _run_stages(stages, max_workers=None, timeout=None, verbose=False):
+    """Function to run stages on a thread pool, each one once the stage it
+    depends on is done. The stages must come after the stages they depend
+    on."""
+
+    status, errors = {}, {}
+    pending, running = list(stages), {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            waiting = []
+            for stage in pending:
+                dependency = stage.dependency
+                dependency_status = (
+                    None if dependency is None else status.get(dependency.key)
+                )
+                if dependency_status in ["failed", "skipped"]:
+                    status[stage.key] = "skipped"
+                    errors[stage.key] = errors[dependency.key]
+                elif dependency is not None and dependency_status is None:
+                    waiting.append(stage)
+                elif stage.done:
+                    status[stage.key] = "reused"
+                else:
+                    if verbose:
+                        print(f"Running {stage.kind} in {stage.path}")
+                    running[executor.submit(stage.run, timeout)] = stage
+            pending = waiting
+
+            if running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        future.result()
+                        status[stage.key] = "run"
+                    except Exception as error:
+                        status[stage.key] = "failed"
+                        errors[stage.key] = error
+
+    return status, errors
+
+
+def _wall_time(stage):
+    """Function to get the wall time of a stage, or 0 if it is not known"""
+
+    wall_time = stage.wall_time
+    return 0.0 if wall_time is None else wall_time
+
+
+def _freeze(value):
+    """Function to turn a list parameter into a tuple, so that it can be
+    part of a SweepPoint"""
+
+    if np.ndim(value) > 0:
+        return tuple(np.asarray(value).tolist())
+    return value
@@ -0,0 +1,193 @@
+import numpy as np
+from groupy.base._interpolation import interpolation_weights
+
+# the functions of the temperature that the values are linear in
+TEMPERATURE_SCALES = {
+    "linear": lambda temperature: temperature,
+    "sqrt": np.sqrt,
+    "log": np.log,
+}
+
+
+class TemperatureInterpolator:
+    """Class to interpolate the group cross sections of every reaction in
+    temperature
+
+    The table is built from the pointwise (MF3) values of one or more
+    parsed GENDF files, at all of the temperatures they have. The values
+    are interpolated linearly in the temperature, its square root or its
+    logarithm, and values outside of the table are held at the nearest
+    temperature.
+
+    The interval slopes are computed once when the table is built, so each
+    call to ``interpolate`` is a lookup and one multiply-add for all of the
+    points, reactions and groups.
+
+    Parameters
+    ----------
+    groupr_outputs : GrouprOutput object or list of GrouprOutput objects
+        the parsed GENDF files, which must have the same group structure.
+        Together they must have each temperature only once.
+
+    mts : list of ints, optional, default is None
+        the MT numbers to interpolate. Default is None, which takes every
+        MT that is in all of the files.
+
+    method : str, optional, default is "sqrt"
+        "linear", "sqrt" or "log": the function of the temperature that the
+        values are interpolated linearly in
+
+    sigma0_index : int, optional, default is 0
+        the index of the sigma0 value to take from files with several
+        sigma0 values. Default is 0, which is infinite dilution.
+
+    Attributes
+    ----------
+    mts : list of ints
+        the MT numbers, in the order of the reaction axis of the values
+
+    temperatures : np.array of floats
+        the temperatures of the table in K, in increasing order
+
+    energy_boundaries : np.array of floats
+        the group boundaries in eV
+
+    method : str
+        the interpolation method
+
+    values : np.array of floats
+        the table, with shape (number of temperatures, number of MT's,
+        number of groups)
+
+    Methods
+    -------
+    interpolate
+        Function to get the values of every MT at many temperatures
+
+    cross_section
+        Function to get the values of one MT at many temperatures
+
+    """
+
+    def __init__(self, groupr_outputs, mts=None, method="sqrt", sigma0_index=0):
+
+        if method not in TEMPERATURE_SCALES:
+            raise ValueError(
+                f"The method must be one of {list(TEMPERATURE_SCALES)}, not {method}"
+            )
+        self.method = method
+
+        if not isinstance(groupr_outputs, (list, tuple)):
+            groupr_outputs = [groupr_outputs]
+        if len(groupr_outputs) == 0:
+            raise ValueError(f"There must be at least one GrouprOutput")
+
+        self.energy_boundaries = np.asarray(groupr_outputs[0].energy_boundaries)
+        for obj in groupr_outputs[1:]:
+            if not np.array_equal(obj.energy_boundaries, self.energy_boundaries):
+                raise ValueError(f"The files must have the same group structure")
+
+        if mts is None:
+            mts = set(groupr_outputs[0].pointwise.keys())
+            for obj in groupr_outputs[1:]:
+                mts &= set(obj.pointwise.keys())
+        self.mts = sorted(mts)
+
+        temperatures, blocks = [], []
+        for obj in groupr_outputs:
+            number_temperatures = len(np.atleast_1d(obj.temperatures))
+            number_sigma0 = len(obj.sigma0_values)
+            number_groups = len(obj.energy_boundaries) - 1
+            temperatures.append(np.atleast_1d(obj.temperatures))
+
+            block = np.empty((number_temperatures, len(self.mts), number_groups))
+            for column, mt in enumerate(self.mts):
+                if mt not in obj.pointwise:
+                    raise KeyError(f"MT{mt} is not in {obj.filename}")
+                values = np.asarray(obj.pointwise[mt].values).reshape(
+                    (number_temperatures, number_sigma0, number_groups)
+                )
+                block[:, column] = values[:, sigma0_index]
+            blocks.append(block)
+
+        temperatures = np.concatenate(temperatures).astype(np.float64)
+        if len(np.unique(temperatures)) != len(temperatures):
+            raise ValueError(f"The temperatures {temperatures} are not unique")
+
+        if method == "log" and np.any(temperatures <= 0):
+            raise ValueError("Log interpolation needs temperatures above 0 K")
+
+        order = np.argsort(temperatures)
+        self.temperatures = temperatures[order]
+        self.values = np.concatenate(blocks)[order]
+
+        # the interpolation grid, and the difference between the values at
+        # the ends of each interval, which is scaled by the interpolation
+        # weight
+        self._grid = TEMPERATURE_SCALES[method](self.temperatures)
+        if len(self.temperatures) > 1:
+            self._differences = np.diff(self.values, axis=0)
+        else:
+            self._differences = np.zeros_like(self.values)
+
+    @property
+    def number_groups(self):
+        return self.values.shape[2]
+
+    def interpolate(self, temperature):
+        """Function to get the values of every MT at many temperatures
+
+        Parameters
+        ----------
+        temperature : float or np.array of floats
+            the temperatures in K
+
+        Returns
+        -------
+        np.array of floats
+            the values, with shape (shape of the temperatures, number of
+            MT's, number of groups)
+        """
+
+        temperature = np.asarray(temperature, dtype=np.float64)
+        below, _, weight = interpolation_weights(
+            self._grid, TEMPERATURE_SCALES[self.method](temperature.ravel())
+        )
+        below = np.minimum(below, len(self._differences) - 1)
+        values = self.values[below] + weight[:, None, None] * self._differences[below]
+        return values.reshape(temperature.shape + self.values.shape[1:])
+
+    def cross_section(self, mt, temperature):
+        """Function to get the values of one MT at many temperatures
+
+        Parameters
+        ----------
+        mt : int
+            the MT number
+
+        temperature : float or np.array of floats
+            the temperatures in K
+
+        Returns
+        -------
+        np.array of floats
+            the values, with shape (shape of the temperatures, number of
+            groups)
+        """
+
+        if mt not in self.mts:
+            raise KeyError(f"MT{mt} is not in the table")
+        column = self.mts.index(mt)
+
+        temperature = np.asarray(temperature, dtype=np.float64)
+        below, _, weight = interpolation_weights(
+            self._grid, TEMPERATURE_SCALES[self.method](temperature.ravel())
+        )
+        below = np.minimum(below, len(self._differences) - 1)
+        values = self.values[below, column] + (
+            weight[:, None] * self._differences[below, column]
+        )
+        return values.reshape(temperature.shape + (self.number_groups,))
+
+    def __call__(self, temperature):
+        return self.interpolate(temperature)
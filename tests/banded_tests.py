@@ -0,0 +1,75 @@
+from groupy.base._scattering_mat_class import ScatteringMatrix
+from groupy.base._banded_matrix import BandedMatrix
+from pathlib import Path
+import pytest
+import numpy as np
+import ENDFtk
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+@pytest.fixture
+def U238_356(U238_356_file):
+    tape = ENDFtk.tree.Tape.from_file(str(U238_356_file))
+    mat = tape.material(tape.material_numbers[0])
+    mf6 = mat.file(6)
+    return mf6
+
+
+def test_small_banded_matrix():
+    values = np.arange(1, 7, dtype=float).reshape((6, 1))
+    obj = BandedMatrix(4, [2, 0], [1, 0], [3, 3], values)
+
+    dense = np.zeros((4, 4, 1))
+    dense[2, 1:4, 0] = [1, 2, 3]
+    dense[0, 0:3, 0] = [4, 5, 6]
+
+    assert obj.shape == (4, 4, 1)
+    assert np.array_equal(obj.toarray(), dense)
+    assert np.array_equal(obj.row(1), dense[1])
+    assert np.array_equal(obj.column(2), dense[:, 2])
+
+    with pytest.raises(ValueError):
+        BandedMatrix(4, [0, 0], [0, 1], [1, 1], np.ones((2, 1)))
+
+
+@pytest.mark.parametrize("mt", [2, 16, 18, 51])
+def test_u238_banded_matrices(U238_356, mt):
+    lines = U238_356.section(mt).content.splitlines()
+    dense = ScatteringMatrix(lines)
+    banded = ScatteringMatrix(lines, sparse=True)
+
+    assert isinstance(banded.values, BandedMatrix)
+    assert np.array_equal(banded.values.toarray(), dense.values)
+    assert np.array_equal(np.asarray(banded.values), dense.values)
+    assert np.array_equal(banded.flux_values, dense.flux_values)
+
+    # slicing
+    assert banded.values[4, 3, 0] == dense.values[4, 3, 0]
+    assert np.array_equal(banded.values[:, :, 0], dense.values[:, :, 0])
+    assert np.array_equal(banded.values[5], dense.values[5])
+    assert np.array_equal(banded.values[2:7, 3:], dense.values[2:7, 3:])
+    assert np.array_equal(banded.values[:, 4, 1:], dense.values[:, 4, 1:])
+    assert np.array_equal(banded.values[-1, -2], dense.values[-1, -2])
+
+    # products
+    vector = np.linspace(1, 2, dense.number_groups)
+    for ell in range(dense.number_legendre):
+        assert np.allclose(
+            banded.values.matvec(vector, ell), dense.values[:, :, ell] @ vector
+        )
+        assert np.allclose(
+            banded.values.rmatvec(vector, ell), dense.values[:, :, ell].T @ vector
+        )
+
+
+def test_u238_elastic_banded_size(U238_356):
+    lines = U238_356.section(2).content.splitlines()
+    dense = ScatteringMatrix(lines)
+    banded = ScatteringMatrix(lines, sparse=True)
+
+    assert banded.values.nbytes < dense.values.nbytes / 4
@@ -0,0 +1,140 @@
+from groupy import run_batch
+from pathlib import Path
+from gendf_helpers import add_material_copy
+import os
+import shutil
+import time
+import pytest
+import numpy as np
+
+U238_356 = Path(__file__).parent / "files" / "U238_356"
+
+
+def fake_njoy(endf6_file, directory=".", title="", temperature=293):
+    """copies a GENDF file into place instead of running NJOY"""
+    if "bad" in Path(endf6_file).name:
+        raise RuntimeError("NJOY run failed")
+    shutil.copyfile(U238_356, Path(directory) / "tape91")
+    (Path(directory) / "title").write_text(f"{title} {temperature}")
+
+
+def slow_njoy(endf6_file, directory=".", title=""):
+    """the fake NJOY run, which takes longer for the "slow" file"""
+    if "slow" in Path(endf6_file).name:
+        time.sleep(1)
+    fake_njoy(endf6_file, directory, title)
+
+
+def library_njoy(endf6_file, directory=".", title=""):
+    """the fake NJOY run for a tape with the U238 material and a copy of it
+    as MAT9437"""
+    add_material_copy(U238_356, Path(directory) / "tape91", 9437, 94239)
+
+
+def crashing_njoy(endf6_file, directory=".", title=""):
+    """the fake NJOY run, which kills the worker process for the "crash"
+    file"""
+    if "crash" in Path(endf6_file).name:
+        time.sleep(0.2)
+        os._exit(1)
+    time.sleep(0.1)
+    fake_njoy(endf6_file, directory, title)
+
+
+def test_run_batch(tmp_path):
+    files = []
+    for name in ["U238", "bad", "U235"]:
+        files.append(tmp_path / f"{name}.endf")
+        files[-1].write_text("")
+
+    report = run_batch(
+        files,
+        options=[{"temperature": 293}, {"temperature": 600}],
+        directory=tmp_path / "runs",
+        max_workers=2,
+        runner=fake_njoy,
+    )
+
+    assert [job.name for job in report.jobs] == [
+        "U238_0",
+        "U238_1",
+        "bad_0",
+        "bad_1",
+        "U235_0",
+        "U235_1",
+    ]
+    assert len(report.succeeded) == 4
+    assert [job.name for job in report.failed] == ["bad_0", "bad_1"]
+    assert "NJOY run failed" in report.failed[0].error
+
+    assert (tmp_path / "runs" / "U235_1" / "title").read_text() == "U235 600"
+    assert report.outputs["U238_0"].material_number == 9237
+    assert np.array_equal(
+        report.outputs["U235_1"].scattering_matrices[2].values,
+        report.outputs["U238_0"].scattering_matrices[2].values,
+    )
+    assert all(job.wall_time >= 0 for job in report.jobs)
+
+    summary = report.summary()
+    assert "4 of 6 jobs finished" in summary
+    assert "RuntimeError: NJOY run failed" in summary
+
+
+def test_run_batch_reports_as_finished(tmp_path, capsys):
+    files = []
+    for name in ["slow", "fast"]:
+        files.append(tmp_path / f"{name}.endf")
+        files[-1].write_text("")
+
+    report = run_batch(
+        files,
+        directory=tmp_path / "runs",
+        max_workers=2,
+        runner=slow_njoy,
+        verbose=True,
+    )
+
+    # the fast job is reported first, but the report keeps the job order
+    assert capsys.readouterr().out.splitlines() == ["fast: done", "slow: done"]
+    assert [job.name for job in report.jobs] == ["slow", "fast"]
+
+
+def test_run_batch_several_materials(tmp_path):
+    endf6_file = tmp_path / "library.endf"
+    endf6_file.write_text("")
+
+    report = run_batch([endf6_file], directory=tmp_path / "runs", runner=library_njoy)
+
+    # every material of the tape is read from the job output
+    output = report.outputs["library"]
+    assert output.material_numbers == [9237, 9437]
+    assert output[9437].ZA == 94239
+
+
+def test_run_batch_dead_worker(tmp_path):
+    files = []
+    for name in ["U238", "crash", "U235", "Pu239", "Pu240"]:
+        files.append(tmp_path / f"{name}.endf")
+        files[-1].write_text("")
+
+    report = run_batch(
+        files, directory=tmp_path / "runs", max_workers=2, runner=crashing_njoy
+    )
+
+    # only the job that killed its worker fails, and the others are run
+    # again on a new pool
+    assert [job.name for job in report.failed] == ["crash"]
+    assert "BrokenProcessPool" in report.failed[0].error
+    assert len(report.succeeded) == 4
+    assert all(output.material_number == 9237 for output in report.outputs.values())
+
+
+def test_run_batch_parses_in_worker(tmp_path):
+    endf6_file = tmp_path / "U238.endf"
+    endf6_file.write_text("")
+
+    report = run_batch([endf6_file], directory=tmp_path / "runs", runner=fake_njoy)
+
+    # the output is loaded from the copy the worker saved
+    assert (tmp_path / "runs" / "U238" / "parsed" / "manifest.json").exists()
+    assert report.outputs["U238"].backend == "archive"
@@ -0,0 +1,175 @@
+from groupy import GrouprOutput, ParseCache, NjoyCache
+from groupy.base._banded_matrix import BandedMatrix
+from pathlib import Path
+import os
+import shutil
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+def test_save_and_load(U238_356_file, tmp_path):
+    obj = GrouprOutput(U238_356_file)
+    obj.save(tmp_path / "U238")
+
+    loaded = GrouprOutput.load(tmp_path / "U238")
+
+    assert loaded.title == obj.title
+    assert loaded.material_number == 9237
+    assert np.array_equal(loaded.energy_boundaries, obj.energy_boundaries)
+    assert isinstance(loaded.energy_boundaries.base, np.memmap)
+    assert list(loaded.pointwise) == list(obj.pointwise)
+    assert loaded.pointwise[452].mt == 452
+    assert np.array_equal(loaded.pointwise[452].values, obj.pointwise[452].values)
+    assert loaded.pointwise[452].temperature == obj.pointwise[452].temperature
+    assert np.array_equal(
+        loaded.outgoing_distributions[18].values,
+        obj.outgoing_distributions[18].values,
+    )
+    assert np.array_equal(
+        loaded.scattering_matrices[2].values, obj.scattering_matrices[2].values
+    )
+
+    in_memory = GrouprOutput.load(tmp_path / "U238", mmap=False)
+    assert not isinstance(in_memory.energy_boundaries.base, np.memmap)
+
+    loaded.write_to_csv(title="loaded", directory=tmp_path)
+    assert (tmp_path / "loaded_scattering_matrix_4.csv").exists()
+
+
+def test_save_and_load_sparse(U238_356_file, tmp_path):
+    obj = GrouprOutput(U238_356_file, sparse=True)
+    obj.save(tmp_path)
+
+    loaded = GrouprOutput.load(tmp_path)
+    assert loaded.sparse
+    assert isinstance(loaded.scattering_matrices[2].values, BandedMatrix)
+    assert np.array_equal(
+        loaded.scattering_matrices[2].values.toarray(),
+        obj.scattering_matrices[2].values.toarray(),
+    )
+
+
+def test_parse_cache(U238_356_file, tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+
+    first = cache.load(U238_356_file)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    second = cache.load(U238_356_file)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert np.array_equal(
+        first.scattering_matrices[16].values, second.scattering_matrices[16].values
+    )
+
+    # a different file or different options is a different entry
+    assert cache.key(U238_356_file) != cache.key(U238_356_file, sparse=True)
+    cache.load(U238_356_file, sparse=True)
+    assert cache.misses == 2
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    cache.clear()
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_parse_cache_material(U238_356_file, tmp_path):
+    # a copy of the U238 material as MAT9437 after the first one
+    lines = U238_356_file.read_text().splitlines()
+    material = lines[1:-1]
+    copy = [
+        line[:66] + line[66:70].replace("9237", "9437") + line[70:] for line in material
+    ]
+    filename = tmp_path / "library"
+    filename.write_text("\n".join([lines[0]] + material + copy + [lines[-1]]) + "\n")
+
+    cache = ParseCache(tmp_path / "cache")
+    assert cache.key(filename) != cache.key(filename, material=9437)
+    assert cache.key(filename) != cache.key(filename, backend="endftk")
+
+    assert cache.load(filename).material_number == 9237
+    assert cache.load(filename, material=9437).material_number == 9437
+    assert cache.load(filename, material=9437).material_number == 9437
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_load_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        GrouprOutput.load(tmp_path)
+
+
+def test_njoy_cache(U238_356_file, tmp_path):
+    run = tmp_path / "run"
+    run.mkdir()
+    shutil.copyfile(U238_356_file, run / "tape91")
+    (run / "output").write_text("njoy output")
+
+    cache = NjoyCache(tmp_path / "cache")
+    key = cache.key(U238_356_file, "deck")
+    assert key != cache.key(U238_356_file, "another deck")
+
+    destination = tmp_path / "destination"
+    destination.mkdir()
+    assert not cache.get(key, destination)
+
+    cache.put(key, run)
+    assert cache.get(key, destination)
+    assert (destination / "tape91").read_bytes() == U238_356_file.read_bytes()
+    assert (destination / "output").read_text() == "njoy output"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["size"] == U238_356_file.stat().st_size + len("njoy output")
+
+
+def test_njoy_cache_existing_entry(U238_356_file, tmp_path):
+    run = tmp_path / "run"
+    run.mkdir()
+    shutil.copyfile(U238_356_file, run / "tape91")
+    (run / "output").write_text("new output")
+
+    # a complete entry saved by another process is left in place
+    cache = NjoyCache(tmp_path / "cache")
+    entry = tmp_path / "cache" / "key"
+    entry.mkdir()
+    shutil.copyfile(U238_356_file, entry / "tape91")
+    (entry / "output").write_text("first output")
+    cache.put("key", run)
+    assert (entry / "output").read_text() == "first output"
+
+    # an incomplete entry is replaced
+    shutil.rmtree(entry)
+    entry.mkdir()
+    (entry / "output").write_text("partial output")
+    cache.put("key", run)
+    assert (entry / "output").read_text() == "new output"
+
+    # no temporary directories are left behind
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == ["key"]
+
+
+def test_njoy_cache_eviction(U238_356_file, tmp_path):
+    run = tmp_path / "run"
+    run.mkdir()
+    shutil.copyfile(U238_356_file, run / "tape91")
+    size = U238_356_file.stat().st_size
+
+    cache = NjoyCache(tmp_path / "cache", max_size=2 * size)
+    cache.put("first", run)
+    cache.put("second", run)
+    os.utime(tmp_path / "cache" / "first" / "tape91", (0, 0))
+    os.utime(tmp_path / "cache" / "second" / "tape91", (1, 1))
+
+    # reading the first entry makes the second one the least recently used
+    assert cache.get("first", tmp_path)
+    cache.put("third", run)
+
+    assert cache.evictions == 1
+    assert cache.get("third", tmp_path)
+    assert cache.get("first", tmp_path)
+    assert not cache.get("second", tmp_path)
+    assert cache.size <= 2 * size
@@ -0,0 +1,143 @@
+from groupy import GrouprOutput
+from pathlib import Path
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+@pytest.fixture
+def two_temperature_file(U238_356_file, tmp_path):
+    lines = U238_356_file.read_text().splitlines()
+    second = lines[1:-1]
+    second[1] = " 6.000000+2" + second[1][11:]
+    filename = tmp_path / "U238_two_temperatures"
+    filename.write_text("\n".join(lines[:-1] + second + lines[-1:]) + "\n")
+    return filename
+
+
+def coarse_boundaries(obj):
+    """every fifth boundary, which gives 6 groups from the 30"""
+    return obj.energy_boundaries[::5]
+
+
+def test_collapse_same_structure(U238_356_file):
+    obj = GrouprOutput(U238_356_file)
+    collapsed = obj.collapse(obj.energy_boundaries)
+
+    assert np.array_equal(collapsed.energy_boundaries, obj.energy_boundaries)
+    for mt, section in obj.pointwise.items():
+        assert np.allclose(collapsed.pointwise[mt].values, section.values)
+    for mt, section in obj.scattering_matrices.items():
+        assert np.allclose(collapsed.scattering_matrices[mt].values, section.values)
+
+
+def test_collapse(U238_356_file):
+    obj = GrouprOutput(U238_356_file)
+    boundaries = coarse_boundaries(obj)
+    collapsed = obj.collapse(boundaries)
+
+    assert np.array_equal(collapsed.energy_boundaries, boundaries)
+
+    capture = obj.pointwise[102]
+    weighted = capture.values[5:10] * capture.flux_values[5:10]
+    assert collapsed.pointwise[102].values.shape == (6,)
+    assert np.isclose(
+        collapsed.pointwise[102].values[1],
+        weighted.sum() / capture.flux_values[5:10].sum(),
+    )
+    assert np.isclose(
+        collapsed.pointwise[102].flux_values.sum(), capture.flux_values.sum()
+    )
+
+    fission = obj.pointwise[18]
+    nubar = obj.pointwise[452]
+    weights = fission.values[25:30] * nubar.flux_values[25:30]
+    assert np.isclose(
+        collapsed.pointwise[452].values[5],
+        (nubar.values[25:30] * weights).sum() / weights.sum(),
+    )
+
+    assert np.isclose(
+        collapsed.outgoing_distributions[18].values.sum(),
+        obj.outgoing_distributions[18].values.sum(),
+    )
+
+    elastic = obj.scattering_matrices[2]
+    flux = elastic.flux_values[:, 0]
+    matrix = collapsed.scattering_matrices[2].values
+    assert matrix.shape == (6, 6, 5)
+    for ell in range(5):
+        block = flux[10:15, None] * elastic.values[10:15, 10:15, ell]
+        expected = block.sum() / flux[10:15].sum()
+        assert np.isclose(matrix[2, 2, ell], expected)
+
+    # the scattering out of each coarse group is the flux weighted average
+    # of the scattering out of its fine groups
+    out = elastic.values[:, :, 0].sum(axis=1)
+    assert np.allclose(
+        matrix[:, :, 0].sum(axis=1),
+        [
+            (flux[g : g + 5] * out[g : g + 5]).sum() / flux[g : g + 5].sum()
+            for g in range(0, 30, 5)
+        ],
+    )
+
+
+def test_collapse_sparse(U238_356_file):
+    dense = GrouprOutput(U238_356_file)
+    sparse = GrouprOutput(U238_356_file, sparse=True)
+    boundaries = coarse_boundaries(dense)
+
+    dense = dense.collapse(boundaries)
+    sparse = sparse.collapse(boundaries)
+    for mt, section in dense.scattering_matrices.items():
+        assert np.allclose(
+            sparse.scattering_matrices[mt].values.toarray(), section.values
+        )
+
+
+def test_collapse_weights(U238_356_file):
+    obj = GrouprOutput(U238_356_file)
+    boundaries = obj.energy_boundaries[[0, 10, 30]]
+    collapsed = obj.collapse(boundaries, weights=np.ones(30))
+
+    values = obj.pointwise[1].values
+    assert np.allclose(
+        collapsed.pointwise[1].values, [values[:10].mean(), values[10:].mean()]
+    )
+
+    with pytest.raises(ValueError):
+        obj.collapse(boundaries, weights=np.ones(29))
+
+
+def test_collapse_not_nested(U238_356_file):
+    obj = GrouprOutput(U238_356_file)
+
+    with pytest.raises(ValueError, match="not nested"):
+        obj.collapse([obj.energy_boundaries[0], 1.0, obj.energy_boundaries[-1]])
+
+    with pytest.raises(ValueError):
+        obj.collapse(obj.energy_boundaries[::-1])
+
+
+def test_collapse_temperatures(U238_356_file, two_temperature_file):
+    single = GrouprOutput(U238_356_file)
+    boundaries = coarse_boundaries(single)
+    single = single.collapse(boundaries)
+
+    for sparse in [False, True]:
+        obj = GrouprOutput(two_temperature_file, sparse=sparse).collapse(boundaries)
+        assert obj.pointwise[102].values.shape == (2, 6)
+        assert np.allclose(obj.pointwise[102].values[1], single.pointwise[102].values)
+        assert obj.scattering_matrices[2].flux_values.shape == (2, 6, 5)
+
+        hot = obj.at_temperature(1)
+        values = hot.scattering_matrices[2].values
+        if sparse:
+            values = values.toarray()
+        assert np.allclose(values, single.scattering_matrices[2].values)
@@ -0,0 +1,98 @@
+from groupy.base._decoder import (
+    decode_fields,
+    decode_identifiers,
+    decode_section,
+    read_records,
+)
+from pathlib import Path
+import time
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+def test_decode_fields():
+    fields = [
+        " 1.234567+5",
+        " 2.43155-12",
+        "-1.336174-9",
+        " 1.00000+10",
+        " 0.10574753",
+        " 9.223800E4",
+        "         30",
+        "         -1",
+        "           ",
+    ]
+    chars = np.frombuffer("".join(fields).encode("ascii"), dtype=np.uint8)
+    values = decode_fields(chars.reshape((-1, 11)))
+
+    assert np.array_equal(
+        values,
+        [1.234567e5, 2.43155e-12, -1.336174e-9, 1e10, 0.10574753, 92238, 30, -1, 0],
+    )
+
+
+def test_decode_identifiers(U238_356_file):
+    lines = U238_356_file.read_bytes().splitlines(keepends=True)
+    assert decode_identifiers(lines[1]) == (9237, 1, 451)
+    assert decode_identifiers(lines[-1]) == (-1, 0, 0)
+
+    # blank and missing numbers are read as zero
+    assert decode_identifiers(b" " * 66 + b"9237 0  0\n") == (9237, 0, 0)
+    assert decode_identifiers(b"short line\n") == (0, 0, 0)
+
+
+def test_read_records(U238_356_file):
+    text = U238_356_file.read_text()
+    values, ids = read_records(text)
+
+    assert values.shape == (4743, 6)
+    assert values[1, 0] == 92238
+    assert values[3, 1] == 1e10
+    assert np.array_equal(ids[1], [9237, 1, 451])
+    assert np.array_equal(ids[-1], [-1, 0, 0])
+
+    # the same result from a list of lines and from bytes
+    lines_values, _ = read_records(text.splitlines())
+    bytes_values, _ = read_records(U238_356_file.read_bytes())
+    assert np.array_equal(values, lines_values, equal_nan=True)
+    assert np.array_equal(values, bytes_values, equal_nan=True)
+
+
+def test_decode_section(U238_356_file):
+    lines = U238_356_file.read_text().splitlines()
+    start = lines.index(next(l for l in lines if l[70:75] == " 3 16"))
+
+    head, records, data = decode_section(lines[start : start + 14])
+
+    assert head["C1"] == 92238
+    assert head["MF"] == 3 and head["MT"] == 16
+    assert len(records) == 6
+    assert np.array_equal(records["N2"], [25, 26, 27, 28, 29, 30])
+    assert np.array_equal(records["start"], [0, 2, 4, 6, 8, 10])
+    assert len(data) == 12
+    assert data[1] == 3.383956e-1
+
+
+@pytest.mark.slow
+def test_decoder_speedup(U238_356_file):
+    ff = pytest.importorskip("fortranformat")
+    lines = U238_356_file.read_text().splitlines()
+
+    value_line = ff.FortranRecordReader("(6G11.0)")
+    start = time.perf_counter()
+    for line in lines:
+        value_line.read(line)
+    line_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_records(lines)
+    bulk_time = time.perf_counter() - start
+
+    print(f"fortranformat: {line_time:.4f} s, bulk decoder: {bulk_time:.4f} s")
+    assert line_time / bulk_time > 10
@@ -0,0 +1,138 @@
+from groupy.base._endf_header import read_endf_headers
+from groupy.njoy import _read_endf_materials
+import pytest
+
+
+def endf_line(fields, mat, mf, mt, number=0):
+    text = "".join(f"{field:>11}" for field in fields)
+    return f"{text:<66}{mat:4d}{mf:2d}{mt:3d}{number:5d}"
+
+
+def endf_material(mat, za, sections, description, directory_size=None):
+    """Function to make the lines of a small ENDF-6 material, with the
+    given number of data lines in each (MF, MT) section"""
+
+    directory = [(1, 451, 4 + len(description) + len(sections) + 1)]
+    directory += [(mf, mt, size + 1) for mf, mt, size in sections]
+    if directory_size is not None:
+        directory[-1] = directory[-1][:2] + (directory_size,)
+
+    lines = [
+        endf_line([f"{za:.1f}", "2.360058+2", 1, 1, 0, 0], mat, 1, 451),
+        endf_line(["0.0", "0.0", 0, 0, 0, 6], mat, 1, 451),
+        endf_line(["1.0", "2.000000+7", 0, 0, 10, 8], mat, 1, 451),
+        endf_line(["0.0", "0.0", 0, 0, len(description), len(directory)], mat, 1, 451),
+    ]
+    lines += [f"{text:<66}{mat:4d} 1451    0" for text in description]
+    lines += [
+        endf_line(["", "", mf, mt, nc, 0], mat, 1, 451) for mf, mt, nc in directory
+    ]
+    lines.append(endf_line([], mat, 1, 0))
+
+    previous = 1
+    for mf, mt, size in sections:
+        if mf != previous:
+            lines.append(endf_line([], mat, 0, 0))
+            previous = mf
+        lines.append(endf_line([f"{za:.1f}", "2.360058+2", 0, 0, 0, 0], mat, mf, mt))
+        lines += [endf_line(["1.000000-5", "2.5"] * 3, mat, mf, mt)] * size
+        lines.append(endf_line([], mat, mf, 0))
+    lines.append(endf_line([], mat, 0, 0))
+    lines.append(endf_line([], 0, 0, 0))
+    return lines
+
+
+@pytest.fixture
+def U238_sections():
+    return [(1, 452, 3), (3, 1, 40), (3, 2, 40), (3, 102, 35), (5, 18, 12)]
+
+
+@pytest.fixture
+def U238_description():
+    return [" 92-U -238 LANL,ORNL  EVAL-JUL18 Capote, Trkov, ...", "", " test"]
+
+
+def write_tape(filename, materials):
+    lines = [" synthetic tape" + " " * 51 + "   1 0  0    0"]
+    for material in materials:
+        lines += material
+    lines.append(endf_line([], -1, 0, 0))
+    filename.write_text("\n".join(lines) + "\n")
+    return filename
+
+
+def test_read_endf_headers(tmp_path, U238_sections, U238_description):
+    filename = write_tape(
+        tmp_path / "U238.endf",
+        [endf_material(9237, 92238, U238_sections, U238_description)],
+    )
+
+    (header,) = read_endf_headers(filename)
+    assert header.mat == 9237
+    assert header.za == 92238.0
+    assert header.awr == pytest.approx(236.0058)
+    assert header.description.splitlines()[0][:11] == " 92-U -238 "
+    assert header.description.splitlines()[2] == " test"
+    assert header.sections == [(1, 451)] + [(mf, mt) for mf, mt, _ in U238_sections]
+    assert header.file_numbers == [1, 3, 5]
+    assert header.has_section(1, 452)
+    assert header.has_section(5, 18)
+    assert not header.has_section(5, 455)
+
+
+def test_several_materials(tmp_path, U238_sections, U238_description):
+    U235_sections = [(3, 1, 20), (3, 18, 20)]
+    filename = write_tape(
+        tmp_path / "tape.endf",
+        [
+            endf_material(9237, 92238, U238_sections, U238_description),
+            endf_material(9228, 92235, U235_sections, [" 92-U -235"]),
+        ],
+    )
+
+    headers = read_endf_headers(filename)
+    assert [header.mat for header in headers] == [9237, 9228]
+    assert headers[1].za == 92235.0
+    assert headers[1].description == " 92-U -235"
+
+    assert _read_endf_materials(filename) == [(9237, True, True), (9228, False, False)]
+
+
+def test_scan_fallback(tmp_path, U238_sections, U238_description):
+    # a wrong line count in the directory, or lines of different lengths,
+    # can not be skipped with a seek, so the material is scanned instead
+    wrong_size = endf_material(
+        9237, 92238, U238_sections, U238_description, directory_size=3
+    )
+    stripped = [
+        line.rstrip()
+        for line in endf_material(9228, 92235, [(3, 1, 5)], [" 92-U -235"])
+    ]
+    filename = write_tape(tmp_path / "tape.endf", [wrong_size, stripped])
+
+    headers = read_endf_headers(filename)
+    assert [header.mat for header in headers] == [9237, 9228]
+    assert headers[0].has_section(5, 18)
+    assert headers[1].sections == [(1, 451), (3, 1)]
+
+
+def test_missing_directory(tmp_path, U238_sections):
+    # a material that does not start with MT451 is scanned for its sections
+    lines = endf_material(9237, 92238, U238_sections, [])
+    start = next(index for index, line in enumerate(lines) if line[70:75] == " 1452")
+    filename = write_tape(tmp_path / "tape.endf", [lines[start:]])
+
+    (header,) = read_endf_headers(filename)
+    assert header.mat == 9237
+    assert header.description == ""
+    assert header.sections == [(mf, mt) for mf, mt, _ in U238_sections]
+
+
+def test_not_endf(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_endf_headers(tmp_path / "missing.endf")
+
+    empty = tmp_path / "empty.endf"
+    empty.write_text("")
+    with pytest.raises(ValueError):
+        read_endf_headers(empty)
@@ -0,0 +1,65 @@
+"""Functions shared by the tests to write synthetic GENDF records"""
+
+
+def endf_float(value):
+    # drop a digit of the mantissa when a sign or exponent digit needs room
+    for digits in [6, 5, 4]:
+        mantissa, exponent = f"{value:.{digits}e}".split("e")
+        field = f"{mantissa}{int(exponent):+d}"
+        if len(field) <= 11:
+            return field.rjust(11)
+
+
+def synthetic_section(number_groups, band_width=20, number_legendre=1):
+    """MF6 MT2 section with a band of BAND_WIDTH columns below each row"""
+
+    def line(fields, number):
+        return "".join(fields).ljust(66) + f"9237 6  2{number:5d}"
+
+    lines = [
+        line(
+            [
+                endf_float(92238),
+                endf_float(0),
+                "%11d" % number_legendre,
+                "%11d" % 1,
+                "%11d" % 0,
+                "%11d" % number_groups,
+            ],
+            1,
+        )
+    ]
+    for ig in range(1, number_groups + 1):
+        ig2lo = max(1, ig - band_width + 1)
+        ng2 = ig - ig2lo + 2
+        nw = ng2 * number_legendre
+        lines.append(
+            line(
+                [endf_float(293), endf_float(0)]
+                + ["%11d" % v for v in [ng2, ig2lo, nw, ig]],
+                len(lines) + 1,
+            )
+        )
+        vals = [endf_float(1e-3 * (1 + k % 7)) for k in range(nw)]
+        for i in range(0, nw, 6):
+            lines.append(line(vals[i : i + 6], len(lines) + 1))
+    lines.append(line([], 99999)[:66] + "9237 6  099999")
+    return lines
+
+
+def add_material_copy(gendf_file, filename, mat, za=None):
+    """writes GENDF_FILE to FILENAME with a copy of its material after it,
+    renumbered to MAT and, if given, with the ZA changed to ZA"""
+
+    lines = gendf_file.read_text().splitlines()
+    tpid, material, tend = lines[0], lines[1:-1], lines[-1]
+    old_mat, old_za = material[0][66:70], material[0][:11]
+    new_za = old_za if za is None else endf_float(za)
+    copy = [
+        line[:66].replace(old_za, new_za)
+        + line[66:70].replace(old_mat, f"{mat:4d}")
+        + line[70:]
+        for line in material
+    ]
+    filename.write_text("\n".join([tpid] + material + copy + [tend]) + "\n")
+    return filename
@@ -0,0 +1,68 @@
+from groupy.base._gendf_tape import GendfTape
+from groupy import GrouprOutput
+from pathlib import Path
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+def test_U238_356_index(U238_356_file):
+    tape = GendfTape(U238_356_file)
+
+    assert tape.title == "test with 238U"
+    assert tape.material_numbers == [9237]
+    assert tape.file_numbers(9237) == [1, 3, 5, 6]
+    assert len(tape.section_numbers(9237, 3)) == 53
+    assert tape.section_numbers(9237, 5) == [18]
+
+    # MF3 MT16 is 12 lines, plus its HEAD and SEND records
+    lines = bytes(tape.section(9237, 3, 16)).decode("ascii").splitlines()
+    assert len(lines) == 14
+    assert lines[0][66:75] == "9237 3 16"
+    assert lines[-1][66:] == "9237 3  099999"
+
+    with pytest.raises(KeyError):
+        tape.section(9237, 3, 3)
+
+
+def test_unpadded_lines(U238_356_file, tmp_path):
+    # the same file with the trailing spaces stripped, without a final newline
+    lines = U238_356_file.read_text().splitlines()
+    stripped = tmp_path / "stripped"
+    stripped.write_text("\n".join(line.rstrip() for line in lines))
+
+    tape = GendfTape(stripped)
+    assert tape.title == "test with 238U"
+    assert np.array_equal(tape.index, GendfTape(U238_356_file).index)
+
+    obj = GrouprOutput(stripped)
+    assert np.isclose(obj.scattering_matrices[2].values[4, 3, 0], 7.07267e-2, rtol=0.01)
+
+
+def test_endftk_backend(U238_356_file):
+    pytest.importorskip("ENDFtk")
+
+    native = GrouprOutput(U238_356_file)
+    endftk = GrouprOutput(U238_356_file, backend="endftk")
+
+    assert native.title == endftk.title
+    assert native.material_number == endftk.material_number
+    assert np.array_equal(native.energy_boundaries, endftk.energy_boundaries)
+    assert list(native.pointwise) == list(endftk.pointwise)
+    for mt in native.pointwise:
+        assert np.array_equal(native.pointwise[mt].values, endftk.pointwise[mt].values)
+    for mt in native.scattering_matrices:
+        assert np.array_equal(
+            native.scattering_matrices[mt].values,
+            endftk.scattering_matrices[mt].values,
+        )
+
+
+def test_unknown_backend(U238_356_file):
+    with pytest.raises(ValueError):
+        GrouprOutput(U238_356_file, backend="fortran")
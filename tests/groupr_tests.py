@@ -60,3 +60,140 @@ def test_U238_356(U238_356_file, test_dir):
             total[:-1, :-1] += obj.scattering_matrices[mt].values[:, :, 0]
 
     assert np.allclose(total, inel[1:, 1:])
+
+
+def test_U238_356_sparse(U238_356_file, test_dir):
+    dense = GrouprOutput(U238_356_file)
+    obj = GrouprOutput(U238_356_file, sparse=True)
+
+    for mt, matrix in obj.scattering_matrices.items():
+        assert np.array_equal(
+            matrix.values.toarray(), dense.scattering_matrices[mt].values
+        )
+
+    dense.write_to_csv(title="dense", directory=test_dir)
+    obj.write_to_csv(title="sparse", directory=test_dir)
+    for mt in [2, 4, 16]:
+        assert np.array_equal(
+            np.genfromtxt(
+                test_dir / f"dense_scattering_matrix_{mt}.csv", delimiter=","
+            ),
+            np.genfromtxt(
+                test_dir / f"sparse_scattering_matrix_{mt}.csv", delimiter=","
+            ),
+        )
+
+
+def test_U238_356_tables(U238_356_file, tmp_path):
+    obj = GrouprOutput(U238_356_file, sparse=True)
+    values = obj.scattering_matrices[2].values.toarray()
+
+    # higher Legendre orders get their own files, and orders past the order
+    # of a matrix are zeros
+    obj.write_to_csv(title="orders", directory=tmp_path, legendre_orders=[0, 1, 9])
+    p1 = np.genfromtxt(tmp_path / "orders_scattering_matrix_2_1.csv", delimiter=",")
+    assert np.allclose(p1[1:-1, 1:-1], values[:, :, 1])
+    p9 = np.genfromtxt(tmp_path / "orders_scattering_matrix_2_9.csv", delimiter=",")
+    assert not p9[1:, 1:].any()
+
+    # the binary tables are the same as the CSV tables
+    obj.write_tables(title="binary", directory=tmp_path, format="npy")
+    for name in ["pointwise", "outgoing", "scattering_matrix_4"]:
+        assert np.allclose(
+            np.load(tmp_path / f"binary_{name}.npy"),
+            np.genfromtxt(tmp_path / f"orders_{name}.csv", delimiter=","),
+        )
+
+    with pytest.raises(ValueError):
+        obj.write_tables(directory=tmp_path, format="xlsx")
+
+    obj.write_to_npz(tmp_path / "all.npz", compressed=True)
+    with np.load(tmp_path / "all.npz") as arrays:
+        assert np.array_equal(arrays["energy_boundaries"], obj.energy_boundaries)
+        assert np.array_equal(arrays["scattering_matrices_2_values"], values)
+        assert np.array_equal(
+            arrays["pointwise_102_flux_values"], obj.pointwise[102].flux_values
+        )
+
+
+def test_U238_356_lazy(U238_356_file):
+    obj = GrouprOutput(U238_356_file)
+
+    assert len(obj.pointwise) == 53
+    assert 452 in obj.pointwise
+    assert 3 not in obj.pointwise
+    assert obj.pointwise.loaded == []
+    assert obj.scattering_matrices.loaded == []
+
+    total = obj.pointwise[1]
+    assert obj.pointwise.loaded == [1]
+    assert obj.pointwise[1] is total
+
+    with pytest.raises(KeyError):
+        obj.pointwise[3]
+
+    eager = GrouprOutput(U238_356_file, eager=True)
+    assert isinstance(eager.pointwise, dict)
+    assert list(eager.pointwise) == list(obj.pointwise)
+    assert np.array_equal(eager.pointwise[1].values, total.values)
+    assert np.array_equal(
+        eager.scattering_matrices[2].values, obj.scattering_matrices[2].values
+    )
+
+
+@pytest.fixture
+def two_temperature_file(U238_356_file, tmp_path):
+    """the U238 material twice, as GROUPR writes a run with two
+    temperatures, with the second one at 600 K"""
+
+    lines = U238_356_file.read_text().splitlines()
+    second = lines[1:-1]
+    second[1] = " 6.000000+2" + second[1][11:]
+    filename = tmp_path / "U238_two_temperatures"
+    filename.write_text("\n".join(lines[:-1] + second + lines[-1:]) + "\n")
+    return filename
+
+
+def test_two_temperatures(U238_356_file, two_temperature_file, tmp_path):
+    single = GrouprOutput(U238_356_file)
+    obj = GrouprOutput(two_temperature_file)
+
+    assert np.array_equal(obj.temperatures, [293, 600])
+    assert np.array_equal(single.temperatures, [293])
+    assert np.array_equal(obj.energy_boundaries, single.energy_boundaries)
+
+    assert obj.pointwise[1].values.shape == (2, 30)
+    assert np.array_equal(obj.pointwise[1].values[1], single.pointwise[1].values)
+    assert np.array_equal(obj.pointwise[1].temperature, [293, 600])
+    assert obj.scattering_matrices[2].values.shape == (2, 30, 30, 5)
+    assert obj.scattering_matrices[2].flux_values.shape == (2, 30, 5)
+    assert np.array_equal(
+        obj.outgoing_distributions[18].values[0],
+        single.outgoing_distributions[18].values,
+    )
+
+    hot = obj.at_temperature(1)
+    assert np.array_equal(hot.temperatures, [600])
+    assert hot.pointwise[1].temperature == 600
+    assert np.array_equal(
+        hot.scattering_matrices[2].values, single.scattering_matrices[2].values
+    )
+
+    obj.write_to_csv(title="two", directory=tmp_path)
+    assert (tmp_path / "two_293K_pointwise.csv").exists()
+    assert (tmp_path / "two_600K_scattering_matrix_2.csv").exists()
+
+    sparse = GrouprOutput(two_temperature_file, sparse=True)
+    assert len(sparse.scattering_matrices[2].values) == 2
+    assert np.array_equal(
+        sparse.scattering_matrices[2].values[1].toarray(),
+        obj.scattering_matrices[2].values[1],
+    )
+
+    sparse.save(tmp_path / "archive")
+    loaded = GrouprOutput.load(tmp_path / "archive")
+    assert np.array_equal(loaded.temperatures, [293, 600])
+    assert np.array_equal(
+        loaded.scattering_matrices[2].values[0].toarray(),
+        obj.scattering_matrices[2].values[0],
+    )
@@ -0,0 +1,128 @@
+from groupy import GrouprOutput, GrouprLibrary, get_grouped_data
+import groupy.grouped
+import shutil
+from groupy.base._gendf_tape import GendfTape
+from pathlib import Path
+from gendf_helpers import add_material_copy
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+@pytest.fixture
+def library_file(U238_356_file, tmp_path):
+    """a GENDF tape with the U238 material, then a copy of it as MAT9437
+    with the ZA of Pu239"""
+
+    return add_material_copy(U238_356_file, tmp_path / "library", 9437, 94239)
+
+
+def test_library(U238_356_file, library_file):
+    single = GrouprOutput(U238_356_file)
+    library = GrouprLibrary(library_file)
+
+    assert library.material_numbers == [9237, 9437]
+    assert library.ZA_values == [92238, 94239]
+    assert len(library) == 2 and 9437 in library
+
+    plutonium = library.by_ZA(94239)
+    assert plutonium is library[9437]
+    assert plutonium.material_number == 9437
+    assert np.array_equal(plutonium.pointwise[18].values, single.pointwise[18].values)
+    assert np.array_equal(
+        library[9237].scattering_matrices[2].values,
+        single.scattering_matrices[2].values,
+    )
+
+    with pytest.raises(KeyError):
+        library[125]
+    with pytest.raises(KeyError):
+        library.by_ZA(1001)
+
+    # the first material is read by default, and others can be chosen
+    assert GrouprOutput(library_file).material_number == 9237
+    assert GrouprOutput(library_file, material=9437).ZA == 94239
+    with pytest.raises(KeyError):
+        GrouprOutput(library_file, material=125)
+
+
+def test_library_same_ZA(U238_356_file, tmp_path):
+    # two evaluations of U238 with different MAT numbers are both kept
+    filename = add_material_copy(U238_356_file, tmp_path / "library", 9238)
+    library = GrouprLibrary(filename)
+
+    assert library.material_numbers == [9237, 9238]
+    assert library.ZA_values == [92238, 92238]
+    assert library[9238].material_number == 9238
+    with pytest.raises(ValueError):
+        library.by_ZA(92238)
+
+
+def test_library_eager(library_file):
+    library = GrouprLibrary(library_file, eager=True, max_workers=2)
+
+    for mat, obj in library.items():
+        assert isinstance(obj.pointwise, dict)
+        assert len(obj.pointwise) == 53
+    assert np.array_equal(
+        library[9237].outgoing_distributions[18].values,
+        library[9437].outgoing_distributions[18].values,
+    )
+
+
+def test_shared_tape(library_file):
+    tape = GendfTape(library_file)
+    plutonium = GrouprOutput(library_file, material=9437, tape=tape)
+    assert plutonium._tape is tape
+    assert plutonium.ZA == 94239
+
+    # the materials of a library share one index
+    library = GrouprLibrary(library_file)
+    assert library[9237]._tape is library[9437]._tape
+
+    with pytest.raises(ValueError):
+        GrouprOutput(library_file, backend="endftk", tape=tape)
+
+
+def test_get_grouped_data_library(U238_356_file, library_file, tmp_path, monkeypatch):
+    def fake_run_njoy(endf6_file, title, directory, *args, **kwargs):
+        shutil.copyfile(endf6_file, Path(directory) / "tape91")
+
+    monkeypatch.setattr(groupy.grouped, "run_njoy", fake_run_njoy)
+
+    # every material of a library tape is returned and written
+    library_dir = tmp_path / "library_run"
+    library_dir.mkdir()
+    library = get_grouped_data(library_file, "library", directory=library_dir)
+    assert isinstance(library, GrouprLibrary)
+    assert library.material_numbers == [9237, 9437]
+    for mat in library:
+        assert (library_dir / f"testwith238U_MAT{mat}_pointwise.csv").exists()
+
+    # a tape with one material still gives a GrouprOutput
+    single_dir = tmp_path / "single_run"
+    single_dir.mkdir()
+    single = get_grouped_data(U238_356_file, "single", directory=single_dir)
+    assert isinstance(single, GrouprOutput)
+    assert (single_dir / "testwith238U_pointwise.csv").exists()
+
+
+def test_library_save_load(library_file, tmp_path):
+    library = GrouprLibrary(library_file)
+    library.save(tmp_path / "saved")
+
+    loaded = GrouprLibrary.load(tmp_path / "saved")
+    assert loaded.material_numbers == [9237, 9437]
+    assert loaded.by_ZA(94239) is loaded[9437]
+    assert np.array_equal(
+        loaded[9437].scattering_matrices[2].values,
+        library[9437].scattering_matrices[2].values,
+    )
+
+    with pytest.raises(FileNotFoundError):
+        GrouprLibrary.load(tmp_path)
@@ -0,0 +1,305 @@
+from groupy import run_njoy, run_njoy_async, NjoyRunError, ScratchSpace
+from groupy.base._run_metrics import parse_module_times
+import groupy.njoy
+from pathlib import Path
+import asyncio
+import json
+import os
+import threading
+import time
+import pytest
+
+FAKE_NJOY = """#!/bin/sh
+echo $$ > pid
+cat > received_input
+echo " njoy 2016.72  03Feb23                                       10/18/26 09:12:44"
+echo " reconr...                                                            0.0s"
+echo " broadr...                                                            0.4s"
+echo " groupr...                                                            1.5s"
+if [ -n "$FAKE_NJOY_MESSAGE" ]; then echo "$FAKE_NJOY_MESSAGE" >&2; fi
+sleep "${FAKE_NJOY_SLEEP:-0}"
+cp tape20 tape91
+echo "                                                                      2.0s"
+exit "${FAKE_NJOY_EXIT:-0}"
+"""
+
+
+@pytest.fixture
+def fake_njoy(tmp_path, monkeypatch):
+    """puts a fake njoy executable on the path and skips reading the ENDF
+    file, so that the process handling can be tested without NJOY"""
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "njoy").write_text(FAKE_NJOY)
+    (bin_dir / "njoy").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("LD_LIBRARY_PATH", str(tmp_path))
+
+    endf6_file = tmp_path / "fake.endf"
+    endf6_file.write_text("fake endf\n")
+
+    def prepare_run(endf6_file, title, directory, *args):
+        directory = Path(directory).absolute()
+        (directory / "input").write_text(title)
+        return Path(endf6_file).absolute(), directory, title
+
+    monkeypatch.setattr(groupy.njoy, "_prepare_run", prepare_run)
+    return endf6_file
+
+
+def test_run_njoy_in_directory(fake_njoy, tmp_path):
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    cwd = os.getcwd()
+
+    run_njoy(fake_njoy, "sync run", directory=run_dir)
+
+    assert os.getcwd() == cwd
+    assert (run_dir / "received_input").read_text() == "sync run"
+    assert (run_dir / "tape91").read_text() == "fake endf\n"
+
+
+def test_run_njoy_async_concurrent(fake_njoy, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_NJOY_SLEEP", "0.2")
+    run_dirs = [tmp_path / f"run{i}" for i in range(4)]
+    for run_dir in run_dirs:
+        run_dir.mkdir()
+
+    async def run_all():
+        await asyncio.gather(
+            *[
+                run_njoy_async(fake_njoy, run_dir.name, directory=run_dir)
+                for run_dir in run_dirs
+            ]
+        )
+
+    asyncio.run(run_all())
+
+    for run_dir in run_dirs:
+        assert (run_dir / "received_input").read_text() == run_dir.name
+        assert (run_dir / "tape91").exists()
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_run_njoy_async_timeout(fake_njoy, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_NJOY_SLEEP", "30")
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        asyncio.run(run_njoy_async(fake_njoy, "", directory=tmp_path, timeout=0.5))
+
+    pid = int((tmp_path / "pid").read_text())
+    assert not _is_running(pid)
+    assert not (tmp_path / "tape91").exists()
+
+
+def test_run_njoy_async_cancel(fake_njoy, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_NJOY_SLEEP", "30")
+
+    async def cancel():
+        task = asyncio.create_task(run_njoy_async(fake_njoy, "", directory=tmp_path))
+        while not (tmp_path / "pid").exists():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+
+    pid = int((tmp_path / "pid").read_text())
+    assert not _is_running(pid)
+
+
+def test_run_njoy_metrics(fake_njoy, tmp_path):
+    log = tmp_path / "metrics.jsonl"
+
+    metrics = run_njoy(fake_njoy, "first", directory=tmp_path, metrics_log=log)
+    assert metrics.module_times == [
+        ("reconr", pytest.approx(0.4)),
+        ("broadr", pytest.approx(1.1)),
+        ("groupr", pytest.approx(0.5)),
+    ]
+    assert metrics.modules == ["reconr", "broadr", "groupr"]
+    assert metrics.module_time("broadr") == pytest.approx(1.1)
+    assert metrics.wall_time > 0
+    assert metrics.cpu_time >= 0
+    assert metrics.peak_rss > 0
+    assert metrics.returncode == 0
+
+    metrics = asyncio.run(
+        run_njoy_async(fake_njoy, "second", directory=tmp_path, metrics_log=log)
+    )
+    assert metrics.module_time("groupr") == pytest.approx(0.5)
+    assert metrics.cpu_time >= 0
+    assert metrics.peak_rss > 0
+
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [record["title"] for record in records] == ["first", "second"]
+    assert records[0]["module_times"][1] == ["broadr", pytest.approx(1.1)]
+    assert records[0]["peak_rss"] > 0
+
+
+def test_run_njoy_timeout(fake_njoy, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_NJOY_SLEEP", "30")
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        run_njoy(fake_njoy, "", directory=tmp_path, timeout=0.5)
+
+    pid = int((tmp_path / "pid").read_text())
+    assert not _is_running(pid)
+    assert not (tmp_path / "tape91").exists()
+
+
+def test_run_njoy_kill_before_reap(fake_njoy, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_NJOY_SLEEP", "30")
+    signals = []
+    kill = os.kill
+
+    def checked_kill(pid, signal):
+        # a child that has been reaped can't be waited on any more, and its
+        # pid may already belong to another process
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+        signals.append(pid)
+        kill(pid, signal)
+
+    monkeypatch.setattr(os, "kill", checked_kill)
+    with pytest.raises(RuntimeError, match="timed out"):
+        run_njoy(fake_njoy, "", directory=tmp_path, timeout=0.3)
+    assert signals
+
+
+def test_parse_module_times():
+    listing = """
+ njoy 2016.72  03Feb23                                       10/18/26 09:12:44
+ *****************************************************************************
+
+ reconr...                                                            0.0s
+
+ broadr...                                                            2.5s
+
+ groupr...                                                           12.0s
+"""
+    assert parse_module_times(listing) == [
+        ("reconr", 2.5),
+        ("broadr", 9.5),
+        ("groupr", None),
+    ]
+    assert parse_module_times("") == []
+
+
+def _run_sync(endf6_file, directory, **kwargs):
+    return run_njoy(endf6_file, "", directory=directory, **kwargs)
+
+
+def _run_async(endf6_file, directory, **kwargs):
+    return asyncio.run(run_njoy_async(endf6_file, "", directory=directory, **kwargs))
+
+
+@pytest.mark.parametrize("run", [_run_sync, _run_async])
+def test_run_njoy_error(fake_njoy, tmp_path, monkeypatch, run):
+    monkeypatch.setenv("FAKE_NJOY_SLEEP", "30")
+    monkeypatch.setenv("FAKE_NJOY_MESSAGE", " ***error in groupr***mat not found")
+
+    start = time.perf_counter()
+    with pytest.raises(NjoyRunError, match="error in groupr") as error:
+        run(fake_njoy, tmp_path)
+    assert time.perf_counter() - start < 10
+
+    assert error.value.reason == "error"
+    assert error.value.module == "groupr"
+    assert error.value.line == "***error in groupr***mat not found"
+    assert "broadr..." in error.value.listing
+    assert not _is_running(int((tmp_path / "pid").read_text()))
+
+
+@pytest.mark.parametrize("run", [_run_sync, _run_async])
+def test_run_njoy_stalled(fake_njoy, tmp_path, monkeypatch, run):
+    monkeypatch.setenv("FAKE_NJOY_SLEEP", "30")
+
+    with pytest.raises(NjoyRunError, match="no output") as error:
+        run(fake_njoy, tmp_path, stall_timeout=0.5)
+
+    assert error.value.reason == "stalled"
+    assert error.value.module == "groupr"
+    assert not _is_running(int((tmp_path / "pid").read_text()))
+
+
+def test_run_njoy_error_patterns(fake_njoy, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_NJOY_MESSAGE", " ---message from broadr---fake warning")
+
+    metrics = _run_sync(fake_njoy, tmp_path)
+    assert metrics.returncode == 0
+
+    with pytest.raises(NjoyRunError) as error:
+        _run_sync(fake_njoy, tmp_path, error_patterns=[r"---message from"])
+    assert error.value.reason == "error"
+
+    monkeypatch.setenv("FAKE_NJOY_MESSAGE", " ***error in groupr***ignored")
+    metrics = _run_sync(fake_njoy, tmp_path, error_patterns=[])
+    assert metrics.returncode == 0
+
+
+@pytest.mark.parametrize("run", [_run_sync, _run_async])
+def test_run_njoy_failed(fake_njoy, tmp_path, monkeypatch, run):
+    monkeypatch.setenv("FAKE_NJOY_EXIT", "77")
+
+    with pytest.raises(NjoyRunError, match="NJOY run failed in groupr") as error:
+        run(fake_njoy, tmp_path)
+    assert error.value.reason == "failed"
+    assert error.value.returncode == 77
+
+
+@pytest.mark.parametrize("run", [_run_sync, _run_async])
+def test_run_njoy_scratch(fake_njoy, tmp_path, run):
+    root = tmp_path / "scratch"
+    root.mkdir()
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    run(fake_njoy, run_dir, scratch=ScratchSpace(root))
+
+    assert (run_dir / "tape91").read_text() == "fake endf\n"
+    assert not (run_dir / "tape20").exists()
+    assert not (run_dir / "received_input").exists()
+    assert list(root.iterdir()) == []
+
+
+def test_run_njoy_scratch_failed(fake_njoy, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_NJOY_EXIT", "77")
+    root = tmp_path / "scratch"
+    root.mkdir()
+
+    with pytest.raises(NjoyRunError):
+        _run_sync(fake_njoy, tmp_path, scratch=ScratchSpace(root, keep_failed=True))
+
+    assert (tmp_path / "received_input").exists()
+    assert (tmp_path / "tape20").is_symlink()
+    assert list(root.iterdir()) == []
+
+
+def test_run_njoy_async_cache_off_loop(fake_njoy, tmp_path):
+    # hashing the ENDF file for the cache key can take a while, so it must
+    # not run on the event loop thread
+    class RecordingCache:
+        threads = []
+
+        def key(self, endf6_file, njoy_input):
+            self.threads.append(threading.current_thread())
+            return "key"
+
+        def get(self, key, directory):
+            return True
+
+    cache = RecordingCache()
+    assert (
+        asyncio.run(run_njoy_async(fake_njoy, "", directory=tmp_path, cache=cache))
+        is None
+    )
+    assert cache.threads and threading.main_thread() not in cache.threads
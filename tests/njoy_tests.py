@@ -199,3 +199,62 @@ def test_writing_groups():
     print(result)
     assert "/" not in result.splitlines()[-9]
     assert "/" in result.splitlines()[-8]
+
+
+def test_njoy_lines_temperatures():
+    result = write_njoy_input(9237, "hot", temperature=[293.6, 600, 900], flux=5)
+    lines = result.splitlines()
+
+    # one reconr, and broadr and groupr at all three temperatures
+    assert result.count(" reconr") == 1
+    assert "  9237 3 / mat ; num temps" in lines
+    assert "  293.6 600.0 900.0 / temperatures [K]" in lines
+    assert "  9237 2 0 5 4 3 1 /" in lines
+    assert "  293.6 600.0 900.0 /" in lines
+
+    # the reaction list is ended once per temperature, then groupr is ended
+    groupr = result[result.index(" groupr") :]
+    assert groupr.count("  6 / scattering matrices") == 3
+    assert groupr.count("  0 /") == 4
+
+
+def test_njoy_lines_sigma0():
+    result = write_njoy_input(9237, "shielded", sigma0=[1e10, 1e3, 10, 0.1])
+    lines = result.splitlines()
+
+    assert "  9237 2 0 5 4 1 4 /" in lines
+    assert "  1.0e10 1.0e03 1.0e01 1.0e-01 /" in lines
+
+    # sigma0 values are written at full precision, not rounded
+    result = write_njoy_input(9237, "shielded", sigma0=[1e10, 1234.5, 15.5, 0.123])
+    assert "  1.0e10 1.2345e03 1.55e01 1.23e-01 /" in result.splitlines()
+
+    # GROUPR needs positive, strictly decreasing values
+    for sigma0 in [[1e3, 1e10], [1e10, 10, 10], [1e10, 0]]:
+        with pytest.raises(ValueError):
+            write_njoy_input(9237, "shielded", sigma0=sigma0)
+
+    # a single sigma0 keeps the short groupr card
+    result = write_njoy_input(9237, "dilute")
+    assert "  9237 2 0 5 4 /" in result.splitlines()
+    assert "  1.0e10 /" in result.splitlines()
+
+
+def test_njoy_lines_materials():
+    result = write_njoy_input(
+        [9228, 9237], "library", has_nubar=[True, False], has_pfns=True
+    )
+    lines = result.splitlines()
+
+    # reconr has a card for each material, broadr and groupr go on to the
+    # next material after the first
+    reconr = result[result.index(" reconr") : result.index(" broadr")]
+    assert reconr.count("/ mat ; num extra points") == 2
+    assert "  9228 1 / mat ; num temps" in lines
+    assert "  9237 / next mat" in lines
+    assert "  9228 2 0 5 4 /" in lines
+
+    groupr = result[result.index(" groupr") :]
+    assert groupr.count("  3 452 'total nubar' /") == 1
+    assert groupr.count("  5 18 'pfns' /") == 2
+    assert groupr.index("  9237 / next mat") > groupr.index("'total nubar'")
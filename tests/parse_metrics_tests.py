@@ -0,0 +1,131 @@
+from groupy import GrouprOutput, GrouprLibrary, ParseMetrics
+from groupy.parse_metrics import SectionMetrics
+from pathlib import Path
+import csv
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+@pytest.fixture
+def two_temperature_file(U238_356_file, tmp_path):
+    lines = U238_356_file.read_text().splitlines()
+    second = lines[1:-1]
+    second[1] = " 6.000000+2" + second[1][11:]
+    filename = tmp_path / "U238_two_temperatures"
+    filename.write_text("\n".join(lines[:-1] + second + lines[-1:]) + "\n")
+    return filename
+
+
+def test_parse_metrics(U238_356_file, tmp_path):
+    seen = []
+    metrics = ParseMetrics(callback=seen.append)
+    obj = GrouprOutput(U238_356_file, metrics=metrics)
+
+    # only MF1 is parsed when the file is opened
+    assert [(record.mf, record.mt) for record in metrics] == [(1, 451)]
+    assert len(metrics.loads) == 1
+    assert metrics.loads[0].backend == "native"
+    assert metrics.loads[0].load_time > 0
+
+    elastic = obj.scattering_matrices[2]
+    record = metrics.sections[-1]
+    assert (record.mat, record.mf, record.mt, record.block) == (9237, 6, 2, 0)
+    assert record.lines == 121
+    assert record.bytes == 121 * 81
+    assert record.array_bytes == elastic.values.nbytes + elastic.flux_values.nbytes
+    assert record.decode_time > 0
+    assert record.peak_memory is None
+
+    dict(obj.pointwise)
+    dict(obj.outgoing_distributions)
+    dict(obj.scattering_matrices)
+    number_sections = 1 + len(obj.pointwise) + 1 + len(obj.scattering_matrices)
+    assert len(metrics) == number_sections
+    assert seen == metrics.sections
+    assert metrics.total_time > 0
+
+    assert len(metrics.table(limit=5).splitlines()) == 6
+
+    metrics.write_csv(tmp_path / "metrics.csv")
+    with open(tmp_path / "metrics.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == number_sections
+    assert rows[0]["mt"] == "451"
+
+
+def test_parse_metrics_table():
+    metrics = ParseMetrics()
+    for mf, mt, lines, decode_time in [
+        (3, 1, 10, 0.002),
+        (6, 2, 50, 0.001),
+        (3, 18, 30, 0.003),
+    ]:
+        metrics.sections.append(
+            SectionMetrics(
+                "file", 9237, mf, mt, 0, lines, 81 * lines, 0.0, decode_time, 0, None
+            )
+        )
+
+    def order(table):
+        return [row.split()[:3] for row in table.splitlines()[1:]]
+
+    assert order(metrics.table()) == [
+        ["9237", "3", "18"],
+        ["9237", "3", "1"],
+        ["9237", "6", "2"],
+    ]
+    assert order(metrics.table(sort="lines", limit=2)) == [
+        ["9237", "6", "2"],
+        ["9237", "3", "18"],
+    ]
+    assert order(metrics.table(sort=None)) == [
+        ["9237", "3", "1"],
+        ["9237", "6", "2"],
+        ["9237", "3", "18"],
+    ]
+    assert metrics.total_time == pytest.approx(0.006)
+    with pytest.raises(ValueError):
+        metrics.table(sort="colour")
+
+
+def test_parse_metrics_memory(U238_356_file):
+    with ParseMetrics(trace_memory=True) as metrics:
+        obj = GrouprOutput(U238_356_file, eager=True, metrics=metrics)
+
+    matrices = [record for record in metrics if record.mf == 6]
+    assert len(matrices) == len(obj.scattering_matrices)
+    assert all(record.peak_memory > 0 for record in matrices)
+    assert "peak (kB)" in metrics.table()
+
+
+def test_parse_metrics_temperatures(two_temperature_file):
+    metrics = ParseMetrics()
+    obj = GrouprOutput(two_temperature_file, metrics=metrics)
+    obj.pointwise[102]
+
+    assert [(record.mt, record.block) for record in metrics] == [
+        (451, 0),
+        (451, 1),
+        (102, 0),
+        (102, 1),
+    ]
+
+
+def test_parse_metrics_library(two_temperature_file):
+    metrics = ParseMetrics()
+    library = GrouprLibrary(two_temperature_file, eager=True, metrics=metrics)
+
+    assert len(metrics.loads) == 1
+    obj = library[9237]
+    assert len(metrics) == 2 * (
+        1
+        + len(obj.pointwise)
+        + len(obj.outgoing_distributions)
+        + len(obj.scattering_matrices)
+    )
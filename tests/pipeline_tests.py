@@ -0,0 +1,126 @@
+from groupy.pipeline import NjoyPipeline
+import groupy.pipeline
+from pathlib import Path
+from gendf_helpers import add_material_copy
+import os
+import pytest
+import numpy as np
+
+U238_356 = Path(__file__).parent / "files" / "U238_356"
+
+FAKE_NJOY = """#!/bin/sh
+cat > received_input
+if grep -q reconr received_input; then
+    echo reconr >> "$FAKE_NJOY_LOG"
+    cp tape20 tape21
+fi
+if grep -q broadr received_input; then
+    test -f tape21 || exit 77
+    grep -q " 900 /" received_input && exit 1
+    echo broadr >> "$FAKE_NJOY_LOG"
+    cp tape21 tape22
+fi
+if grep -q groupr received_input; then
+    test -f tape22 || exit 77
+    echo groupr >> "$FAKE_NJOY_LOG"
+    cp "$FAKE_GENDF" tape91
+fi
+"""
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """a pipeline that runs a fake njoy executable, which logs each stage
+    and gives the U238 GENDF file for every GROUPR stage"""
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "njoy").write_text(FAKE_NJOY)
+    (bin_dir / "njoy").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("LD_LIBRARY_PATH", str(tmp_path))
+    monkeypatch.setenv("FAKE_NJOY_LOG", str(tmp_path / "log"))
+    monkeypatch.setenv("FAKE_GENDF", str(U238_356))
+    monkeypatch.setattr(
+        groupy.pipeline,
+        "_njoy_materials",
+        lambda endf6_file, verbose: (9237, True, True),
+    )
+
+    endf6_file = tmp_path / "U238.endf"
+    endf6_file.write_text("fake endf\n")
+    return NjoyPipeline(endf6_file, tmp_path / "runs", temperature=[293.6, 600])
+
+
+def _log(tmp_path):
+    return (tmp_path / "log").read_text().split()
+
+
+def test_pipeline_shares_pendf(pipeline, tmp_path):
+    options = [
+        {"group_boundaries": 3},
+        {"group_boundaries": 3, "flux": 11},
+        {"group_boundaries": [1e-5, 1, 2e7], "legendre_order": 3},
+    ]
+    outputs = pipeline.groupr_many(options, max_workers=3)
+
+    assert _log(tmp_path) == ["reconr", "broadr", "groupr", "groupr", "groupr"]
+    assert [output.material_number for output in outputs] == [9237] * 3
+    assert pipeline.pendf_file.read_text() == "fake endf\n"
+
+    # each stage has its own input, and the shared PENDF is not kept
+    stages = sorted((tmp_path / "runs" / "groupr").iterdir())
+    assert len(stages) == 3
+    for stage in stages:
+        names = sorted(path.name for path in stage.iterdir())
+        assert names == ["input", "tape91", "wall_time"]
+    inputs = [(stage / "input").read_text() for stage in stages]
+    assert all(" reconr" not in text and " groupr" in text for text in inputs)
+    assert all("  293.6 600.0 /" in text for text in inputs)
+
+    # the same stages are found again instead of run
+    again = NjoyPipeline(
+        pipeline.endf6_file, tmp_path / "runs", temperature=[293.6, 600]
+    )
+    again.groupr(group_boundaries=3)
+    assert len(_log(tmp_path)) == 5
+
+    # a new temperature needs a new broadened PENDF file, but not reconr
+    hot = NjoyPipeline(pipeline.endf6_file, tmp_path / "runs", temperature=1200)
+    assert hot.pendf_key != pipeline.pendf_key
+    hot.groupr(group_boundaries=3)
+    assert _log(tmp_path)[-3:] == ["groupr", "broadr", "groupr"]
+
+
+def test_pipeline_failed_stage(pipeline, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_GENDF", str(tmp_path / "missing"))
+
+    with pytest.raises(RuntimeError):
+        pipeline.groupr(group_boundaries=3)
+
+    # no stage directory is left behind for the failed GROUPR run
+    assert list((tmp_path / "runs" / "groupr").iterdir()) == []
+    assert pipeline.pendf_file.exists()
+
+
+def test_pipeline_several_materials(pipeline, tmp_path, monkeypatch):
+    library_file = add_material_copy(U238_356, tmp_path / "library", 9437, 94239)
+    monkeypatch.setenv("FAKE_GENDF", str(library_file))
+    monkeypatch.setattr(
+        groupy.pipeline,
+        "_njoy_materials",
+        lambda endf6_file, verbose: ([9237, 9437], [True, False], [True, False]),
+    )
+    library = NjoyPipeline(pipeline.endf6_file, tmp_path / "runs", temperature=600)
+
+    # every material is processed in each stage, and read from the output
+    output = library.groupr(group_boundaries=3)
+    assert output.material_numbers == [9237, 9437]
+    assert output.by_ZA(94239) is output[9437]
+
+    inputs = [
+        (stage / "input").read_text()
+        for kind in ["reconr", "broadr"]
+        for stage in (tmp_path / "runs" / kind).iterdir()
+    ]
+    assert all("9237" in text and "9437" in text for text in inputs)
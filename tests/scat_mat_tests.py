@@ -1,5 +1,7 @@
 from groupy.base._scattering_mat_class import ScatteringMatrix
 from pathlib import Path
+from gendf_helpers import synthetic_section
+import time
 import pytest
 import numpy as np
 import ENDFtk
@@ -49,3 +51,49 @@ def test_u238_n2n_scattering_matrix(U238_356):
     assert obj.values[4, 3, 0] == 0
     assert obj.values[25 - 1, 6 - 1, 0] == 2.033472e-7
     assert np.isclose(obj.values[25 - 1, 6 - 1, 4], -9.4936e-11)
+
+
+def test_u238_fission_matrix(U238_356):
+    # NJOY writes MF6 MT18 with the fission spectrum in an IG=0 record, and
+    # the rows below the spectrum threshold as one production value
+    # (IG2LO=0) that multiplies it; the rows above it are full bands
+    obj = ScatteringMatrix(U238_356.section(18).content.splitlines())
+    spectrum_start = np.array([2.43155e-12, 1.56068e-11, 1.16347e-10])
+
+    assert obj.flux_values[0, 0] == 0.10574753
+    assert np.allclose(obj.values[0, :3, 0], 3.024370e-5 * spectrum_start)
+    assert obj.flux_values[1, 0] == 4.440377e-2
+    assert np.allclose(obj.values[1, :3, 0], 1.516142e-5 * spectrum_start)
+    assert np.isclose(obj.values[0, -1, 0], 3.024370e-5 * 1.474703e-5)
+
+    assert obj.flux_values[29, 0] == 8.459901e-3
+    assert obj.values[29, 0, 0] == 1.09767e-10
+    assert obj.values[29, 29, 0] == 5.388264e-4
+
+
+def test_synthetic_scattering_matrix():
+    obj = ScatteringMatrix(synthetic_section(50, band_width=4, number_legendre=3))
+
+    assert obj.number_groups == 50
+    assert obj.number_legendre == 3
+    assert np.count_nonzero(obj.values[:, :, 0]) == 4 * 50 - 6
+    assert obj.values[10, 11, 0] == 0
+    assert obj.values[10, 7, 0] != 0
+    assert obj.values[10, 6, 0] == 0
+
+
+@pytest.mark.slow
+def test_scattering_matrix_scaling():
+    times = {}
+    for number_groups in [30, 300, 3000]:
+        lines = synthetic_section(number_groups)
+        best = np.inf
+        for _ in range(3):
+            start = time.perf_counter()
+            ScatteringMatrix(lines)
+            best = min(best, time.perf_counter() - start)
+        times[number_groups] = best
+        print(f"{number_groups} groups: {best:.4f} s")
+
+    # linear growth is a factor of 10, quadratic would be a factor of 100
+    assert times[3000] / times[300] < 25
@@ -0,0 +1,89 @@
+from groupy import ScratchSpace
+from groupy.njoy import _write_tape
+import os
+import time
+import pytest
+
+
+@pytest.fixture
+def scratch_root(tmp_path):
+    root = tmp_path / "scratch"
+    root.mkdir()
+    return root
+
+
+def test_write_tape(tmp_path):
+    source = tmp_path / "source.endf"
+    source.write_text("evaluation\n")
+    destination = tmp_path / "tape20"
+
+    # a tape left by an earlier run is replaced with a link to the source
+    destination.write_text("old evaluation\n")
+    _write_tape(source, destination)
+    assert destination.is_symlink()
+    assert destination.read_text() == "evaluation\n"
+
+    # staging the same tape again leaves the source alone
+    _write_tape(source, destination)
+    _write_tape(destination, destination)
+    assert source.read_text() == "evaluation\n"
+
+
+def test_write_tape_fallbacks(tmp_path, monkeypatch):
+    source = tmp_path / "source.endf"
+    source.write_text("evaluation\n")
+
+    def no_links(*args):
+        raise OSError("links are not supported")
+
+    monkeypatch.setattr(os, "symlink", no_links)
+    _write_tape(source, tmp_path / "hard")
+    assert os.path.samefile(source, tmp_path / "hard")
+
+    monkeypatch.setattr(os, "link", no_links)
+    _write_tape(source, tmp_path / "copy")
+    assert not os.path.samefile(source, tmp_path / "copy")
+    assert (tmp_path / "copy").read_text() == "evaluation\n"
+
+
+def test_scratch_space(scratch_root, tmp_path):
+    scratch = ScratchSpace(scratch_root)
+    with scratch.run(tmp_path) as directory:
+        assert directory.parent == scratch_root
+        for name in ["tape20", "tape21", "tape91", "output"]:
+            (directory / name).write_text(name)
+
+    assert list(scratch_root.iterdir()) == []
+    assert (tmp_path / "tape91").read_text() == "tape91"
+    assert (tmp_path / "output").read_text() == "output"
+    assert not (tmp_path / "tape21").exists()
+
+    with pytest.raises(FileNotFoundError):
+        ScratchSpace(tmp_path / "missing")
+
+
+def test_scratch_space_failed(scratch_root, tmp_path):
+    for keep_failed, kept in [(False, ["tape91"]), (True, ["tape21", "tape91"])]:
+        run_directory = tmp_path / f"run_{keep_failed}"
+        run_directory.mkdir()
+
+        scratch = ScratchSpace(scratch_root, keep=["tape91"], keep_failed=keep_failed)
+        with pytest.raises(RuntimeError):
+            with scratch.run(run_directory) as directory:
+                (directory / "tape21").write_text("tape21")
+                (directory / "tape91").write_text("tape91")
+                raise RuntimeError("NJOY failed")
+
+        assert sorted(path.name for path in run_directory.iterdir()) == kept
+        assert list(scratch_root.iterdir()) == []
+
+
+def test_scratch_space_clean(scratch_root):
+    scratch = ScratchSpace(scratch_root)
+    stale, running = scratch.create(), scratch.create()
+    (scratch_root / "other").mkdir()
+    old = time.time() - 2 * 24 * 3600
+    os.utime(stale, (old, old))
+
+    assert scratch.clean() == 1
+    assert sorted(scratch_root.iterdir()) == sorted([running, scratch_root / "other"])
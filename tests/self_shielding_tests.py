@@ -0,0 +1,156 @@
+from groupy import GrouprOutput, SelfShieldingTable
+from groupy.base._decoder import decode_section
+from pathlib import Path
+from gendf_helpers import endf_float
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+def _record_lines(fields, ids):
+    return ["".join(fields).ljust(66) + ids + "    1"]
+
+
+def _control(c1, c2, l1, l2, n1, n2, ids):
+    fields = [endf_float(c1), endf_float(c2)] + [f"{n:11d}" for n in (l1, l2, n1, n2)]
+    return _record_lines(fields, ids)
+
+
+def _list_lines(data, ids):
+    fields = [endf_float(value) for value in data]
+    return [
+        "".join(fields[i : i + 6]).ljust(66) + ids + "    1"
+        for i in range(0, len(fields), 6)
+    ]
+
+
+def _add_sigma0(text, sigma0, factor):
+    """adds a second sigma0 value to every section of a GENDF file, with
+    all of its values FACTOR times the values of the first sigma0"""
+
+    lines = text.splitlines()
+    output, index = [lines[0]], 1
+    while index < len(lines):
+        ids = lines[index][66:75]
+        mf, mt = int(ids[4:6]), int(ids[6:9])
+        if mt == 0:
+            output.append(lines[index])
+            index += 1
+            continue
+
+        stop = index
+        while lines[stop][66:75] == ids:
+            stop += 1
+        head, records, data = decode_section(lines[index:stop])
+
+        output += _control(
+            head["C1"], head["C2"], head["L1"], 2, head["N1"], head["N2"], ids
+        )
+        for record in records:
+            nw, start = record["N1"], record["start"]
+            values = data[start : start + nw]
+            if mf == 1:
+                ntw = head["N2"]
+                values = np.insert(values, ntw + 1, sigma0)
+            elif record["N2"] > 0:
+                # each column has NL values for each sigma0
+                values = values.reshape((record["L1"], 1, -1))
+                values = np.concatenate([values, factor * values], axis=1).ravel()
+            output += _control(
+                record["C1"],
+                record["C2"],
+                record["L1"],
+                record["L2"],
+                len(values),
+                record["N2"],
+                ids,
+            )
+            output += _list_lines(values, ids)
+
+        output.append(lines[stop])
+        index = stop + 1
+
+    return "\n".join(output) + "\n"
+
+
+@pytest.fixture
+def two_sigma0_file(U238_356_file, tmp_path):
+    filename = tmp_path / "U238_two_sigma0"
+    filename.write_text(_add_sigma0(U238_356_file.read_text(), 10, 0.5))
+    return filename
+
+
+def test_two_sigma0(U238_356_file, two_sigma0_file, tmp_path):
+    single = GrouprOutput(U238_356_file)
+    obj = GrouprOutput(two_sigma0_file)
+
+    assert np.array_equal(obj.sigma0_values, [1e10, 10])
+    assert np.array_equal(obj.energy_boundaries, single.energy_boundaries)
+
+    pointwise = obj.pointwise[102]
+    assert pointwise.values.shape == (2, 30)
+    assert np.allclose(pointwise.values[0], single.pointwise[102].values)
+    assert np.allclose(pointwise.values[1], 0.5 * single.pointwise[102].values)
+    assert np.allclose(pointwise.flux_values[1], 0.5 * pointwise.flux_values[0])
+
+    assert np.allclose(
+        obj.outgoing_distributions[18].values[1],
+        0.5 * single.outgoing_distributions[18].values,
+    )
+
+    for mt in [2, 16, 18]:
+        matrix = obj.scattering_matrices[mt]
+        assert matrix.values.shape[:3] == (2, 30, 30)
+        assert matrix.flux_values.shape[:2] == (2, 30)
+        assert np.allclose(matrix.values[0], single.scattering_matrices[mt].values)
+
+    assert np.allclose(
+        obj.scattering_matrices[2].values[1],
+        0.5 * single.scattering_matrices[2].values,
+    )
+
+    sparse = GrouprOutput(two_sigma0_file, sparse=True)
+    assert np.allclose(
+        sparse.scattering_matrices[2].values[1].toarray(),
+        obj.scattering_matrices[2].values[1],
+    )
+
+    dilute = obj.at_sigma0(1)
+    assert dilute.sigma0_values == [10]
+    assert np.array_equal(dilute.pointwise[102].values, pointwise.values[1])
+
+    obj.write_to_csv(title="shielded", directory=tmp_path)
+    assert (tmp_path / "shielded_1e+10b_pointwise.csv").exists()
+    assert (tmp_path / "shielded_10b_scattering_matrix_2.csv").exists()
+
+
+def test_self_shielding_table(two_sigma0_file):
+    obj = GrouprOutput(two_sigma0_file)
+    table = SelfShieldingTable(obj, 102)
+
+    assert np.array_equal(table.sigma0_values, [10, 1e10])
+    assert table.values.shape == (1, 2, 30)
+
+    infinite = obj.pointwise[102].values[0]
+    dilute = obj.pointwise[102].values[1]
+
+    # points on the table, outside of it, and half way in ln(sigma0)
+    sigma0 = np.array([1e10, 10, 1e12, 1, np.sqrt(10 * 1e10)])
+    values = table.interpolate(sigma0, 293)
+    assert values.shape == (5, 30)
+    assert np.allclose(values[0], infinite)
+    assert np.allclose(values[1], dilute)
+    assert np.allclose(values[2], infinite)
+    assert np.allclose(values[3], dilute)
+    assert np.allclose(values[4], 0.5 * (infinite + dilute))
+
+    # many points in one call, broadcast against the temperatures
+    sigma0 = np.geomspace(1, 1e11, 10000)
+    values = table(sigma0[:, None], np.array([293, 600]))
+    assert values.shape == (10000, 2, 30)
+    assert np.array_equal(values[:, 0], values[:, 1])
@@ -0,0 +1,141 @@
+from groupy import GrouprOutput, LibraryStore
+from pathlib import Path
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+@pytest.fixture
+def Pu239_file(U238_356_file, tmp_path):
+    """the U238 material with the MAT and ZA of Pu239"""
+
+    lines = U238_356_file.read_text().splitlines()
+    lines = [
+        line.replace("9.223800+4", "9.423900+4")[:66]
+        + line[66:70].replace("9237", "9437")
+        + line[70:]
+        for line in lines
+    ]
+    filename = tmp_path / "Pu239"
+    filename.write_text("\n".join(lines) + "\n")
+    return filename
+
+
+@pytest.fixture
+def two_temperature_file(U238_356_file, tmp_path):
+    lines = U238_356_file.read_text().splitlines()
+    second = lines[1:-1]
+    second[1] = " 6.000000+2" + second[1][11:]
+    filename = tmp_path / "U238_two_temperatures"
+    filename.write_text("\n".join(lines[:-1] + second + lines[-1:]) + "\n")
+    return filename
+
+
+def test_store(U238_356_file, Pu239_file, tmp_path):
+    obj = GrouprOutput(U238_356_file)
+    store = LibraryStore(tmp_path / "store")
+    assert len(store.pointwise_index) == 0
+
+    store.append(obj)
+    store.append(GrouprOutput(Pu239_file, sparse=True))
+
+    assert store.ZA_values == [92238, 94239]
+    assert store.pointwise_values.shape == (2 * 53, 30)
+    assert isinstance(store.pointwise_values, np.memmap)
+
+    for za in store.ZA_values:
+        assert np.array_equal(store.cross_section(za, 102), obj.pointwise[102].values)
+        assert np.array_equal(
+            store.scattering_matrix(za, 2, 293).toarray(),
+            obj.scattering_matrices[2].values,
+        )
+
+    # the cross sections of every material are one array
+    rows = store.select(mt=18)
+    assert list(store.pointwise_index["ZA"][rows]) == [92238, 94239]
+    assert np.array_equal(store.pointwise_values[rows[1]], obj.pointwise[18].values)
+
+    with pytest.raises(KeyError):
+        store.cross_section(92238, 3)
+    with pytest.raises(ValueError):
+        store.append(obj)
+
+    # a new store object sees the same data, and appending does not move it
+    again = LibraryStore(tmp_path / "store")
+    before = (tmp_path / "store" / "pointwise_values.bin").read_bytes()
+    again.append(GrouprOutput(_renumbered(U238_356_file, tmp_path)))
+    after = (tmp_path / "store" / "pointwise_values.bin").read_bytes()
+    assert after[: len(before)] == before
+    assert len(again.materials) == 3 and len(store.materials) == 2
+
+
+def _renumbered(filename, tmp_path):
+    lines = filename.read_text().splitlines()
+    lines = [
+        line.replace("9.223800+4", "9.223500+4")[:66]
+        + line[66:70].replace("9237", "9228")
+        + line[70:]
+        for line in lines
+    ]
+    renumbered = tmp_path / "U235"
+    renumbered.write_text("\n".join(lines) + "\n")
+    return renumbered
+
+
+def test_store_temperatures(U238_356_file, two_temperature_file, tmp_path):
+    store = LibraryStore(tmp_path / "store")
+    store.append(GrouprOutput(two_temperature_file))
+
+    assert store.materials[0]["temperatures"] == [293, 600]
+    assert store.cross_section(92238, 1, temperature=600).shape == (30,)
+    with pytest.raises(ValueError):
+        store.cross_section(92238, 1)
+
+    with pytest.raises(ValueError):
+        store.append(GrouprOutput(_coarse(U238_356_file, tmp_path)))
+
+
+def _coarse(filename, tmp_path):
+    """the U238 file with a different lowest group boundary"""
+
+    text = filename.read_text().replace(" 1.390000-4", " 1.000000-5", 1)
+    coarse = tmp_path / "U238_coarse"
+    coarse.write_text(text)
+    return coarse
+
+
+def test_store_isomers(U238_356_file, tmp_path):
+    # a metastable state has the ZA of the ground state, with its own MAT
+    lines = U238_356_file.read_text().splitlines()
+    lines = [
+        line[:66] + line[66:70].replace("9237", "9238") + line[70:] for line in lines
+    ]
+    metastable = tmp_path / "U238m"
+    metastable.write_text("\n".join(lines) + "\n")
+
+    store = LibraryStore(tmp_path / "store")
+    obj = GrouprOutput(U238_356_file)
+    store.append(obj)
+    store.append(GrouprOutput(metastable))
+
+    rows = store.select(za=92238, mt=18)
+    assert list(store.pointwise_index["MAT"][rows]) == [9237, 9238]
+    for mat, row in zip([9237, 9238], rows):
+        assert list(store.select(za=92238, mt=18, mat=mat)) == [row]
+        values = store.cross_section(92238, 18, mat=mat)
+        assert np.shares_memory(values, store.pointwise_values[row])
+        assert np.array_equal(
+            store.scattering_matrix(92238, 2, mat=mat).toarray(),
+            obj.scattering_matrices[2].values,
+        )
+
+    # a ZA with several materials needs the MAT
+    with pytest.raises(ValueError, match="several materials"):
+        store.cross_section(92238, 18)
+    with pytest.raises(KeyError):
+        store.cross_section(92238, 18, mat=9228)
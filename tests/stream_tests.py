@@ -0,0 +1,50 @@
+from groupy import GrouprOutput, iter_sections
+from groupy.base._pointwise_class import PointwiseValues
+from groupy.base._scattering_mat_class import ScatteringMatrix
+from pathlib import Path
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+def test_iter_sections(U238_356_file):
+    obj = GrouprOutput(U238_356_file)
+
+    sections = list(iter_sections(U238_356_file))
+    assert len(sections) == 1 + 53 + 1 + len(obj.scattering_matrices)
+    assert np.array_equal(sections[0].energy_boundaries, obj.energy_boundaries)
+
+    pointwise = list(iter_sections(U238_356_file, mf=3))
+    assert [section.mt for section in pointwise] == list(obj.pointwise)
+    for section in pointwise:
+        assert isinstance(section, PointwiseValues)
+        assert np.array_equal(section.values, obj.pointwise[section.mt].values)
+
+    matrices = list(iter_sections(U238_356_file, mf=6, mt=[2, 18], sparse=True))
+    assert [section.mt for section in matrices] == [2, 18]
+    assert isinstance(matrices[0], ScatteringMatrix)
+    assert np.array_equal(
+        matrices[0].values.toarray(), obj.scattering_matrices[2].values
+    )
+
+    assert list(iter_sections(U238_356_file, mat=125)) == []
+    with pytest.raises(NotImplementedError):
+        next(iter_sections(U238_356_file, mf=4))
+
+
+def test_iter_sections_temperatures(U238_356_file, tmp_path):
+    lines = U238_356_file.read_text().splitlines()
+    second = lines[1:-1]
+    second[1] = " 6.000000+2" + second[1][11:]
+    filename = tmp_path / "U238_two_temperatures"
+    filename.write_text("\n".join(lines[:-1] + second + lines[-1:]) + "\n")
+
+    # each temperature gives its own sections, in the order of the file
+    sections = iter_sections(filename, mf=1)
+    assert [section.temperature for section in sections] == [293, 600]
+    assert len(list(iter_sections(filename, mf=3, mt=102))) == 2
@@ -0,0 +1,169 @@
+from groupy.sweep import run_sweep, SweepPlan
+import groupy.sweep
+from pathlib import Path
+from gendf_helpers import add_material_copy
+import os
+import pytest
+
+U238_356 = Path(__file__).parent / "files" / "U238_356"
+
+FAKE_NJOY = """#!/bin/sh
+cat > received_input
+if grep -q reconr received_input; then
+    echo reconr >> "$FAKE_NJOY_LOG"
+    cp tape20 tape21
+fi
+if grep -q broadr received_input; then
+    test -f tape21 || exit 77
+    grep -q " 900 /" received_input && exit 1
+    echo broadr >> "$FAKE_NJOY_LOG"
+    cp tape21 tape22
+fi
+if grep -q groupr received_input; then
+    test -f tape22 || exit 77
+    echo groupr >> "$FAKE_NJOY_LOG"
+    cp "$FAKE_GENDF" tape91
+fi
+"""
+
+
+@pytest.fixture
+def endf6_file(tmp_path, monkeypatch):
+    """an ENDF file for a fake njoy executable, which logs each stage, fails
+    to broaden to 900 K and gives the U238 GENDF file for every GROUPR
+    stage"""
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "njoy").write_text(FAKE_NJOY)
+    (bin_dir / "njoy").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("LD_LIBRARY_PATH", str(tmp_path))
+    monkeypatch.setenv("FAKE_NJOY_LOG", str(tmp_path / "log"))
+    monkeypatch.setenv("FAKE_GENDF", str(U238_356))
+    monkeypatch.setattr(
+        groupy.sweep,
+        "_njoy_materials",
+        lambda endf6_file, verbose: (9237, True, True),
+    )
+
+    filename = tmp_path / "U238.endf"
+    filename.write_text("fake endf\n")
+    return filename
+
+
+def _log(tmp_path):
+    return (tmp_path / "log").read_text().split()
+
+
+def test_sweep_plan(endf6_file, tmp_path):
+    plan = SweepPlan(
+        [endf6_file],
+        tmp_path / "runs",
+        temperatures=[293.6, 600],
+        broadr_tolerances=[0.001, 0.002],
+        group_structures=[3, [1e-5, 1, 2e7]],
+        fluxes=[5, 11],
+    )
+
+    assert len(plan.points) == 16
+    assert plan.stage_counts() == {"reconr": 1, "broadr": 4, "groupr": 16}
+
+    point = plan.points[-1]
+    assert point.group_boundaries == (1e-5, 1, 2e7)
+    assert [stage.kind for stage in plan.point_stages(point)] == [
+        "reconr",
+        "broadr",
+        "groupr",
+    ]
+
+
+def test_sweep(endf6_file, tmp_path):
+    report = run_sweep(
+        [endf6_file],
+        tmp_path / "runs",
+        temperatures=[293.6, 600],
+        group_structures=[3, [1e-5, 1, 2e7]],
+        fluxes=[5, 11],
+        max_workers=4,
+    )
+
+    log = _log(tmp_path)
+    assert log.count("reconr") == 1
+    assert log.count("broadr") == 2
+    assert log.count("groupr") == 8
+
+    assert len(report.results) == 8 and report.errors == {}
+    hot = report.select(temperature=600, group_boundaries=[1e-5, 1, 2e7])
+    assert len(hot) == 2
+    assert all(output.material_number == 9237 for output in hot.values())
+
+    assert 0 < report.njoy_time < report.naive_time
+    assert "8 points, 11 stages instead of 24" in report.summary()
+
+    # the stages are found again instead of run
+    again = run_sweep(
+        [endf6_file],
+        tmp_path / "runs",
+        temperatures=[600],
+        group_structures=[3],
+        fluxes=[5, 11],
+    )
+    assert len(_log(tmp_path)) == 11
+    assert set(again.status.values()) == {"reused"}
+    assert again.njoy_time > 0
+
+
+def test_sweep_failed_stage(endf6_file, tmp_path):
+    report = run_sweep(
+        [endf6_file],
+        tmp_path / "runs",
+        temperatures=[293.6, 900],
+        group_structures=[3, 4],
+    )
+
+    # the failed broadr stage only fails the points at 900 K
+    assert sorted(point.temperature for point in report.results) == [293.6] * 2
+    assert sorted(point.temperature for point in report.errors) == [900] * 2
+    assert sorted(report.status.values()) == [
+        "failed",
+        "run",
+        "run",
+        "run",
+        "run",
+        "skipped",
+        "skipped",
+    ]
+    assert "1 failed, 2 skipped" in report.summary()
+
+
+def test_sweep_unreadable_output(endf6_file, tmp_path, monkeypatch):
+    bad = tmp_path / "bad_gendf"
+    bad.write_text("not a GENDF file\n")
+    run_sweep([endf6_file], tmp_path / "runs", group_structures=[3])
+
+    # a broken tape91 for one point only fails that point
+    monkeypatch.setenv("FAKE_GENDF", str(bad))
+    report = run_sweep([endf6_file], tmp_path / "runs", group_structures=(3, 4))
+    assert [point.group_boundaries for point in report.results] == [3]
+    assert [point.group_boundaries for point in report.errors] == [4]
+    assert "failed: " in report.summary()
+
+
+def test_sweep_several_materials(endf6_file, tmp_path, monkeypatch):
+    library_file = add_material_copy(U238_356, tmp_path / "library", 9437, 94239)
+    monkeypatch.setenv("FAKE_GENDF", str(library_file))
+    monkeypatch.setattr(
+        groupy.sweep,
+        "_njoy_materials",
+        lambda endf6_file, verbose: ([9237, 9437], [True, False], [True, False]),
+    )
+
+    report = run_sweep([endf6_file], tmp_path / "runs", group_structures=(3, 4))
+    assert len(report.results) == 2 and report.errors == {}
+    for output in report.results.values():
+        assert output.material_numbers == [9237, 9437]
+
+    stage = report.plan.groupr_stages[report.plan.points[0]]
+    assert "  9237 3 0 5 1 /" in stage.njoy_input
+    assert "  9437 / next mat" in stage.njoy_input
@@ -0,0 +1,86 @@
+from groupy import GrouprOutput, TemperatureInterpolator
+from pathlib import Path
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def U238_356_file():
+    filename = Path(__file__).parent / "files" / "U238_356"
+    return filename
+
+
+@pytest.fixture
+def two_temperature_file(U238_356_file, tmp_path):
+    lines = U238_356_file.read_text().splitlines()
+    second = lines[1:-1]
+    second[1] = " 6.000000+2" + second[1][11:]
+    filename = tmp_path / "U238_two_temperatures"
+    filename.write_text("\n".join(lines[:-1] + second + lines[-1:]) + "\n")
+    return filename
+
+
+@pytest.fixture
+def outputs(U238_356_file):
+    """the U238 values at 293 K, and twice the values at 900 K"""
+
+    cold = GrouprOutput(U238_356_file, eager=True)
+    hot = GrouprOutput(U238_356_file, eager=True)
+    hot.temperatures = np.array([900.0])
+    for section in hot.pointwise.values():
+        section.values = 2 * section.values
+    return [hot, cold]
+
+
+def test_temperature_interpolator(outputs):
+    hot, cold = outputs
+    table = TemperatureInterpolator(outputs, method="linear")
+
+    assert np.array_equal(table.temperatures, [293, 900])
+    assert table.mts == sorted(cold.pointwise.keys())
+    assert table.values.shape == (2, len(table.mts), 30)
+
+    column = table.mts.index(102)
+    values = table.interpolate([293, 596.5, 900, 1200, 10])
+    assert values.shape == (5, len(table.mts), 30)
+    capture = cold.pointwise[102].values
+    assert np.allclose(values[:, column], np.outer([1, 1.5, 2, 2, 1], capture))
+
+    assert np.allclose(table.cross_section(102, 596.5), 1.5 * capture)
+    assert table(np.full((4, 3), 600.0)).shape == (4, 3, len(table.mts), 30)
+    assert table.cross_section(102, np.full((4, 3), 600.0)).shape == (4, 3, 30)
+
+    with pytest.raises(KeyError):
+        table.cross_section(999, 600)
+
+
+@pytest.mark.parametrize(
+    "method, scale", [("sqrt", np.sqrt), ("log", np.log), ("linear", lambda t: t)]
+)
+def test_temperature_methods(outputs, method, scale):
+    table = TemperatureInterpolator(outputs, mts=[1, 102], method=method)
+    assert table.mts == [1, 102]
+
+    weight = (scale(600) - scale(293)) / (scale(900) - scale(293))
+    assert np.allclose(
+        table.cross_section(1, 600), (1 + weight) * outputs[1].pointwise[1].values
+    )
+
+
+def test_temperature_interpolator_one_file(two_temperature_file):
+    obj = GrouprOutput(two_temperature_file)
+    table = TemperatureInterpolator(obj)
+
+    assert np.array_equal(table.temperatures, [293, 600])
+    assert np.allclose(table.cross_section(102, 450), obj.pointwise[102].values[0])
+
+
+def test_temperature_interpolator_errors(outputs, U238_356_file):
+    with pytest.raises(ValueError):
+        TemperatureInterpolator(outputs, method="cubic")
+
+    with pytest.raises(ValueError, match="not unique"):
+        TemperatureInterpolator(outputs + [GrouprOutput(U238_356_file)])
+
+    with pytest.raises(KeyError):
+        TemperatureInterpolator(outputs, mts=[999])